@@ -102,6 +102,7 @@
 #     return app
 
 import logging
+import os
 import traceback
 from werkzeug.middleware.proxy_fix import ProxyFix
 from flask import Flask, jsonify, request
@@ -130,6 +131,9 @@ from app.routes.interview.debug import debug_bp
 from app.routes.interview.automation import automation_bp
 from app.routes.interview.helpers import helpers_bp
 from app.routes.interview.kb import kb_bp
+from app.models.db import init_db
+from app.services.scheduler import scheduler
+from app.services.task_queue import task_queue
 # (keep your existing imports — not removing anything)
 
 def create_app(config_object: str | None = None):
@@ -179,7 +183,7 @@ def create_app(config_object: str | None = None):
          allow_headers=["Content-Type", "Authorization", "X-Requested-With", "Accept", "Cache-Control", "X-Api-Key"],
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
          supports_credentials=True,
-         expose_headers=["Content-Type", "Authorization"])
+         expose_headers=["Content-Type", "Authorization", "ETag"])
 
     # Register blueprints
     app.register_blueprint(health_bp)
@@ -200,6 +204,22 @@ def create_app(config_object: str | None = None):
     app.register_blueprint(helpers_bp)
     app.register_blueprint(kb_bp)
 
+    # Create missing tables (including the service tables used by the jobs and
+    # tasks below) once at startup instead of on first use in each module
+    try:
+        init_db()
+    except Exception:
+        pass  # logged by init_db; usually another worker created them concurrently
+
+    # Background jobs registered by the modules above (leader-elected across workers)
+    scheduler.init_app(app)
+    scheduler.start()
+
+    # Durable task queue; tasks run inside this app's context
+    task_queue.init_app(app)
+    if os.getenv("TASK_QUEUE_INPROCESS", "1") != "0":
+        task_queue.start_worker()
+
     # ✅ 404 handler
     @app.errorhandler(404)
     def page_not_found(error):
@@ -1,8 +1,17 @@
 import logging
+import os
 from flask_caching import Cache
 from concurrent.futures import ThreadPoolExecutor
 
-cache = Cache(config={"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 300})
+# Shared by all gunicorn workers on the host; CACHE_TYPE swaps the backend
+cache = Cache(config={
+    "CACHE_TYPE": os.getenv("CACHE_TYPE", "app.utils.sqlite_cache.SQLiteCache"),
+    "CACHE_DEFAULT_TIMEOUT": 300,
+    "CACHE_KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "talentflow:"),
+    "CACHE_THRESHOLD": int(os.getenv("CACHE_THRESHOLD", "5000")),
+    "CACHE_SQLITE_PATH": os.getenv("CACHE_SQLITE_PATH"),
+    "CACHE_SQLITE_MAX_BYTES": int(os.getenv("CACHE_SQLITE_MAX_BYTES", str(64 * 1024 * 1024))),
+})
 logger = logging.getLogger("talentflow")
 logger.setLevel(logging.INFO)
 executor = ThreadPoolExecutor(max_workers=4)
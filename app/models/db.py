@@ -3,7 +3,9 @@
 Database models and engine/session setup for the TalentFlow backend.
 - Uses env var DATABASE_URL (falls back to SQLite file).
 - Provides Base, engine, SessionLocal, and init/migration helpers.
-- Models: Candidate, PipelineRun, EmailLog, User.
+- Models: Candidate, PipelineRun, EmailLog, User, AssessmentResult, InterviewEvent,
+  InterviewTranscriptChunk, RecruitmentStatsMonthly, JobCatalogSnapshot,
+  ScreeningResult, ResumeText, ApplicantSyncState, SchedulerLease, QueuedTask.
 """
 
 import os
@@ -15,7 +17,8 @@ from sqlalchemy import (
     create_engine, Column, Integer, String, Float, Boolean, DateTime, Text,
     Index, UniqueConstraint, inspect, text
 )
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSON, insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.pool import QueuePool
@@ -69,6 +72,7 @@ class Candidate(Base):
         Index("idx_status", "status"),
         Index("idx_exam_completed", "exam_completed"),
         Index("idx_processed_date", "processed_date"),
+        Index("idx_job_processed_id", "job_id", "processed_date", "id"),  # keyset listing
         UniqueConstraint("email", "job_id", name="unique_email_job"),
     )
 
@@ -339,9 +343,164 @@ class AssessmentResult(Base):
         return f"<AssessmentResult({self.candidate_name}, {self.assessment_name}, {self.provider})>"
 
 
+class InterviewEvent(Base):
+    """One row per tracked interview utterance (append-only log)."""
+    __tablename__ = "interview_events"
+    __table_args__ = (
+        Index("idx_interview_event_candidate", "candidate_id"),
+        UniqueConstraint("session_id", "sequence", name="unique_session_sequence"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String(200), nullable=False)
+    candidate_id = Column(Integer)
+    sequence = Column(Integer, nullable=False)
+    speaker = Column(String(50))     # avatar/candidate
+    type = Column(String(50))        # question/answer
+    content = Column(Text)
+    timestamp = Column(String(64))   # ISO string as reported by the client
+    source = Column(String(50))      # knowledge_base/voice_transcription/enhanced/snapshot
+    event_metadata = Column("metadata", Text)  # JSON
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<InterviewEvent session={self.session_id!r} seq={self.sequence} type={self.type!r}>"
+
+
+class InterviewTranscriptChunk(Base):
+    """Rendered transcript text for a contiguous run of one candidate's InterviewEvents."""
+    __tablename__ = "interview_transcript_chunks"
+    __table_args__ = (
+        UniqueConstraint("candidate_id", "family", "first_event_id", name="unique_transcript_chunk"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    candidate_id = Column(Integer, nullable=False)
+    session_id = Column(String(200))
+    family = Column(String(20), nullable=False)  # qa/enhanced: the event sources rendered
+    first_event_id = Column(Integer, nullable=False)
+    last_event_id = Column(Integer, nullable=False)
+    content = Column(Text)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+
+class RecruitmentStatsMonthly(Base):
+    """Per-month recruitment counters maintained from candidate writes."""
+    __tablename__ = "recruitment_stats_monthly"
+
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    applications = Column(Integer, default=0, nullable=False)
+    interviews = Column(Integer, default=0, nullable=False)
+    hires = Column(Integer, default=0, nullable=False)
+    exams_passed = Column(Integer, default=0, nullable=False)
+    rejections = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now)
+
+
+class JobCatalogSnapshot(Base):
+    """Last known BambooHR open-jobs list, shared by all workers."""
+    __tablename__ = "job_catalog_snapshots"
+
+    source = Column(String(200), primary_key=True)  # e.g. bamboohr:<subdomain>
+    payload = Column(Text)                           # JSON list of open jobs
+    fetched_at = Column(DateTime)
+    refresh_owner = Column(String(200))
+    refresh_lease_until = Column(DateTime)           # single-flight refresh lease
+    last_error = Column(Text)
+
+
+class ScreeningResult(Base):
+    """Memoized LLM screening output keyed by resume bytes, job requirements and prompt version."""
+    __tablename__ = "screening_results"
+    __table_args__ = (
+        Index("idx_screening_content_hash", "content_hash"),
+    )
+
+    cache_key = Column(String(64), primary_key=True)  # sha256 of kind/content/requirements/prompt version
+    kind = Column(String(32), nullable=False)         # screening/skills
+    content_hash = Column(String(64))                 # sha256 of the resume bytes (screening only)
+    requirements_hash = Column(String(64))
+    prompt_version = Column(String(32))
+    model = Column(String(100))
+    payload = Column(Text)                            # JSON
+    hits = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    last_used_at = Column(DateTime)
+
+
+class ResumeText(Base):
+    """Normalized text extracted from a resume file, keyed by the file's content hash."""
+    __tablename__ = "resume_texts"
+
+    content_hash = Column(String(64), primary_key=True)  # sha256 of the file bytes
+    text = Column(Text)
+    page_count = Column(Integer)
+    extractor = Column(String(50))                       # pypdf2/pdfplumber/pymupdf/python-docx/docx2txt/text
+    char_count = Column(Integer)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+
+class ApplicantSyncState(Base):
+    """Per-job BambooHR scrape state: which applicants were seen and what resume was fetched."""
+    __tablename__ = "applicant_sync_state"
+
+    job_id = Column(String(50), primary_key=True)
+    applicant_id = Column(String(50), primary_key=True)
+    name = Column(String(200))
+    resume_path = Column(String(500))
+    resume_url = Column(String(1000))
+    content_hash = Column(String(64))     # sha256 of the last downloaded resume
+    etag = Column(String(200))
+    last_modified = Column(String(100))   # raw Last-Modified header
+    size = Column(Integer)
+    first_seen_at = Column(DateTime, default=datetime.now, nullable=False)
+    last_synced_at = Column(DateTime)     # last time the resume bytes were stored
+    last_checked_at = Column(DateTime)    # last revalidation (download or 304)
+
+
+class SchedulerLease(Base):
+    """Leader lease and last-run metrics for one background scheduler job."""
+    __tablename__ = "scheduler_leases"
+
+    job_name = Column(String(100), primary_key=True)
+    owner = Column(String(200))           # host:pid of the worker holding the lease
+    lease_until = Column(DateTime)
+    last_started_at = Column(DateTime)
+    last_finished_at = Column(DateTime)
+    last_duration_ms = Column(Integer)
+    last_status = Column(String(20))      # ok/error
+    last_error = Column(Text)
+    run_count = Column(Integer, default=0, nullable=False)
+    failure_count = Column(Integer, default=0, nullable=False)
+
+
+class QueuedTask(Base):
+    """Durable background task: a function path plus JSON arguments, claimed by workers."""
+    __tablename__ = "task_queue"
+    __table_args__ = (
+        Index("idx_task_queue_due", "queue", "status", "run_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    queue = Column(String(50), nullable=False, default="default")
+    name = Column(String(300), nullable=False)    # module:function
+    payload = Column(Text)                         # JSON {"args": [...], "kwargs": {...}}
+    status = Column(String(20), nullable=False, default="queued")  # queued/running/done/failed
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_at = Column(DateTime, default=datetime.now, nullable=False)  # not before
+    visibility_timeout = Column(Integer, default=600, nullable=False)  # seconds a claim stays valid
+    locked_by = Column(String(200))
+    locked_until = Column(DateTime)                # claim expiry; an expired claim is retried
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    finished_at = Column(DateTime)
+
+
 # ---------- Initialization / Migration helpers ----------
 def init_db() -> None:
-    """Create tables if they do not exist."""
+    """Create tables if they do not exist (run by create_app, so every service
+    table exists before background jobs and tasks use it)."""
     try:
         Base.metadata.create_all(engine)
         logger.info("Database tables created successfully")
@@ -349,6 +508,21 @@ def init_db() -> None:
         logger.exception("Error creating database tables: %s", e)
         raise
 
+def ensure_tables(*models) -> None:
+    """Create the tables for the given models if missing (safe to call repeatedly)."""
+    Base.metadata.create_all(engine, tables=[m.__table__ for m in models], checkfirst=True)
+
+def insert_ignore(connection, table, values: dict):
+    """INSERT that skips a row whose primary or unique key already exists instead of raising."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        return sqlite_insert(table).values(**values).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql_insert(table).values(**values).on_conflict_do_nothing()
+    if dialect == "mysql":
+        return table.insert().values(**values).prefix_with("IGNORE")
+    return table.insert().values(**values)
+
 def add_column_if_not_exists(table_name: str, column_name: str, column_type_sql: str) -> None:
     """Add a column to an existing table if missing (simple SQL-based migration)."""
     inspector = inspect(engine)
@@ -414,6 +588,13 @@ def run_migrations() -> None:
             except Exception as e:
                 logger.warning("Migration for %s.%s failed: %s", table, column, e)
 
+        # Indexes added to models after their tables were first created
+        for index in Candidate.__table__.indexes:
+            try:
+                index.create(engine, checkfirst=True)
+            except Exception as e:
+                logger.warning("Creating index %s failed: %s", index.name, e)
+
         logger.info("Database migrations completed")
     except Exception as e:
         logger.exception("Migration error: %s", e)
@@ -429,7 +610,9 @@ def get_db():
 
 __all__ = [
     "Base", "engine", "SessionLocal",
-    "Candidate", "PipelineRun", "EmailLog", "User",
-    "init_db", "run_migrations", "get_db",
+    "Candidate", "PipelineRun", "EmailLog", "User", "AssessmentResult", "InterviewEvent",
+    "InterviewTranscriptChunk", "RecruitmentStatsMonthly", "JobCatalogSnapshot", "ScreeningResult",
+    "ResumeText", "ApplicantSyncState", "SchedulerLease", "QueuedTask",
+    "init_db", "ensure_tables", "run_migrations", "get_db",
 ]
 
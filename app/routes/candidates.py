@@ -2,106 +2,162 @@
 from typing import Optional
 from flask import Blueprint, jsonify, request
 from datetime import datetime, timedelta
-import os, json
-from app.extensions import cache, logger
+import os, json, base64
+from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import load_only
+from app.extensions import logger
 from app.models.db import Candidate, SessionLocal
 from app.routes.shared import rate_limit
-from fastapi import Query
+from app.utils.cache_tags import ALL_JOBS_SCOPE, GLOBAL_SCOPE, cached, invalidate
+from app.utils.response_versions import conditional_get, job_scope
 candidates_bp = Blueprint("candidates", __name__)
 
-@cache.memoize(timeout=180)
+ASSESSMENT_CONFIG = {"EXPIRY_HOURS": int(os.getenv("ASSESSMENT_EXPIRY_HOURS", "48"))}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _json_list(value):
+    return json.loads(value or '[]') if value else []
+
+
+def _assessment_window(c):
+    """Return (time_remaining_hours, link_expired) for the assessment link"""
+    if c.exam_link_sent_date and not c.exam_completed:
+        deadline = c.exam_link_sent_date + timedelta(hours=ASSESSMENT_CONFIG['EXPIRY_HOURS'])
+        if datetime.now() < deadline:
+            return (deadline - datetime.now()).total_seconds() / 3600, False
+        return None, True
+    return None, False
+
+
+# Output field -> (Candidate columns it reads, serializer).
+# List queries load only the columns of the requested fields, so transcripts,
+# Q&A JSON and other large text columns are never fetched for list views.
+CANDIDATE_FIELDS = {
+    "id": (("id",), lambda c: c.id),
+    "name": (("name",), lambda c: c.name or "Unknown"),
+    "email": (("email",), lambda c: c.email or ""),
+    "job_id": (("job_id",), lambda c: c.job_id),
+    "job_title": (("job_title",), lambda c: c.job_title or "Unknown Position"),
+    "status": (("status",), lambda c: c.status),
+    "ats_score": (("ats_score",), lambda c: float(c.ats_score) if c.ats_score else 0.0),
+    "linkedin": (("linkedin",), lambda c: c.linkedin),
+    "github": (("github",), lambda c: c.github),
+    "phone": (("phone",), lambda c: c.phone),
+    "resume_path": (("resume_path",), lambda c: c.resume_path),
+    "resume_url": (("resume_path",), lambda c: c.resume_path),  # frontend compatibility
+    "processed_date": (("processed_date",), lambda c: _iso(c.processed_date)),
+    "score_reasoning": (("score_reasoning",), lambda c: c.score_reasoning),
+
+    # Assessment fields
+    "assessment_invite_link": (("assessment_invite_link",), lambda c: c.assessment_invite_link),
+    "exam_link_sent": (("exam_link_sent",), lambda c: bool(c.exam_link_sent)),
+    "exam_link_sent_date": (("exam_link_sent_date",), lambda c: _iso(c.exam_link_sent_date)),
+    "exam_completed": (("exam_completed",), lambda c: bool(c.exam_completed)),
+    "exam_completed_date": (("exam_completed_date",), lambda c: _iso(c.exam_completed_date)),
+    "link_expired": (("exam_link_sent_date", "exam_completed"), lambda c: _assessment_window(c)[1]),
+    "time_remaining_hours": (("exam_link_sent_date", "exam_completed"), lambda c: _assessment_window(c)[0]),
+    "exam_percentage": (("exam_percentage",), lambda c: float(c.exam_percentage) if c.exam_percentage else None),
+
+    # Interview scheduling fields
+    "interview_scheduled": (("interview_scheduled",), lambda c: bool(c.interview_scheduled)),
+    "interview_date": (("interview_date",), lambda c: _iso(c.interview_date)),
+    "interview_link": (("interview_link",), lambda c: c.interview_link),
+    "interview_token": (("interview_token",), lambda c: c.interview_token),
+
+    # Interview progress fields
+    "interview_started_at": (("interview_started_at",), lambda c: _iso(c.interview_started_at)),
+    "interview_completed_at": (("interview_completed_at",), lambda c: _iso(c.interview_completed_at)),
+    "interview_duration": (("interview_duration",), lambda c: c.interview_duration or 0),
+    "interview_progress": (("interview_progress_percentage",), lambda c: c.interview_progress_percentage or 0),
+    "interview_questions_answered": (("interview_answered_questions",), lambda c: c.interview_answered_questions or 0),
+    "interview_total_questions": (("interview_total_questions",), lambda c: c.interview_total_questions or 0),
+
+    # Interview AI analysis fields
+    "interview_ai_score": (("interview_ai_score",), lambda c: c.interview_ai_score),
+    "interview_ai_technical_score": (("interview_ai_technical_score",), lambda c: c.interview_ai_technical_score),
+    "interview_ai_communication_score": (("interview_ai_communication_score",), lambda c: c.interview_ai_communication_score),
+    "interview_ai_problem_solving_score": (("interview_ai_problem_solving_score",), lambda c: c.interview_ai_problem_solving_score),
+    "interview_ai_cultural_fit_score": (("interview_ai_cultural_fit_score",), lambda c: c.interview_ai_cultural_fit_score),
+    "interview_ai_overall_feedback": (("interview_ai_overall_feedback",), lambda c: c.interview_ai_overall_feedback),
+    "interview_ai_analysis_status": ((), lambda c: getattr(c, 'interview_ai_analysis_status', None)),
+    "interview_final_status": ((), lambda c: getattr(c, 'interview_final_status', None)),
+
+    # Interview insights
+    "strengths": (("interview_ai_strengths",), lambda c: _json_list(c.interview_ai_strengths)),
+    "weaknesses": (("interview_ai_weaknesses",), lambda c: _json_list(c.interview_ai_weaknesses)),
+    "recommendations": ((), lambda c: _json_list(getattr(c, 'interview_recommendations', None))),
+
+    # Interview recording
+    "interview_recording_url": (("interview_recording_url",), lambda c: c.interview_recording_url),
+
+    # Status fields
+    "final_status": (("final_status",), lambda c: c.final_status),
+}
+
+
+def parse_fields(raw: Optional[str]):
+    """Parse a `fields=` query value into a tuple of known field names (None = all)"""
+    if not raw:
+        return None
+    fields = tuple(f.strip() for f in raw.split(',') if f.strip())
+    unknown = [f for f in fields if f not in CANDIDATE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def _projected_query(session, fields, job_id=None, status_filter=None):
+    """Candidate query that loads only the columns needed to serialize `fields`"""
+    columns = {"id", "processed_date"}  # always needed for keyset cursors
+    for name in fields:
+        columns.update(CANDIDATE_FIELDS[name][0])
+    query = session.query(Candidate).options(
+        load_only(*(getattr(Candidate, col) for col in sorted(columns)))
+    )
+    if job_id:
+        query = query.filter_by(job_id=str(job_id))
+    if status_filter:
+        query = query.filter_by(status=status_filter)
+    return query
+
+
+def _serialize(c, fields):
+    return {name: CANDIDATE_FIELDS[name][1](c) for name in fields}
+
+
+def encode_cursor(processed_date, candidate_id) -> str:
+    raw = f"{processed_date.isoformat() if processed_date else ''}|{candidate_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_part, id_part = raw.rsplit('|', 1)
+        return (datetime.fromisoformat(date_part) if date_part else None), int(id_part)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+@cached(timeout=180, tags=lambda job_id=None, status_filter=None: (job_scope(job_id),))
 def get_cached_candidates(job_id=None, status_filter=None):
-    """Cached candidate fetching with optimized queries"""
+    """Cached candidate fetching with optimized queries (full list, projected columns)"""
+    fields = tuple(CANDIDATE_FIELDS)
     session = SessionLocal()
     try:
-        query = session.query(Candidate)
-        
-        if job_id:
-            query = query.filter_by(job_id=str(job_id))
-        
-        if status_filter:
-            query = query.filter_by(status=status_filter)
-        
-        candidates = query.all()
+        candidates = _projected_query(session, fields, job_id, status_filter).all()
         
         result = []
         for c in candidates:
             try:
-                # Calculate time remaining for assessment
-                time_remaining = None
-                link_expired = False
-                
-                if c.exam_link_sent_date and not c.exam_completed:
-                    deadline = c.exam_link_sent_date + timedelta(hours=ASSESSMENT_CONFIG['EXPIRY_HOURS']) # type: ignore
-                    if datetime.now() < deadline:
-                        time_remaining = (deadline - datetime.now()).total_seconds() / 3600
-                    else:
-                        link_expired = True
-                
-                candidate_data = {
-                    "id": c.id,
-                    "name": c.name or "Unknown",
-                    "email": c.email or "",
-                    "job_id": c.job_id,
-                    "job_title": c.job_title or "Unknown Position",
-                    "status": c.status,
-                    "ats_score": float(c.ats_score) if c.ats_score else 0.0,
-                    "linkedin": c.linkedin,
-                    "github": c.github,
-                    "phone": getattr(c, 'phone', None),
-                    "resume_path": c.resume_path,
-                    "resume_url": c.resume_path,  # Add this for frontend compatibility
-                    "processed_date": c.processed_date.isoformat() if c.processed_date else None,
-                    "score_reasoning": c.score_reasoning,
-                    
-                    # Assessment fields
-                    "assessment_invite_link": c.assessment_invite_link,
-                    "exam_link_sent": bool(c.exam_link_sent),
-                    "exam_link_sent_date": c.exam_link_sent_date.isoformat() if c.exam_link_sent_date else None,
-                    "exam_completed": bool(c.exam_completed),
-                    "exam_completed_date": c.exam_completed_date.isoformat() if c.exam_completed_date else None,
-                    "link_expired": link_expired,
-                    "time_remaining_hours": time_remaining,
-                    "exam_percentage": float(c.exam_percentage) if c.exam_percentage else None,
-                    
-                    # Interview scheduling fields
-                    "interview_scheduled": bool(c.interview_scheduled),
-                    "interview_date": c.interview_date.isoformat() if c.interview_date else None,
-                    "interview_link": c.interview_link,
-                    "interview_token": c.interview_token,
-                    
-                    # Interview progress fields
-                    "interview_started_at": c.interview_started_at.isoformat() if c.interview_started_at else None,
-                    "interview_completed_at": c.interview_completed_at.isoformat() if c.interview_completed_at else None,
-                    "interview_duration": c.interview_duration or 0,
-                    "interview_progress": c.interview_progress_percentage or 0,
-                    "interview_questions_answered": c.interview_answered_questions or 0,
-                    "interview_total_questions": c.interview_total_questions or 0,
-                    
-                    # Interview AI analysis fields
-                    "interview_ai_score": c.interview_ai_score,
-                    "interview_ai_technical_score": c.interview_ai_technical_score,
-                    "interview_ai_communication_score": c.interview_ai_communication_score,
-                    "interview_ai_problem_solving_score": c.interview_ai_problem_solving_score,
-                    "interview_ai_cultural_fit_score": c.interview_ai_cultural_fit_score,
-                    "interview_ai_overall_feedback": c.interview_ai_overall_feedback,
-                    "interview_ai_analysis_status": c.interview_ai_analysis_status,
-                    "interview_final_status": c.interview_final_status,
-                    
-                    # Interview insights
-                    "strengths": json.loads(c.interview_ai_strengths or '[]') if c.interview_ai_strengths else [],
-                    "weaknesses": json.loads(c.interview_ai_weaknesses or '[]') if c.interview_ai_weaknesses else [],
-                    "recommendations": json.loads(c.interview_recommendations or '[]') if hasattr(c, 'interview_recommendations') and c.interview_recommendations else [],
-                    
-                    # Interview recording
-                    "interview_recording_url": c.interview_recording_url,
-                    
-                    # Status fields
-                    "final_status": c.final_status,
-                }
-                
-                result.append(candidate_data)
-                
+                result.append(_serialize(c, fields))
             except Exception as e:
                 logger.error(f"Error processing candidate {c.id}: {e}")
                 continue
@@ -111,8 +167,75 @@ def get_cached_candidates(job_id=None, status_filter=None):
         session.close()
 
 
+@cached(timeout=180, tags=lambda job_id=None, status_filter=None: (job_scope(job_id),))
+def get_cached_candidate_count(job_id=None, status_filter=None):
+    """Cached total for a candidate listing (computed separately from the pages)"""
+    session = SessionLocal()
+    try:
+        query = session.query(func.count(Candidate.id))
+        if job_id:
+            query = query.filter(Candidate.job_id == str(job_id))
+        if status_filter:
+            query = query.filter(Candidate.status == status_filter)
+        return query.scalar() or 0
+    finally:
+        session.close()
+
+
+def get_candidate_page(job_id=None, status_filter=None, fields=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """One keyset page ordered by (processed_date, id) descending.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    fields = fields or tuple(CANDIDATE_FIELDS)
+    session = SessionLocal()
+    try:
+        query = _projected_query(session, fields, job_id, status_filter)
+        if cursor:
+            after_date, after_id = decode_cursor(cursor)
+            if after_date is None:
+                query = query.filter(and_(Candidate.processed_date.is_(None), Candidate.id < after_id))
+            else:
+                query = query.filter(or_(
+                    Candidate.processed_date < after_date,
+                    and_(Candidate.processed_date == after_date, Candidate.id < after_id),
+                ))
+        rows = (
+            query.order_by(Candidate.processed_date.desc(), Candidate.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        result = []
+        for c in rows:
+            try:
+                result.append(_serialize(c, fields))
+            except Exception as e:
+                logger.error(f"Error processing candidate {c.id}: {e}")
+                continue
+
+        next_cursor = encode_cursor(rows[-1].processed_date, rows[-1].id) if has_more and rows else None
+        return result, next_cursor
+    finally:
+        session.close()
+
+
+def invalidate_candidate_cache(job_id=None):
+    """Invalidate cached candidate listings and totals of one job (all jobs when job_id is None)
+
+    Candidate commits through SessionLocal already do this; call it after bulk or raw SQL writes.
+    """
+    if job_id:
+        invalidate(job_scope(job_id), ALL_JOBS_SCOPE)
+    else:
+        invalidate(GLOBAL_SCOPE)
+
+
 @candidates_bp.route('/api/candidates', methods=['GET','OPTIONS'])
 @rate_limit(max_calls=60, time_window=60)
+@conditional_get(lambda: (job_scope(request.args.get('job_id')),))
 def api_candidates():
     """Enhanced API endpoint to get candidates with caching"""
     if request.method == 'OPTIONS':
@@ -121,9 +244,32 @@ def api_candidates():
     try:
         job_id = request.args.get('job_id')
         status_filter = request.args.get('status')
+        cursor = request.args.get('cursor')
+        limit = request.args.get('limit', type=int)
+        
+        try:
+            fields = parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({"error": str(e), "available_fields": list(CANDIDATE_FIELDS)}), 400
+        
+        # Legacy shape: the whole (projected) list when no paging was requested
+        if not (cursor or limit or fields):
+            candidates = get_cached_candidates(job_id, status_filter)
+            return jsonify(candidates), 200
+        
+        limit = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+        try:
+            candidates, next_cursor = get_candidate_page(job_id, status_filter, fields, cursor, limit)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        candidates = get_cached_candidates(job_id, status_filter)
-        return jsonify(candidates), 200
+        return jsonify({
+            "candidates": candidates,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "limit": limit,
+            "total": get_cached_candidate_count(job_id, status_filter),
+        }), 200
         
     except Exception as e:
         logger.error(f"Error in api_candidates: {e}", exc_info=True)
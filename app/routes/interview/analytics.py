@@ -6,6 +6,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import and_
 from app.models.db import Candidate, SessionLocal
 from app.extensions import logger
+from app.services.interview_transcript import transcript_for
 try:
     from app.extensions import executor
 except Exception:
@@ -74,7 +75,7 @@ def get_interview_results():
                 'interview_ai_overall_feedback': candidate.interview_ai_overall_feedback,
                 'interview_final_status': candidate.interview_final_status,
                 'interview_recording_url': candidate.interview_recording_url,
-                'interview_transcript': candidate.interview_transcript
+                'interview_transcript': transcript_for(session, candidate)
             })
         
         return jsonify({
@@ -1,5 +1,4 @@
 
-from functools import cache
 from flask import Blueprint, jsonify, request, Response
 from datetime import datetime, timezone, timedelta
 import os, json, time, uuid, requests
@@ -8,7 +7,7 @@ from app.services.interview_automation import start_interview_automation, stop_i
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import and_
 from app.models.db import Candidate, SessionLocal
-from app.routes.candidates import get_cached_candidates
+from app.routes.candidates import invalidate_candidate_cache
 from app.routes.interview.helpers import extract_resume_content
 from app.routes.interview.helpers import extract_skills_from_resume
 from app.extensions import logger
@@ -380,8 +379,8 @@ Remember: This is a conversation, not an interrogation. Make {candidate.name} fe
             except Exception as e:
                 logger.error(f"Email failed: {e}")
             
-            # Clear caches
-            cache.delete_memoized(get_cached_candidates)
+            # Invalidate this job's cached listings
+            invalidate_candidate_cache(candidate.job_id)
             
             return jsonify({
                 "success": True,
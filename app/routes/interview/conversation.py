@@ -9,6 +9,14 @@ from app.models.db import Candidate, SessionLocal
 from app.extensions import logger
 from app.routes.interview.helpers import calculate_time_difference
 from app.routes.interview.helpers import trigger_auto_scoring
+from app.services.interview_events import (
+    append_event, log_snapshot, materialize_legacy_columns, qa_counts, structured_counts,
+    qa_pairs_for, conversation_for, structured_conversation_for,
+)
+from app.services.interview_transcript import (
+    append_new_entries, format_transcript_header, format_transcript_entries, materialize_transcript,
+    transcript_for,
+)
 try:
     from app.extensions import executor
 except Exception:
@@ -55,12 +63,8 @@ def update_conversation_snapshot():
             if not candidate:
                 return jsonify({"error": "Session not found"}), 404
             
-            # Store structured conversation data
-            candidate.interview_conversation_structured = json.dumps(conversation_data)
-            
-            # Create formatted transcript
-            formatted_transcript = format_conversation_transcript(conversation_data, candidate.name)
-            candidate.interview_transcript = formatted_transcript
+            # Log only the entries this snapshot adds, changes, moves or drops
+            log_snapshot(session, session_id, candidate.id, conversation_data)
             
             # Update statistics
             questions = [entry for entry in conversation_data if entry.get('type') == 'question']
@@ -78,6 +82,7 @@ def update_conversation_snapshot():
             candidate.interview_last_activity = datetime.now()
             
             # Check for auto-completion
+            auto_completed = False
             if len(answers) >= 10 or (len(questions) > 0 and len(answers) >= len(questions)):
                 if not candidate.interview_completed_at:
                     candidate.interview_completed_at = datetime.now()
@@ -88,13 +93,17 @@ def update_conversation_snapshot():
                         duration = (candidate.interview_completed_at - candidate.interview_started_at).total_seconds()
                         candidate.interview_duration = int(duration)
                     
+                    materialize_legacy_columns(session, candidate)
+                    materialize_transcript(session, candidate)
                     logger.info(f"Auto-completed interview for {candidate.name} with {len(answers)} answers")
-                    
-                    # Trigger scoring
-                    executor.submit(trigger_auto_scoring, candidate.id)
+                    auto_completed = True
             
             session.commit()
             
+            # Trigger scoring only once the completion is committed, so the task sees it
+            if auto_completed:
+                trigger_auto_scoring(candidate.id)
+            
             return jsonify({
                 "success": True,
                 "questions": len(questions),
@@ -124,7 +133,7 @@ def get_conversation_data(session_id):
             return jsonify({"error": "Session not found"}), 404
         
         # Get structured conversation data
-        conversation_data = json.loads(candidate.interview_conversation_structured or '[]')
+        conversation_data = structured_conversation_for(session, candidate)
         
         return jsonify({
             "success": True,
@@ -142,7 +151,7 @@ def get_conversation_data(session_id):
                 "progress": candidate.interview_progress_percentage or 0,
                 "completed": candidate.interview_completed_at is not None
             },
-            "formatted_transcript": candidate.interview_transcript
+            "formatted_transcript": transcript_for(session, candidate)
         }), 200
         
     except Exception as e:
@@ -151,25 +160,8 @@ def get_conversation_data(session_id):
     finally:
         session.close()
 def format_conversation_transcript(conversation_data, candidate_name):
-    """Format conversation data into readable transcript"""
-    transcript = f"Interview Transcript - {candidate_name}\n"
-    transcript += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    transcript += "=" * 70 + "\n\n"
-    
-    for entry in conversation_data:
-        try:
-            timestamp = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
-            time_str = timestamp.strftime('%H:%M:%S')
-            speaker = 'AI Interviewer' if entry['speaker'] == 'avatar' else 'Candidate'
-            content = entry['content'].strip()
-            
-            transcript += f"[{time_str}] {speaker}:\n{content}\n\n"
-            
-        except (KeyError, ValueError) as e:
-            logger.warning(f"Error formatting entry: {e}")
-            continue
-    
-    return transcript
+    """Format conversation data into readable transcript (full regeneration, used for export)"""
+    return format_transcript_header(candidate_name) + format_transcript_entries(conversation_data)
 
 @conversation_bp.route('/api/interview/qa/track-enhanced', methods=['POST', 'OPTIONS'])
 @cross_origin()
@@ -197,46 +189,30 @@ def track_qa_enhanced():
             if not candidate:
                 return jsonify({"error": "Session not found"}), 404
             
-            # Get existing conversation data
-            conversation_data = json.loads(candidate.interview_conversation_structured or '[]')
-            
-            # Create new entry
-            entry = {
-                'id': metadata.get('entry_id', f"{entry_type}_{int(time.time())}"),
-                'type': entry_type,
-                'speaker': 'avatar' if entry_type == 'question' else 'candidate',
-                'content': content,
-                'timestamp': metadata.get('timestamp', datetime.now().isoformat()),
-                'sequence': metadata.get('sequence', len(conversation_data) + 1),
-                'linked_question_id': metadata.get('linked_question_id'),
-                'word_count': metadata.get('word_count', len(content.split())),
-                'confidence': metadata.get('confidence', 1.0),
-                'is_complete': metadata.get('is_complete', True)
-            }
-            
-            # Add to conversation data
-            conversation_data.append(entry)
-            
-            # Update candidate record
-            candidate.interview_conversation_structured = json.dumps(conversation_data)
+            # Append a single event row instead of rewriting the conversation blob
+            entry_id = metadata.get('entry_id', f"{entry_type}_{int(time.time())}")
+            append_event(
+                session, session_id, entry_type, content,
+                candidate_id=candidate.id,
+                timestamp=metadata.get('timestamp', datetime.now().isoformat()),
+                source='enhanced',
+                metadata={**metadata, 'entry_id': entry_id},
+            )
             candidate.interview_last_activity = datetime.now()
             
-            # Update counters
-            questions = [e for e in conversation_data if e.get('type') == 'question']
-            answers = [e for e in conversation_data if e.get('type') == 'answer']
+            # Update counters from the structured conversation (snapshot, else enhanced entries)
+            questions, answers = structured_counts(session, candidate)
             
-            candidate.interview_total_questions = len(questions)
-            candidate.interview_answered_questions = len(answers)
+            candidate.interview_total_questions = questions
+            candidate.interview_answered_questions = answers
             
             # Update progress
-            if len(questions) > 0:
-                progress = (len(answers) / len(questions)) * 100
+            if questions > 0:
+                progress = (answers / questions) * 100
                 candidate.interview_progress_percentage = min(progress, 100)
             
-            # Update formatted transcript
-            candidate.interview_transcript = format_conversation_transcript(
-                conversation_data, candidate.name
-            )
+            # Render just this entry into a transcript chunk
+            append_new_entries(session, candidate)
             
             session.commit()
             
@@ -244,9 +220,9 @@ def track_qa_enhanced():
             
             return jsonify({
                 "success": True,
-                "entry_id": entry['id'],
-                "total_questions": len(questions),
-                "answered_questions": len(answers),
+                "entry_id": entry_id,
+                "total_questions": questions,
+                "answered_questions": answers,
                 "progress": candidate.interview_progress_percentage
             }), 200
             
@@ -272,7 +248,7 @@ def export_conversation_enhanced(session_id):
         # Get format from query parameter
         format_type = request.args.get('format', 'json')
         
-        conversation_data = json.loads(candidate.interview_conversation_structured or '[]')
+        conversation_data = structured_conversation_for(session, candidate)
         
         if format_type == 'json':
             export_data = {
@@ -329,7 +305,7 @@ def validate_conversation_data(session_id):
         if not candidate:
             return jsonify({"error": "Session not found"}), 404
         
-        conversation_data = json.loads(candidate.interview_conversation_structured or '[]')
+        conversation_data = structured_conversation_for(session, candidate)
         
         # Validate data integrity
         issues = []
@@ -368,7 +344,7 @@ def validate_conversation_data(session_id):
             },
             "data_integrity": {
                 "has_structured_data": len(conversation_data) > 0,
-                "has_transcript": bool(candidate.interview_transcript),
+                "has_transcript": bool(transcript_for(session, candidate)),
                 "counters_match": (
                     len(questions) == (candidate.interview_total_questions or 0) and
                     len(answers) == (candidate.interview_answered_questions or 0)
@@ -430,82 +406,48 @@ def track_interview_qa_unified():
                 return jsonify({"error": "Session not found"}), 404
             
             # Proceed to track the Q&A data for the candidate
-            # Initialize or retrieve current interview data
-            qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
-            conversation = json.loads(candidate.interview_conversation or '[]')
-            transcript = candidate.interview_transcript or ""
+            # Each call appends one event row; qa_pairs/conversation are derived on read
             timestamp = datetime.now()
 
             if content_type == 'question':
                 # This is a question from the knowledge base (KB)
-                question_id = f"q_{len(qa_pairs) + 1}_{int(time.time())}"
-
-                # Store the question data
-                qa_entry = {
-                    'id': question_id,
-                    'question': content,
-                    'answer': None,
-                    'timestamp': timestamp.isoformat(),
-                    'source': 'knowledge_base',
-                    'is_transcribed': False,
-                    'metadata': metadata
-                }
-                qa_pairs.append(qa_entry)
-
-                # Add the question to the conversation
-                conversation.append({
-                    'type': 'question',
-                    'speaker': 'Avatar',
-                    'content': content,
-                    'timestamp': timestamp.isoformat(),
-                    'source': 'knowledge_base'
-                })
-
-                # Update transcript
-                transcript += f"\n[{timestamp.strftime('%H:%M:%S')}] Avatar (KB): {content}\n"
+                append_event(
+                    session, session_id, 'question', content,
+                    candidate_id=candidate.id,
+                    speaker='avatar',
+                    timestamp=timestamp.isoformat(),
+                    source='knowledge_base',
+                    metadata=metadata,
+                )
 
-                # Update the candidate's total question count
-                candidate.interview_total_questions = len(qa_pairs)
-                logger.info(f"Stored KB question #{len(qa_pairs)}: {content[:50]}...")
+                logger.info(f"Stored KB question: {content[:50]}...")
 
             elif content_type == 'answer':
-                # This is a transcribed answer from the candidate
-                # Find the most recent unanswered question
-                for qa in reversed(qa_pairs):
-                    if qa.get('question') and not qa.get('answer'):
-                        qa['answer'] = content
-                        qa['answer_timestamp'] = timestamp.isoformat()
-                        qa['answer_source'] = 'voice_transcription'
-                        qa['is_answer_transcribed'] = True
-                        qa['answer_metadata'] = metadata
-                        break
-
-                # Add the answer to the conversation
-                conversation.append({
-                    'type': 'answer',
-                    'speaker': 'Candidate',
-                    'content': content,
-                    'timestamp': timestamp.isoformat(),
-                    'source': 'voice_transcription'
-                })
-
-                # Update transcript
-                transcript += f"[{timestamp.strftime('%H:%M:%S')}] Candidate (Voice): {content}\n"
+                # This is a transcribed answer from the candidate; it is paired with
+                # the most recent unanswered question when qa_pairs are derived
+                append_event(
+                    session, session_id, 'answer', content,
+                    candidate_id=candidate.id,
+                    speaker='candidate',
+                    timestamp=timestamp.isoformat(),
+                    source='voice_transcription',
+                    metadata=metadata,
+                )
 
-                # Update the answered question count
-                answered = sum(1 for qa in qa_pairs if qa.get('answer'))
-                candidate.interview_answered_questions = answered
                 logger.info(f"Stored transcribed answer: {content[:50]}...")
 
+            # Recount from the qa_pairs view instead of incrementing the shared columns
+            total, answered = qa_counts(session, candidate)
+            candidate.interview_total_questions = total
+            candidate.interview_answered_questions = answered
+
             # Calculate interview progress
-            if candidate.interview_total_questions > 0:
-                progress = (candidate.interview_answered_questions / candidate.interview_total_questions) * 100
+            if total > 0:
+                progress = (answered / total) * 100
                 candidate.interview_progress_percentage = progress
 
-            # Save all updated data to the candidate record
-            candidate.interview_qa_pairs = json.dumps(qa_pairs)
-            candidate.interview_conversation = json.dumps(conversation)
-            candidate.interview_transcript = transcript
+            # Render only the new entry into a transcript chunk
+            append_new_entries(session, candidate)
             candidate.interview_last_activity = timestamp
 
             # Check for automatic interview completion if all questions are answered
@@ -514,6 +456,8 @@ def track_interview_qa_unified():
                 if not candidate.interview_completed_at:
                     candidate.interview_completed_at = datetime.now()
                     candidate.interview_ai_analysis_status = 'pending'
+                    materialize_legacy_columns(session, candidate)
+                    materialize_transcript(session, candidate)
                     logger.info(f"Auto-completed interview for {candidate.name}")
 
             # Commit the changes to the database
@@ -555,9 +499,9 @@ def debug_qa_tracking(session_id):
             return jsonify({"error": "Candidate not found"}), 404
         
         # Parse Q&A data
-        qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
-        qa_sequence = json.loads(candidate.interview_qa_sequence or '[]')
-        conversation = json.loads(candidate.interview_conversation or '[]')
+        qa_pairs = qa_pairs_for(session, candidate)
+        qa_sequence = json.loads(getattr(candidate, 'interview_qa_sequence', None) or '[]')
+        conversation = conversation_for(session, candidate)
         
         # Analyze the data
         questions = [q for q in qa_pairs if q.get('question')]
@@ -602,9 +546,9 @@ def get_qa_conversation_unified(session_id):
             return jsonify({"error": "Session not found"}), 404
         
         # Get data from all systems
-        qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
-        qa_sequence = json.loads(getattr(candidate, 'interview_qa_sequence', '[]'))
-        conversation = json.loads(getattr(candidate, 'interview_conversation', '[]'))
+        qa_pairs = qa_pairs_for(session, candidate)
+        qa_sequence = json.loads(getattr(candidate, 'interview_qa_sequence', None) or '[]')
+        conversation = conversation_for(session, candidate)
         
         # Format conversation from real-time conversation tracking (primary)
         formatted_conversation = []
@@ -658,7 +602,7 @@ def get_qa_conversation_unified(session_id):
             },
             "formatted_transcript": formatted_text,
             "structured_conversation": formatted_conversation,
-            "raw_transcript": candidate.interview_transcript,
+            "raw_transcript": transcript_for(session, candidate),
             "conversation": formatted_conversation,
             "stats": {
                 "total_exchanges": len(formatted_conversation),
@@ -693,9 +637,9 @@ def test_qa_tracking_unified(session_id):
             return jsonify({"error": "Session not found"}), 404
         
         # Get raw data from all systems
-        qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
-        qa_sequence = json.loads(getattr(candidate, 'interview_qa_sequence', '[]'))
-        conversation = json.loads(getattr(candidate, 'interview_conversation', '[]'))
+        qa_pairs = qa_pairs_for(session, candidate)
+        qa_sequence = json.loads(getattr(candidate, 'interview_qa_sequence', None) or '[]')
+        conversation = conversation_for(session, candidate)
         
         # Analyze tracking health
         tracking_health = {
@@ -728,7 +672,7 @@ def test_qa_tracking_unified(session_id):
                 "qa_sequence": qa_sequence,
                 "conversation": conversation
             },
-            "transcript_preview": candidate.interview_transcript[-500:] if candidate.interview_transcript else "No transcript",
+            "transcript_preview": transcript_for(session, candidate)[-500:] or "No transcript",
             "stats": {
                 "total_questions": candidate.interview_total_questions,
                 "answered_questions": candidate.interview_answered_questions,
@@ -809,7 +753,7 @@ def verify_qa_tracking_enhanced(session_id):
         answer_rate = (total_answers / total_questions * 100) if total_questions > 0 else 0
         
         # Get transcript preview
-        transcript = candidate.interview_transcript or ''
+        transcript = transcript_for(session, candidate)
         transcript_lines = transcript.strip().split('\n')[-10:]  # Last 10 lines
         
         return jsonify({
@@ -854,8 +798,9 @@ def get_interview_conversation(candidate_id):
         if not candidate:
             return jsonify({"error": "Candidate not found"}), 404
         
-        # Get formatted conversation
-        conversation = candidate.interview_conversation or "No conversation recorded"
+        # Get formatted conversation (derived from the event log, as the column used to hold it)
+        conversation = conversation_for(session, candidate)
+        conversation = json.dumps(conversation) if conversation else "No conversation recorded"
         
         return jsonify({
             "success": True,
@@ -886,7 +831,7 @@ def get_interview_qa_data(candidate_id):
         # Parse all Q&A data
         questions = json.loads(candidate.interview_questions_asked or '[]')
         answers = json.loads(candidate.interview_answers_given or '[]')
-        qa_pairs = json.loads(getattr(candidate, 'interview_qa_pairs', '[]'))
+        qa_pairs = qa_pairs_for(session, candidate)
         
         return jsonify({
             "success": True,
@@ -904,7 +849,7 @@ def get_interview_qa_data(candidate_id):
                 "total_answers": len(answers),
                 "completion_rate": f"{(len(answers) / len(questions) * 100) if questions else 0:.1f}%"
             },
-            "transcript": candidate.interview_transcript,
+            "transcript": transcript_for(session, candidate),
             "analysis": {
                 "status": candidate.interview_ai_analysis_status,
                 "overall_score": candidate.interview_ai_score,
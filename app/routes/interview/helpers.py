@@ -1,16 +1,20 @@
 
 # Shared helper utilities extracted from original file (verbatim bodies)
 import asyncio
-from linecache import cache
 from flask import jsonify, Response
 from datetime import datetime, timezone, timedelta
 import os, json, time, re, requests, uuid
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import and_
-from app.extensions import logger
+from app.extensions import cache, logger
 import threading
 import traceback  
 from app.models.db import Candidate, SessionLocal
+from app.services.interview_events import materialize_legacy_columns, qa_pairs_for
+from app.services.interview_transcript import format_transcript_header, format_transcript_entries
+from app.services.resume_text import get_resume_text
+from app.services.scheduler import scheduler
+from app.services.task_queue import task
 from flask_cors import cross_origin
 from flask import Blueprint, jsonify, request, Response
 try:
@@ -185,25 +189,8 @@ def create_enhanced_kb_content(candidate_name, position, company, resume_content
     )
 
 def format_conversation_transcript(conversation_data, candidate_name):
-    """Format conversation data into readable transcript"""
-    transcript = f"Interview Transcript - {candidate_name}\n"
-    transcript += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    transcript += "=" * 70 + "\n\n"
-    
-    for entry in conversation_data:
-        try:
-            timestamp = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
-            time_str = timestamp.strftime('%H:%M:%S')
-            speaker = 'AI Interviewer' if entry['speaker'] == 'avatar' else 'Candidate'
-            content = entry['content'].strip()
-            
-            transcript += f"[{time_str}] {speaker}:\n{content}\n\n"
-            
-        except (KeyError, ValueError) as e:
-            logger.warning(f"Error formatting entry: {e}")
-            continue
-    
-    return transcript
+    """Format conversation data into readable transcript (full regeneration, used for export)"""
+    return format_transcript_header(candidate_name) + format_transcript_entries(conversation_data)
 
 def migrate_conversation_storage():
     """Migrate existing interview data to new conversation storage format"""
@@ -232,7 +219,7 @@ def migrate_conversation_storage():
         for candidate in candidates:
             try:
                 # Try to reconstruct conversation from existing data
-                qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+                qa_pairs = qa_pairs_for(session, candidate)
                 conversation_data = []
                 
                 for i, qa in enumerate(qa_pairs):
@@ -273,35 +260,38 @@ def migrate_conversation_storage():
     finally:
         session.close()
 
+@task(queue="scoring")
+def check_and_complete_interview(candidate_id):
+    """Complete one started interview if it meets the automatic completion conditions"""
+    session = SessionLocal()
+    try:
+        candidate = session.query(Candidate).filter_by(id=candidate_id).first()
+        if not candidate or candidate.interview_completed_at or not candidate.interview_token:
+            return None
+        if not completion_monitor._should_complete(candidate):
+            return None
+        token = candidate.interview_token
+    finally:
+        session.close()
+    return completion_handler.complete_interview(token, "periodic_completion_check")
+
 def periodic_interview_completion_check():
-    """Periodically check for interviews that should be completed"""
-    while True:
-        try:
-            time.sleep(300)  # Check every 5 minutes
-            
-            session = SessionLocal()
-            try:
-                # Find uncompleted interviews
-                uncompleted = session.query(Candidate).filter(
-                    Candidate.interview_started_at.isnot(None),
-                    Candidate.interview_completed_at.is_(None)
-                ).all()
-                
-                for candidate in uncompleted:
-                    check_and_complete_interview(candidate.id)
-                    
-            finally:
-                session.close()
-                
-        except Exception as e:
-            logger.error(f"Error in periodic completion check: {e}")
+    """Check for interviews that should be completed (scheduled every 5 minutes)"""
+    session = SessionLocal()
+    try:
+        # Find uncompleted interviews
+        uncompleted = session.query(Candidate.id).filter(
+            Candidate.interview_started_at.isnot(None),
+            Candidate.interview_completed_at.is_(None)
+        ).all()
+    finally:
+        session.close()
+    
+    for (candidate_id,) in uncompleted:
+        check_and_complete_interview(candidate_id)
 
-# Start this when the app starts
-completion_check_thread = threading.Thread(
-    target=periodic_interview_completion_check,
-    daemon=True
-)
-completion_check_thread.start()
+# Runs on the app scheduler (one worker at a time) once the app starts
+scheduler.register("interview_completion_check", periodic_interview_completion_check, 300)
 
 def check_and_update_expired_interviews():
     """Automatically check and mark expired interviews"""
@@ -520,163 +510,162 @@ Overall: {'Strong candidate' if overall_score >= 70 else 'Potential candidate' i
 
 # Update the trigger_auto_scoring function in backend.py:
 
-def trigger_auto_scoring(candidate_id):
-    """Automatically trigger AI scoring when interview completes"""
-    def run_scoring():
-        session = SessionLocal()
+@task(queue="scoring")
+def run_auto_scoring(candidate_id):
+    """Score a completed interview and store the results on the candidate"""
+    session = SessionLocal()
+    try:
+        candidate = session.query(Candidate).filter_by(id=candidate_id).first()
+        if not candidate:
+            logger.error(f"Candidate {candidate_id} not found for scoring")
+            return
+        
+        # Update status to processing
+        candidate.interview_ai_analysis_status = 'processing'
+        session.commit()
+        
+        # Parse Q&A data
+        qa_pairs = []
         try:
-            candidate = session.query(Candidate).filter_by(id=candidate_id).first()
-            if not candidate:
-                logger.error(f"Candidate {candidate_id} not found for scoring")
-                return
-            
-            # Update status to processing
-            candidate.interview_ai_analysis_status = 'processing'
-            session.commit()
-            
-            # Parse Q&A data
+            # Bring interview_qa_pairs up to date with the event log first
+            materialize_legacy_columns(session, candidate)
+            # Try to parse Q&A pairs
+            if candidate.interview_qa_pairs:
+                qa_pairs = json.loads(candidate.interview_qa_pairs)
+            elif candidate.interview_questions_asked and candidate.interview_answers_given:
+                # Build Q&A pairs from separate fields
+                questions = json.loads(candidate.interview_questions_asked or '[]')
+                answers = json.loads(candidate.interview_answers_given or '[]')
+                
+                for i, question in enumerate(questions):
+                    qa_pair = {
+                        'question': question.get('text', ''),
+                        'answer': answers[i].get('text', '') if i < len(answers) else '',
+                        'timestamp': question.get('timestamp', None)
+                    }
+                    qa_pairs.append(qa_pair)
+        except Exception as e:
+            logger.error(f"Failed to parse Q&A data: {e}")
             qa_pairs = []
-            try:
-                # Try to parse Q&A pairs
-                if candidate.interview_qa_pairs:
-                    qa_pairs = json.loads(candidate.interview_qa_pairs)
-                elif candidate.interview_questions_asked and candidate.interview_answers_given:
-                    # Build Q&A pairs from separate fields
-                    questions = json.loads(candidate.interview_questions_asked or '[]')
-                    answers = json.loads(candidate.interview_answers_given or '[]')
-                    
-                    for i, question in enumerate(questions):
-                        qa_pair = {
-                            'question': question.get('text', ''),
-                            'answer': answers[i].get('text', '') if i < len(answers) else '',
-                            'timestamp': question.get('timestamp', None)
-                        }
-                        qa_pairs.append(qa_pair)
-            except Exception as e:
-                logger.error(f"Failed to parse Q&A data: {e}")
-                qa_pairs = []
-            
-            # Perform analysis
-            if len(qa_pairs) > 0:
-                # Use your enhanced analysis function
-                scores = analyze_interview_with_ai_enhanced(qa_pairs, candidate)
-            else:
-                # Default scores if no Q&A data
-                scores = {
-                    'technical_score': 0,
-                    'communication_score': 0,
-                    'problem_solving_score': 0,
-                    'cultural_fit_score': 0,
-                    'overall_score': 0,
-                    'feedback': 'No interview data available for analysis',
-                    'confidence': 0
-                }
-            
-            # Update candidate with scores
-            candidate.interview_ai_score = scores.get('overall_score', 0)
-            candidate.interview_ai_technical_score = scores.get('technical_score', 0)
-            candidate.interview_ai_communication_score = scores.get('communication_score', 0)
-            candidate.interview_ai_problem_solving_score = scores.get('problem_solving_score', 0)
-            candidate.interview_ai_cultural_fit_score = scores.get('cultural_fit_score', 0)
-            candidate.interview_ai_overall_feedback = scores.get('feedback', '')
-            
-            # Extract strengths and weaknesses
-            if 'strengths' in scores:
-                candidate.interview_ai_strengths = json.dumps(scores['strengths'])
-            if 'weaknesses' in scores:
-                candidate.interview_ai_weaknesses = json.dumps(scores['weaknesses'])
-            
-            # Set final status based on score
-            if candidate.interview_ai_score >= 70:
-                candidate.interview_final_status = 'Passed'
-                candidate.final_status = 'Interview Passed'
-            else:
-                candidate.interview_final_status = 'Failed'
-                candidate.final_status = 'Interview Failed'
-            
-            # Mark analysis as complete
-            candidate.interview_ai_analysis_status = 'completed'
-            
-            # Store completion timestamp
-            if hasattr(candidate, 'interview_ai_analysis_completed_at'):
-                candidate.interview_ai_analysis_completed_at = datetime.now()
-            
+        
+        # Perform analysis
+        if len(qa_pairs) > 0:
+            # Use your enhanced analysis function
+            scores = analyze_interview_with_ai_enhanced(qa_pairs, candidate)
+        else:
+            # Default scores if no Q&A data
+            scores = {
+                'technical_score': 0,
+                'communication_score': 0,
+                'problem_solving_score': 0,
+                'cultural_fit_score': 0,
+                'overall_score': 0,
+                'feedback': 'No interview data available for analysis',
+                'confidence': 0
+            }
+        
+        # Update candidate with scores
+        candidate.interview_ai_score = scores.get('overall_score', 0)
+        candidate.interview_ai_technical_score = scores.get('technical_score', 0)
+        candidate.interview_ai_communication_score = scores.get('communication_score', 0)
+        candidate.interview_ai_problem_solving_score = scores.get('problem_solving_score', 0)
+        candidate.interview_ai_cultural_fit_score = scores.get('cultural_fit_score', 0)
+        candidate.interview_ai_overall_feedback = scores.get('feedback', '')
+        
+        # Extract strengths and weaknesses
+        if 'strengths' in scores:
+            candidate.interview_ai_strengths = json.dumps(scores['strengths'])
+        if 'weaknesses' in scores:
+            candidate.interview_ai_weaknesses = json.dumps(scores['weaknesses'])
+        
+        # Set final status based on score
+        if candidate.interview_ai_score >= 70:
+            candidate.interview_final_status = 'Passed'
+            candidate.final_status = 'Interview Passed'
+        else:
+            candidate.interview_final_status = 'Failed'
+            candidate.final_status = 'Interview Failed'
+        
+        # Mark analysis as complete
+        candidate.interview_ai_analysis_status = 'completed'
+        
+        # Store completion timestamp
+        if hasattr(candidate, 'interview_ai_analysis_completed_at'):
+            candidate.interview_ai_analysis_completed_at = datetime.now()
+        
+        # The commit bumps this candidate's cache tags, so the dashboard picks up the scores
+        session.commit()
+        
+        logger.info(f"Auto-scoring completed for candidate {candidate_id}: {candidate.interview_ai_score}%")
+        
+        # Send notification if configured
+        if hasattr(globals(), 'notify_scoring_complete'):
+            notify_scoring_complete(candidate)
+        
+    except Exception as e:
+        logger.error(f"Auto-scoring failed for candidate {candidate_id}: {e}", exc_info=True)
+        if candidate:
+            candidate.interview_ai_analysis_status = 'failed'
             session.commit()
-            
-            # Clear cache to update frontend
-            cache.delete_memoized(get_cached_candidates)
-            
-            logger.info(f"Auto-scoring completed for candidate {candidate_id}: {candidate.interview_ai_score}%")
-            
-            # Send notification if configured
-            if hasattr(globals(), 'notify_scoring_complete'):
-                notify_scoring_complete(candidate)
-            
-        except Exception as e:
-            logger.error(f"Auto-scoring failed for candidate {candidate_id}: {e}", exc_info=True)
-            if candidate:
-                candidate.interview_ai_analysis_status = 'failed'
-                session.commit()
-        finally:
-            session.close()
-    
-    # Run in background thread
-    if 'executor' in globals():
-        executor.submit(run_scoring)
-    else:
-        # Run directly if no executor
-        run_scoring()
+    finally:
+        session.close()
 
-def trigger_ai_analysis(candidate_id):
-    """Trigger REAL AI analysis for completed interview - NO RANDOM SCORES"""
-    def run_analysis():
-        session = SessionLocal()
-        try:
-            candidate = session.query(Candidate).filter_by(id=candidate_id).first()
-            if not candidate:
-                logger.error(f"Candidate {candidate_id} not found")
-                return
-            
-            # Update status
-            candidate.interview_ai_analysis_status = 'processing'
-            session.commit()
-            
-            # Parse Q&A data
-            questions = json.loads(candidate.interview_questions_asked or '[]')
-            answers = json.loads(candidate.interview_answers_given or '[]')
-            
-            # Build Q&A pairs for analysis
-            qa_pairs = []
-            for i, question in enumerate(questions):
-                qa_pair = {
-                    'question': question.get('text', '') if isinstance(question, dict) else str(question),
-                    'answer': ''
-                }
-                if i < len(answers):
-                    answer = answers[i]
-                    qa_pair['answer'] = answer.get('text', '') if isinstance(answer, dict) else str(answer)
-                qa_pairs.append(qa_pair)
-            
-            # CHECK FOR INVALID/TEST RESPONSES
-            has_invalid_responses = False
-            invalid_patterns = ['INIT_INTERVIEW', 'TEST_RESPONSE', 'undefined', 'null']
-            
-            for qa in qa_pairs:
-                answer_text = qa.get('answer', '').strip()
-                if any(pattern in answer_text for pattern in invalid_patterns) or len(answer_text) < 5:
-                    has_invalid_responses = True
-                    logger.warning(f"Invalid response detected: {answer_text[:50]}")
-                    break
-            
-            # DYNAMIC SCORING BASED ON ACTUAL CONTENT
-            if has_invalid_responses or len(qa_pairs) == 0:
-                # Failed interview - invalid or no responses
-                candidate.interview_ai_score = 0
-                candidate.interview_ai_technical_score = 0
-                candidate.interview_ai_communication_score = 0
-                candidate.interview_ai_problem_solving_score = 0
-                candidate.interview_ai_cultural_fit_score = 0
-                candidate.interview_ai_overall_feedback = """
+
+def trigger_auto_scoring(candidate_id):
+    """Automatically trigger AI scoring when interview completes"""
+    # Run on the durable scoring queue
+    run_auto_scoring.delay(candidate_id)
+
+@task(queue="scoring")
+def run_ai_analysis(candidate_id):
+    """Content analysis of a completed interview (no random scores)"""
+    session = SessionLocal()
+    try:
+        candidate = session.query(Candidate).filter_by(id=candidate_id).first()
+        if not candidate:
+            logger.error(f"Candidate {candidate_id} not found")
+            return
+        
+        # Update status
+        candidate.interview_ai_analysis_status = 'processing'
+        session.commit()
+        
+        # Parse Q&A data
+        questions = json.loads(candidate.interview_questions_asked or '[]')
+        answers = json.loads(candidate.interview_answers_given or '[]')
+        
+        # Build Q&A pairs for analysis
+        qa_pairs = []
+        for i, question in enumerate(questions):
+            qa_pair = {
+                'question': question.get('text', '') if isinstance(question, dict) else str(question),
+                'answer': ''
+            }
+            if i < len(answers):
+                answer = answers[i]
+                qa_pair['answer'] = answer.get('text', '') if isinstance(answer, dict) else str(answer)
+            qa_pairs.append(qa_pair)
+        
+        # CHECK FOR INVALID/TEST RESPONSES
+        has_invalid_responses = False
+        invalid_patterns = ['INIT_INTERVIEW', 'TEST_RESPONSE', 'undefined', 'null']
+        
+        for qa in qa_pairs:
+            answer_text = qa.get('answer', '').strip()
+            if any(pattern in answer_text for pattern in invalid_patterns) or len(answer_text) < 5:
+                has_invalid_responses = True
+                logger.warning(f"Invalid response detected: {answer_text[:50]}")
+                break
+        
+        # DYNAMIC SCORING BASED ON ACTUAL CONTENT
+        if has_invalid_responses or len(qa_pairs) == 0:
+            # Failed interview - invalid or no responses
+            candidate.interview_ai_score = 0
+            candidate.interview_ai_technical_score = 0
+            candidate.interview_ai_communication_score = 0
+            candidate.interview_ai_problem_solving_score = 0
+            candidate.interview_ai_cultural_fit_score = 0
+            candidate.interview_ai_overall_feedback = """
 Interview Analysis: FAILED
 - No valid responses provided
 - Interview appears to be incomplete or contains test data
@@ -684,46 +673,46 @@ Interview Analysis: FAILED
 
 Recommendation: Schedule a new interview
 """
-                candidate.interview_final_status = 'Failed - Invalid Response'
-                
-            else:
-                # ACTUAL DYNAMIC ANALYSIS
-                scores = analyze_interview_content(qa_pairs, candidate)
-                
-                candidate.interview_ai_score = scores['overall']
-                candidate.interview_ai_technical_score = scores['technical']
-                candidate.interview_ai_communication_score = scores['communication']
-                candidate.interview_ai_problem_solving_score = scores['problem_solving']
-                candidate.interview_ai_cultural_fit_score = scores['cultural_fit']
-                candidate.interview_ai_overall_feedback = scores['feedback']
-                
-                # Set final status based on ACTUAL score
-                if scores['overall'] >= 70:
-                    candidate.interview_final_status = 'Recommended'
-                elif scores['overall'] >= 50:
-                    candidate.interview_final_status = 'Review Required'
-                else:
-                    candidate.interview_final_status = 'Not Recommended'
+            candidate.interview_final_status = 'Failed - Invalid Response'
             
-            candidate.interview_ai_analysis_status = 'completed'
+        else:
+            # ACTUAL DYNAMIC ANALYSIS
+            scores = analyze_interview_content(qa_pairs, candidate)
+            
+            candidate.interview_ai_score = scores['overall']
+            candidate.interview_ai_technical_score = scores['technical']
+            candidate.interview_ai_communication_score = scores['communication']
+            candidate.interview_ai_problem_solving_score = scores['problem_solving']
+            candidate.interview_ai_cultural_fit_score = scores['cultural_fit']
+            candidate.interview_ai_overall_feedback = scores['feedback']
+            
+            # Set final status based on ACTUAL score
+            if scores['overall'] >= 70:
+                candidate.interview_final_status = 'Recommended'
+            elif scores['overall'] >= 50:
+                candidate.interview_final_status = 'Review Required'
+            else:
+                candidate.interview_final_status = 'Not Recommended'
+        
+        candidate.interview_ai_analysis_status = 'completed'
+        session.commit()
+        
+        logger.info(f"Dynamic analysis completed for {candidate.name}: {candidate.interview_ai_score}%")
+        
+    except Exception as e:
+        logger.error(f"AI analysis failed for candidate {candidate_id}: {e}", exc_info=True)
+        if candidate:
+            candidate.interview_ai_analysis_status = 'failed'
+            candidate.interview_ai_overall_feedback = f"Analysis failed: {str(e)}"
             session.commit()
-            
-            logger.info(f"Dynamic analysis completed for {candidate.name}: {candidate.interview_ai_score}%")
-            
-            # Clear cache
-            cache.delete_memoized(get_cached_candidates)
-            
-        except Exception as e:
-            logger.error(f"AI analysis failed for candidate {candidate_id}: {e}", exc_info=True)
-            if candidate:
-                candidate.interview_ai_analysis_status = 'failed'
-                candidate.interview_ai_overall_feedback = f"Analysis failed: {str(e)}"
-                session.commit()
-        finally:
-            session.close()
-    
-    # Run in background thread
-    executor.submit(run_analysis)
+    finally:
+        session.close()
+
+
+def trigger_ai_analysis(candidate_id):
+    """Trigger REAL AI analysis for completed interview - NO RANDOM SCORES"""
+    # Run on the durable scoring queue
+    run_ai_analysis.delay(candidate_id)
 
 def analyze_interview_content(qa_pairs, candidate):
     """REAL content analysis - not random!"""
@@ -1086,30 +1075,31 @@ def complete_interview_auto(candidate_id):
         session.close()
 
 
+@task(queue="scoring")
+def check_and_score(candidate_id):
+    """Force-complete and score an interview that was abandoned mid-way"""
+    session = SessionLocal()
+    try:
+        candidate = session.query(Candidate).filter_by(id=candidate_id).first()
+        
+        # Check if interview is still incomplete
+        if candidate and candidate.interview_started_at and not candidate.interview_completed_at:
+            # Check for recent activity
+            if candidate.interview_last_activity:
+                time_since = (datetime.now() - candidate.interview_last_activity).total_seconds()
+                if time_since > 600:  # No activity for 10 minutes
+                    # Force complete and score
+                    complete_interview_auto(candidate_id)
+    except Exception as e:
+        logger.error(f"Error in scheduled scoring: {e}")
+    finally:
+        session.close()
+
+
 def schedule_auto_scoring(candidate_id, delay_minutes=45):
     """Schedule automatic scoring if interview doesn't complete normally"""
-    def check_and_score():
-        time.sleep(delay_minutes * 60)
-        
-        session = SessionLocal()
-        try:
-            candidate = session.query(Candidate).filter_by(id=candidate_id).first()
-            
-            # Check if interview is still incomplete
-            if candidate and candidate.interview_started_at and not candidate.interview_completed_at:
-                # Check for recent activity
-                if candidate.interview_last_activity:
-                    time_since = (datetime.now() - candidate.interview_last_activity).total_seconds()
-                    if time_since > 600:  # No activity for 10 minutes
-                        # Force complete and score
-                        complete_interview_auto(candidate_id)
-        except Exception as e:
-            logger.error(f"Error in scheduled scoring: {e}")
-        finally:
-            session.close()
-    
-    # Schedule in background
-    threading.Thread(target=check_and_score, daemon=True).start()
+    # A delayed task row, not a sleeping thread per candidate
+    check_and_score.enqueue((candidate_id,), countdown=delay_minutes * 60)
 
 
 def send_realtime_update(candidate_id, data):
@@ -1212,125 +1202,9 @@ def _append_jsonl(path, obj):
     with open(path, 'a', encoding='utf-8') as f:
         f.write(json.dumps(obj, ensure_ascii=False) + '\n')
 
-def extract_resume_content(resume_path):
-    """Extract text content from resume with better error handling"""
-    try:
-        if not os.path.exists(resume_path):
-            logger.error(f"Resume file not found: {resume_path}")
-            return ""
-        
-        file_ext = os.path.splitext(resume_path)[1].lower()
-        logger.info(f"Extracting resume: {resume_path} (type: {file_ext})")
-        
-        resume_text = ""
-        
-        if file_ext == '.pdf':
-            # Try PyPDF2 first
-            try:
-                import PyPDF2
-                with open(resume_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        resume_text += page.extract_text() + "\n"
-                
-                if resume_text.strip():
-                    logger.info(f"PDF extracted with PyPDF2: {len(resume_text)} chars")
-                    return resume_text.strip()
-            except Exception as e:
-                logger.warning(f"PyPDF2 failed: {e}")
-            
-            # Try pdfplumber as fallback
-            try:
-                import pdfplumber
-                with pdfplumber.open(resume_path) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            resume_text += page_text + "\n"
-                
-                if resume_text.strip():
-                    logger.info(f"PDF extracted with pdfplumber: {len(resume_text)} chars")
-                    return resume_text.strip()
-            except Exception as e:
-                logger.warning(f"pdfplumber failed: {e}")
-                    
-        elif file_ext in ['.docx', '.doc']:
-            try:
-                from docx import Document
-                doc = Document(resume_path)
-                resume_text = "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-                logger.info(f"DOCX extracted: {len(resume_text)} chars")
-                return resume_text.strip()
-            except Exception as e:
-                logger.error(f"DOCX extraction error: {e}")
-                
-        elif file_ext == '.txt':
-            try:
-                with open(resume_path, 'r', encoding='utf-8') as file:
-                    resume_text = file.read()
-                logger.info(f"TXT extracted: {len(resume_text)} chars")
-                return resume_text.strip()
-            except UnicodeDecodeError:
-                with open(resume_path, 'r', encoding='latin-1') as file:
-                    resume_text = file.read()
-                return resume_text.strip()
-        
-        # If we couldn't extract anything, return empty string
-        if not resume_text:
-            logger.error(f"Failed to extract any text from {resume_path}")
-            
-    except Exception as e:
-        logger.error(f"Resume extraction failed: {e}", exc_info=True)
-    
-    return ""
-
 def extract_pdf_content(pdf_path):
-    """Extract content from PDF using multiple methods"""
-    try:
-        # Method 1: Try PyPDF2
-        try:
-            import PyPDF2
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                if text.strip():
-                    return text.strip()
-        except Exception as e:
-            logger.warning(f"PyPDF2 extraction failed: {str(e)}")
-        
-        # Method 2: Try pdfplumber
-        try:
-            import pdfplumber
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                if text.strip():
-                    return text.strip()
-        except Exception as e:
-            logger.warning(f"pdfplumber extraction failed: {str(e)}")
-        
-        # Method 3: Try pymupdf (fitz)
-        try:
-            import fitz  # pymupdf
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page in doc:
-                text += page.get_text() + "\n"
-            doc.close()
-            if text.strip():
-                return text.strip()
-        except Exception as e:
-            logger.warning(f"pymupdf extraction failed: {str(e)}")
-            
-    except Exception as e:
-        logger.error(f"PDF extraction failed: {str(e)}")
-    
-    return ""
+    """Extract content from PDF using multiple methods (shared resume text store)"""
+    return get_resume_text(pdf_path)
 
 
 
@@ -1420,144 +1294,75 @@ def generate_custom_interview_prompt(candidate, resume_content, job_description)
 # 2. Enhanced resume extraction function with better error handling
 
 def extract_resume_content(resume_path):
-    """Extract text content from resume with better error handling"""
+    """Extract text content from resume (extracted once per file content, then served from the store)"""
+    return get_resume_text(resume_path)
+
+def start_interview_auto_recovery():
+    """Schedule interview_auto_recovery_system every 2 minutes"""
+    scheduler.register("interview_auto_recovery", interview_auto_recovery_system, 120)
+    scheduler.start()
+
+def interview_auto_recovery_system():
+    """Find and fix incomplete interviews (one pass; see start_interview_auto_recovery)"""
+    session = SessionLocal()
     try:
-        if not os.path.exists(resume_path):
-            logger.error(f"Resume file not found: {resume_path}")
-            return ""
+        from datetime import datetime, timedelta
         
-        file_ext = os.path.splitext(resume_path)[1].lower()
-        logger.info(f"Extracting resume: {resume_path} (type: {file_ext})")
+        # Find potentially stuck interviews
+        now = datetime.now()
         
-        resume_text = ""
+        # Case 1: Started but not completed after 1 hour
+        one_hour_ago = now - timedelta(hours=1)
+        stuck_interviews = session.query(Candidate).filter(
+            Candidate.interview_started_at.isnot(None),
+            Candidate.interview_completed_at.is_(None),
+            Candidate.interview_started_at < one_hour_ago
+        ).all()
         
-        if file_ext == '.pdf':
-            # Try PyPDF2 first
-            try:
-                import PyPDF2
-                with open(resume_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        resume_text += page.extract_text() + "\n"
-                
-                if resume_text.strip():
-                    logger.info(f"PDF extracted with PyPDF2: {len(resume_text)} chars")
-                    return resume_text.strip()
-            except Exception as e:
-                logger.warning(f"PyPDF2 failed: {e}")
-            
-            # Try pdfplumber as fallback
+        for candidate in stuck_interviews:
+            # Check if has Q&A data
+            has_qa_data = False
             try:
-                import pdfplumber
-                with pdfplumber.open(resume_path) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            resume_text += page_text + "\n"
-                
-                if resume_text.strip():
-                    logger.info(f"PDF extracted with pdfplumber: {len(resume_text)} chars")
-                    return resume_text.strip()
-            except Exception as e:
-                logger.warning(f"pdfplumber failed: {e}")
-                    
-        elif file_ext in ['.docx', '.doc']:
-            try:
-                from docx import Document
-                doc = Document(resume_path)
-                resume_text = "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
-                logger.info(f"DOCX extracted: {len(resume_text)} chars")
-                return resume_text.strip()
-            except Exception as e:
-                logger.error(f"DOCX extraction error: {e}")
-                
-        elif file_ext == '.txt':
-            try:
-                with open(resume_path, 'r', encoding='utf-8') as file:
-                    resume_text = file.read()
-                logger.info(f"TXT extracted: {len(resume_text)} chars")
-                return resume_text.strip()
-            except UnicodeDecodeError:
-                with open(resume_path, 'r', encoding='latin-1') as file:
-                    resume_text = file.read()
-                return resume_text.strip()
-        
-        # If we couldn't extract anything, return empty string
-        if not resume_text:
-            logger.error(f"Failed to extract any text from {resume_path}")
-            
-    except Exception as e:
-        logger.error(f"Resume extraction failed: {e}", exc_info=True)
-    
-    return ""
-
-def interview_auto_recovery_system():
-    """Continuously monitor and fix incomplete interviews"""
-    while True:
-        time.sleep(120)  # Check every 2 minutes
-        
-        session = SessionLocal()
-        try:
-            from datetime import datetime, timedelta
-            
-            # Find potentially stuck interviews
-            now = datetime.now()
-            
-            # Case 1: Started but not completed after 1 hour
-            one_hour_ago = now - timedelta(hours=1)
-            stuck_interviews = session.query(Candidate).filter(
-                Candidate.interview_started_at.isnot(None),
-                Candidate.interview_completed_at.is_(None),
-                Candidate.interview_started_at < one_hour_ago
-            ).all()
-            
-            for candidate in stuck_interviews:
-                # Check if has Q&A data
-                has_qa_data = False
-                try:
-                    qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
-                    questions = json.loads(candidate.interview_questions_asked or '[]')
-                    has_qa_data = len(qa_pairs) > 0 or len(questions) > 0
-                except:
-                    pass
-                
-                if has_qa_data or (now - candidate.interview_started_at).total_seconds() > 7200:
-                    candidate.interview_completed_at = now
-                    candidate.interview_status = 'completed'
-                    candidate.interview_progress_percentage = 100
-                    candidate.final_status = 'Interview Completed - Auto Recovery'
-                    candidate.interview_ai_analysis_status = 'pending'
-                    
-                    if candidate.interview_started_at:
-                        duration = (now - candidate.interview_started_at).total_seconds()
-                        candidate.interview_duration = int(duration)
-                    
-                    logger.info(f"Auto-recovered interview for {candidate.name} (ID: {candidate.id})")
-            
-            # Case 2: Has 100% progress but no completion timestamp
-            incomplete_100 = session.query(Candidate).filter(
-                Candidate.interview_progress_percentage >= 100,
-                Candidate.interview_completed_at.is_(None)
-            ).all()
+                qa_pairs = qa_pairs_for(session, candidate)
+                questions = json.loads(candidate.interview_questions_asked or '[]')
+                has_qa_data = len(qa_pairs) > 0 or len(questions) > 0
+            except:
+                pass
             
-            for candidate in incomplete_100:
+            if has_qa_data or (now - candidate.interview_started_at).total_seconds() > 7200:
                 candidate.interview_completed_at = now
                 candidate.interview_status = 'completed'
-                candidate.final_status = 'Interview Completed - Progress 100%'
+                candidate.interview_progress_percentage = 100
+                candidate.final_status = 'Interview Completed - Auto Recovery'
                 candidate.interview_ai_analysis_status = 'pending'
-                logger.info(f"Completed interview at 100% progress for {candidate.name}")
-            
-            session.commit()
-            
-            # Clear cache after updates
-            if stuck_interviews or incomplete_100:
-                cache.clear()
-            
-        except Exception as e:
-            logger.error(f"Auto-recovery error: {e}")
-            session.rollback()
-        finally:
-            session.close()
+                
+                if candidate.interview_started_at:
+                    duration = (now - candidate.interview_started_at).total_seconds()
+                    candidate.interview_duration = int(duration)
+                
+                logger.info(f"Auto-recovered interview for {candidate.name} (ID: {candidate.id})")
+        
+        # Case 2: Has 100% progress but no completion timestamp
+        incomplete_100 = session.query(Candidate).filter(
+            Candidate.interview_progress_percentage >= 100,
+            Candidate.interview_completed_at.is_(None)
+        ).all()
+        
+        for candidate in incomplete_100:
+            candidate.interview_completed_at = now
+            candidate.interview_status = 'completed'
+            candidate.final_status = 'Interview Completed - Progress 100%'
+            candidate.interview_ai_analysis_status = 'pending'
+            logger.info(f"Completed interview at 100% progress for {candidate.name}")
+        
+        # Only the recovered candidates' cache tags are bumped by this commit
+        session.commit()
+        
+    except Exception as e:
+        logger.error(f"Auto-recovery error: {e}")
+        session.rollback()
+    finally:
+        session.close()
 
 def notify_admin(subject, message, error_details=None):
     """Send critical notifications to admin"""
@@ -1594,7 +1399,7 @@ def run_bulk_scraping_with_monitoring():
         
         # Import and run the bulk scraping function
         try:
-            from testlify_results_scraper import scrape_all_pending_assessments
+            from app.services.testlify_results_scraper import scrape_all_pending_assessments
         except ImportError as e:
             logger.error(f"Failed to import scraper: {e}")
             notify_admin(
@@ -1604,12 +1409,7 @@ def run_bulk_scraping_with_monitoring():
             return
         
         # Run the async scraping function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            results_summary = loop.run_until_complete(scrape_all_pending_assessments())
-        finally:
-            loop.close()
+        results_summary = asyncio.run(scrape_all_pending_assessments())
         
         duration = time.time() - start_time
         total_candidates = sum(results_summary.values()) if isinstance(results_summary, dict) else 0
@@ -1660,6 +1460,7 @@ class InterviewErrorRecovery:
                 Candidate.interview_completed_at.is_(None)
             ).all()
             
+            completed_ids = []
             for candidate in stuck_interviews:
                 # Check last activity
                 if candidate.interview_last_activity:
@@ -1668,14 +1469,16 @@ class InterviewErrorRecovery:
                         # Force complete
                         candidate.interview_completed_at = datetime.now()
                         candidate.interview_ai_analysis_status = 'pending'
-                        
-                        # Trigger scoring with what we have
-                        trigger_auto_scoring(candidate.id)
+                        completed_ids.append(candidate.id)
                         
                         logger.warning(f"Force completed stuck interview for candidate {candidate.id}")
             
             session.commit()
             
+            # Trigger scoring with what we have, once the completions are committed
+            for candidate_id in completed_ids:
+                trigger_auto_scoring(candidate_id)
+            
         except Exception as e:
             logger.error(f"Error recovering interviews: {e}")
         finally:
@@ -1694,11 +1497,11 @@ class InterviewErrorRecovery:
             
             # Fix Q&A pairs
             try:
-                qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+                json.loads(candidate.interview_qa_pairs or '[]')
             except:
-                qa_pairs = []
                 candidate.interview_qa_pairs = '[]'
                 issues_fixed.append('Reset invalid Q&A data')
+            qa_pairs = qa_pairs_for(session, candidate)
             
             # Fix counts
             if candidate.interview_total_questions != len(qa_pairs):
@@ -1735,17 +1538,9 @@ class InterviewErrorRecovery:
             session.close()
 
 def start_health_monitoring():
-    """Start periodic health monitoring"""
-    def monitor():
-        while True:
-            time.sleep(300)  # Check every 5 minutes
-            try:
-                InterviewErrorRecovery.recover_incomplete_interviews()
-            except Exception as e:
-                logger.error(f"Health monitor error: {e}")
-    
-    thread = threading.Thread(target=monitor, daemon=True)
-    thread.start()
+    """Start periodic health monitoring (every 5 minutes on the app scheduler)"""
+    scheduler.register("interview_health_monitor", InterviewErrorRecovery.recover_incomplete_interviews, 300)
+    scheduler.start()
 
 class InterviewCompletionHandler:
     """Handles all interview completion logic with guaranteed database updates"""
@@ -1820,7 +1615,7 @@ class InterviewCompletionHandler:
                     
                     # Trigger AI scoring in background
                     try:
-                        executor.submit(trigger_auto_scoring, candidate.id)
+                        trigger_auto_scoring(candidate.id)
                     except Exception as e:
                         logger.error(f"Failed to trigger scoring: {e}")
                     
@@ -1862,6 +1657,12 @@ class InterviewCompletionHandler:
                         session.commit()
                         
                         if result.rowcount > 0:
+                            # Raw SQL skips the before_flush aggregate hook
+                            try:
+                                from app.services.recruitment_stats import rebuild_recruitment_stats
+                                rebuild_recruitment_stats()
+                            except Exception as stats_error:
+                                logger.error(f"Failed to rebuild recruitment stats: {stats_error}")
                             logger.info(f"Completed via direct SQL for token {token}")
                             return {"success": True, "method": "direct_sql"}
                     except Exception as sql_error:
@@ -1882,32 +1683,23 @@ completion_handler = InterviewCompletionHandler()
 class AutomaticCompletionMonitor:
     """Monitor and automatically complete interviews"""
     
+    job_name = "interview_auto_completion"
+    
     def __init__(self):
         self.is_running = False
         self.check_interval = 30  # seconds
-        self.thread = None
     
     def start(self):
         if self.is_running:
             return
         self.is_running = True
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        scheduler.register(self.job_name, self._check_all_interviews, self.check_interval, first_run=0)
+        scheduler.start()
         logger.info("Automatic completion monitor started")
     
     def stop(self):
         self.is_running = False
-        if self.thread:
-            self.thread.join(timeout=5)
-    
-    def _monitor_loop(self):
-        while self.is_running:
-            try:
-                self._check_all_interviews()
-                time.sleep(self.check_interval)
-            except Exception as e:
-                logger.error(f"Monitor error: {e}")
-                time.sleep(10)
+        scheduler.unregister(self.job_name)
     
     def _check_all_interviews(self):
         """Check all active interviews for completion conditions"""
@@ -1992,18 +1784,9 @@ def process_pending_analyses():
 # Add scheduled task to check every 5 minutes
 
 def start_analysis_monitor():
-    """Start monitoring for pending analyses"""
-
-    def monitor():
-        while True:
-            time.sleep(300)  # Check every 5 minutes
-            try:
-                process_pending_analyses()
-            except Exception as e:
-                logger.error(f"Analysis monitor error: {e}")
-    
-    thread = threading.Thread(target=monitor, daemon=True)
-    thread.start()
+    """Start monitoring for pending analyses (every 5 minutes on the app scheduler)"""
+    scheduler.register("pending_analysis_monitor", process_pending_analyses, 300)
+    scheduler.start()
 
 import atexit
 
@@ -12,13 +12,19 @@ from werkzeug.utils import secure_filename
 from flask_cors import cross_origin 
 from app.extensions import cache 
 from app.extensions import logger
+from app.utils.cache_tags import ALL_JOBS_SCOPE, cached, candidate_scope
 from flask import Blueprint
 from app.routes.interview.helpers import _append_jsonl, _ensure_dir, _ok_preflight, create_error_page, extract_experience_years, extract_projects_from_resume, extract_resume_content, extract_skills_from_resume, generate_kb_recommendations, trigger_auto_scoring
 from app.routes.interview.helpers import create_expired_interview_page
-from app.routes.candidates import get_cached_candidates
-from app.routes.interview.helpers import completion_handler
+from app.routes.candidates import invalidate_candidate_cache
+from app.routes.interview.helpers import check_and_complete_interview, completion_handler
 from app.services.interview_analysis_service_production import interview_analysis_service
 from app.routes.interview.avatar import create_heygen_knowledge_base
+from app.services.interview_events import (
+    append_event, conversation_for, materialize_legacy_columns, qa_counts, qa_pairs_for,
+)
+from app.services.interview_transcript import append_new_entries, materialize_transcript, transcript_for
+from app.services.resume_text import get_resume_document
 
 try:
     from app.extensions import executor
@@ -561,6 +567,7 @@ def update_session_progress():
             candidate.interview_last_activity = datetime.now()
         
         # Handle completion status
+        newly_completed = False
         if status == 'completed' or progress >= 100:
             if hasattr(candidate, 'interview_completed_at'):
                 if not candidate.interview_completed_at:
@@ -578,15 +585,7 @@ def update_session_progress():
                         candidate.interview_ai_analysis_status = 'pending'
                     
                     logger.info(f"Interview marked as completed for candidate {candidate.id}")
-                    # session.commit()
-
-                    try:
-                        if 'trigger_auto_scoring' in globals():
-                            trigger_auto_scoring(candidate.id)
-                        else:
-                            logger.warning("Auto-scoring function not found.")
-                    except Exception as e:
-                        logger.error(f"Error triggering auto-scoring: {e}")
+                    newly_completed = True
         
         elif status == 'in_progress' and hasattr(candidate, 'interview_started_at'):
             if not candidate.interview_started_at:
@@ -597,7 +596,14 @@ def update_session_progress():
         # if session.dirty:
         session.commit()
 
-        cache.delete_memoized(get_cached_candidates)
+        invalidate_candidate_cache()
+
+        # Enqueue after the commit so the scoring task sees the completion
+        if newly_completed:
+            try:
+                trigger_auto_scoring(candidate.id)
+            except Exception as e:
+                logger.error(f"Error triggering auto-scoring: {e}")
 
         return jsonify({
             "success": True,
@@ -666,16 +672,18 @@ def complete_interview_session():
         if hasattr(candidate, 'interview_ai_analysis_status'):
             candidate.interview_ai_analysis_status = 'pending'
         
+        # Write the event-log Q&A and transcript back to the candidate columns
+        materialize_legacy_columns(session, candidate)
+        materialize_transcript(session, candidate)
+        
         session.commit()
         
         logger.info(f"Interview completed for candidate {candidate.id} - {candidate.name}")
         
         # Trigger analysis in background (auto-scoring)
         try:
-            if 'trigger_auto_scoring' in globals():
-                from concurrent.futures import ThreadPoolExecutor
-                executor = ThreadPoolExecutor(max_workers=2)
-                executor.submit(trigger_auto_scoring, candidate.id)
+            # Enqueued on the durable scoring queue
+            trigger_auto_scoring(candidate.id)
         except Exception as e:
             logger.error(f"Failed to trigger analysis: {e}")
         
@@ -800,7 +808,7 @@ def interview_tracking_dashboard():
         session.close()
 
 @interview_core_bp.route('/api/interview-results', methods=['GET'])
-@cache.memoize(timeout=60)
+@cached(timeout=60, tags=lambda: (ALL_JOBS_SCOPE,))
 def get_all_interview_results():
     """Get all interview results with proper filtering and pagination"""
     try:
@@ -969,7 +977,7 @@ def validate_analysis(candidate_id):
             return jsonify({"error": "Candidate not found"}), 404
         
         # Get Q&A data
-        qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+        qa_pairs = qa_pairs_for(session, candidate)
         
         # Check for invalid responses
         has_invalid = False
@@ -1076,7 +1084,7 @@ def get_live_interview_status(candidate_id):
             return jsonify({"error": "Candidate not found"}), 404
         
         # Parse Q&A data
-        qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+        qa_pairs = qa_pairs_for(session, candidate)
         
         # Calculate live stats
         status = {
@@ -1301,7 +1309,7 @@ def get_full_interview_analysis(token):
             return jsonify({"error": "Interview not found"}), 404
         
         # Parse Q&A data
-        qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+        qa_pairs = qa_pairs_for(session, candidate)
         questions_asked = json.loads(candidate.interview_questions_asked or '[]')
         answers_given = json.loads(candidate.interview_answers_given or '[]')
         
@@ -1505,11 +1513,11 @@ def export_conversation_unified(session_id):
         if not candidate:
             return jsonify({"error": "Session not found"}), 404
         
-        conversation = json.loads(getattr(candidate, 'interview_conversation', '[]'))
+        conversation = conversation_for(session, candidate)
         
         # If no conversation data, build from qa_pairs
         if not conversation:
-            qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+            qa_pairs = qa_pairs_for(session, candidate)
             for qa in qa_pairs:
                 if qa.get('question'):
                     conversation.append({
@@ -1646,7 +1654,7 @@ def fix_all_pending_interviews():
             logger.info(f"Triggered analysis for candidate {candidate.id} - {candidate.name}")
         
         # Clear cache
-        cache.delete_memoized(get_cached_candidates)
+        invalidate_candidate_cache()
         
         return jsonify({
             "success": True,
@@ -1705,12 +1713,18 @@ def api_resume_text(candidate_id):
         if not cand:
             return jsonify({"error": "Candidate not found"}), 404
 
-        text = ""
+        document = None
         if cand.resume_path and os.path.exists(cand.resume_path):
-            # uses your existing extractor
-            text = extract_resume_content(cand.resume_path)
+            # shared store: the file is only parsed once per content hash
+            document = get_resume_document(cand.resume_path)
 
-        return jsonify({"resume_text": text, "length": len(text)}), 200
+        text = document.text if document else ""
+        return jsonify({
+            "resume_text": text,
+            "length": len(text),
+            "page_count": document.page_count if document else 0,
+            "extractor": document.extractor if document else None,
+        }), 200
     finally:
         session.close()
 
@@ -1727,7 +1741,8 @@ def export_conversation(candidate_id):
         
         if format_type == 'text':
             # Return plain text conversation
-            conversation = candidate.interview_conversation or "No conversation recorded"
+            conversation = conversation_for(session, candidate)
+            conversation = json.dumps(conversation) if conversation else "No conversation recorded"
             
             response = Response(
                 conversation,
@@ -1740,7 +1755,7 @@ def export_conversation(candidate_id):
             
         elif format_type == 'json':
             # Return structured JSON
-            qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+            qa_pairs = qa_pairs_for(session, candidate)
             
             export_data = {
                 "candidate": {
@@ -1751,7 +1766,7 @@ def export_conversation(candidate_id):
                 },
                 "interview_date": candidate.interview_started_at.isoformat() if candidate.interview_started_at else None,
                 "qa_pairs": qa_pairs,
-                "formatted_conversation": candidate.interview_conversation
+                "formatted_conversation": json.dumps(conversation_for(session, candidate))
             }
             
             return jsonify(export_data), 200
@@ -1774,6 +1789,7 @@ def get_candidate_interview_data(candidate_id):
         # Parse all interview data
         questions = json.loads(candidate.interview_questions_asked or '[]')
         answers = json.loads(candidate.interview_answers_given or '[]')
+        transcript = transcript_for(session, candidate)
         
         return jsonify({
             "candidate": {
@@ -1798,9 +1814,9 @@ def get_candidate_interview_data(candidate_id):
                 "completion_rate": f"{(len(answers) / len(questions) * 100) if questions else 0:.1f}%"
             },
             "transcript": {
-                "content": candidate.interview_transcript,
-                "length": len(candidate.interview_transcript or ''),
-                "lines": len((candidate.interview_transcript or '').strip().split('\n'))
+                "content": transcript,
+                "length": len(transcript),
+                "lines": len(transcript.strip().split('\n'))
             },
             "recording": {
                 "status": candidate.interview_recording_status,
@@ -2259,7 +2275,7 @@ def end_interview_session():
             session.commit()
             
             # Clear caches
-            cache.delete_memoized(get_cached_candidates)
+            invalidate_candidate_cache()
             
             logger.info(f"Interview session ended: {session_id}")
             
@@ -2278,7 +2294,7 @@ def end_interview_session():
         return jsonify({"error": str(e)}), 500
     
 @interview_core_bp.route('/api/interview/analysis/<int:candidate_id>', methods=['GET'])
-@cache.memoize(timeout=30)
+@cached(timeout=30, tags=lambda candidate_id: (candidate_scope(candidate_id),))
 def get_interview_analysis_production(candidate_id):
     """Get analysis results with caching"""
     session = SessionLocal()
@@ -2407,7 +2423,7 @@ def force_create_kb(candidate_id):
         session.commit()
         
         # Clear cache
-        cache.delete_memoized(get_cached_candidates)
+        invalidate_candidate_cache()
         
         return jsonify({
             "success": True,
@@ -2531,7 +2547,7 @@ def complete_interview_by_token(token):
         
         if result["success"]:
             # Clear cache to update frontend
-            cache.delete_memoized(get_cached_candidates)
+            invalidate_candidate_cache()
             
             return jsonify({
                 "success": True,
@@ -2712,8 +2728,12 @@ def fix_null_completions():
         rows_updated = result.rowcount
         session.commit()
         
-        # Clear all caches
-        cache.clear()
+        # Raw SQL skips the ORM hooks, so invalidate every candidate-derived entry
+        # and recompute the monthly aggregates
+        invalidate_candidate_cache()
+        if rows_updated:
+            from app.services.recruitment_stats import rebuild_recruitment_stats
+            rebuild_recruitment_stats()
         
         return jsonify({
             "success": True,
@@ -2793,7 +2813,7 @@ def check_interview_completion(token):
             return jsonify({"error": "Interview not found"}), 404
         
         # Get Q&A data
-        qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+        qa_pairs = qa_pairs_for(session, candidate)
         questions = json.loads(candidate.interview_questions_asked or '[]')
         answers = json.loads(candidate.interview_answers_given or '[]')
         
@@ -2841,7 +2861,7 @@ def fix_interview_by_token(token):
             return jsonify({"error": "Candidate not found"}), 404
         
         # Force complete if it has Q&A data but not marked complete
-        qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+        qa_pairs = qa_pairs_for(session, candidate)
         
         if qa_pairs and not candidate.interview_completed_at:
             candidate.interview_completed_at = datetime.now()
@@ -2961,7 +2981,7 @@ def validate_interview_completion(token):
             return jsonify({"error": "Interview not found"}), 404
         
         # Force completion check
-        qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+        qa_pairs = qa_pairs_for(session, candidate)
         questions = json.loads(candidate.interview_questions_asked or '[]')
         answers = json.loads(candidate.interview_answers_given or '[]')
         
@@ -3047,6 +3067,7 @@ def cleanup_incomplete_interviews():
     """Fix interviews that show as completed in UI but not in database"""
     session = SessionLocal()
     fixed_count = 0
+    fixed_ids = []
     
     try:
         # Find candidates with started interviews but no completion
@@ -3058,7 +3079,7 @@ def cleanup_incomplete_interviews():
         
         for candidate in incomplete:
             # Check if interview is actually complete based on other indicators
-            qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+            qa_pairs = qa_pairs_for(session, candidate)
             
             # If they have Q&A data or have been inactive for over 2 hours
             if qa_pairs or (candidate.interview_started_at and 
@@ -3074,14 +3095,16 @@ def cleanup_incomplete_interviews():
                 
                 candidate.interview_ai_analysis_status = 'pending'
                 fixed_count += 1
-                
-                # Trigger scoring
-                trigger_auto_scoring(candidate.id)
+                fixed_ids.append(candidate.id)
                 
                 logger.info(f"Fixed incomplete interview for {candidate.name} (ID: {candidate.id})")
         
         session.commit()
         
+        # Trigger scoring once the completions are committed
+        for candidate_id in fixed_ids:
+            trigger_auto_scoring(candidate_id)
+        
         return jsonify({
             "success": True,
             "fixed_count": fixed_count,
@@ -3118,7 +3141,7 @@ def debug_interview_status():
         }
         
         for candidate in all_interviews:
-            qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+            qa_pairs = qa_pairs_for(session, candidate)
             
             status = "unknown"
             if candidate.interview_completed_at and candidate.interview_ai_score:
@@ -3170,7 +3193,7 @@ def fix_incomplete_interviews():
         
         for candidate in candidates:
             # Check if they have Q&A data
-            qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+            qa_pairs = qa_pairs_for(session, candidate)
             questions_asked = json.loads(candidate.interview_questions_asked or '[]')
             answers_given = json.loads(candidate.interview_answers_given or '[]')
             
@@ -3199,7 +3222,7 @@ def fix_incomplete_interviews():
                 logger.info(f"Fixed and triggered analysis for {candidate.name} (ID: {candidate.id})")
         
         # Clear cache
-        cache.delete_memoized(get_cached_candidates)
+        invalidate_candidate_cache()
         
         return jsonify({
             "success": True,
@@ -3291,7 +3314,7 @@ def check_analysis_status(candidate_id):
                 "weaknesses": json.loads(candidate.interview_ai_weaknesses or '[]')
             },
             "qa_data": {
-                "qa_pairs": len(json.loads(candidate.interview_qa_pairs or '[]')),
+                "qa_pairs": len(qa_pairs_for(session, candidate)),
                 "questions_asked": len(json.loads(candidate.interview_questions_asked or '[]')),
                 "answers_given": len(json.loads(candidate.interview_answers_given or '[]'))
             }
@@ -3447,23 +3470,27 @@ def track_complete_utterance():
             if not candidate:
                 return jsonify({"error": "Session not found"}), 404
             
-            # Find the current unanswered question
-            qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
-            
-            for qa in reversed(qa_pairs):
-                if qa.get('question') and not qa.get('answer'):
-                    # Found unanswered question - add answer
-                    qa['answer'] = utterance.get('text', '')
-                    qa['answer_confidence'] = utterance.get('confidence', 0)
-                    qa['answer_timestamp'] = utterance.get('timestamp')
-                    qa['answer_duration_ms'] = utterance.get('duration')
-                    break
-            
-            # Update database
-            candidate.interview_qa_pairs = json.dumps(qa_pairs)
+            # Log the answer as an event; the qa_pairs view gives it the latest
+            # unanswered question, as /api/interview/qa/track answers are
+            text = (utterance.get('text') or '').strip()
+            if text:
+                timestamp = utterance.get('timestamp')
+                append_event(
+                    session, session_id, 'answer', text,
+                    candidate_id=candidate.id,
+                    speaker='candidate',
+                    timestamp=str(timestamp) if timestamp else None,
+                    source='voice_transcription',
+                    metadata={
+                        'confidence': utterance.get('confidence', 0),
+                        'duration_ms': utterance.get('duration'),
+                    },
+                )
+                append_new_entries(session, candidate)
             
-            # Update answer count
-            answered = sum(1 for qa in qa_pairs if qa.get('answer'))
+            # Update answer count from the event log
+            total, answered = qa_counts(session, candidate)
+            candidate.interview_total_questions = total
             candidate.interview_answered_questions = answered
             
             # Update progress
@@ -3476,8 +3503,8 @@ def track_complete_utterance():
             # Check for auto-completion
             if answered >= 10 or (candidate.interview_total_questions > 0 and 
                                   answered >= candidate.interview_total_questions):
-                # Trigger completion
-                executor.submit(check_and_complete_interview, candidate.id)
+                # Trigger completion (durable task; the answer is already committed)
+                check_and_complete_interview.delay(candidate.id)
             
             return jsonify({
                 "success": True,
@@ -3507,7 +3534,7 @@ def migrate_qa_data():
             changes = []
             
             # Parse existing data
-            qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+            qa_pairs = qa_pairs_for(session, candidate)
             questions = json.loads(candidate.interview_questions_asked or '[]')
             answers = json.loads(candidate.interview_answers_given or '[]')
             
@@ -3574,11 +3601,9 @@ def migrate_qa_data():
                     'changes': changes
                 })
         
+        # The commit bumps the cache tags of the migrated candidates
         session.commit()
         
-        # Clear cache
-        cache.clear()
-        
         return jsonify({
             'success': True,
             'migrated_count': len(migrated),
@@ -3668,6 +3693,7 @@ class InterviewErrorRecovery:
                 Candidate.interview_completed_at.is_(None)
             ).all()
             
+            completed_ids = []
             for candidate in stuck_interviews:
                 # Check last activity
                 if candidate.interview_last_activity:
@@ -3676,14 +3702,16 @@ class InterviewErrorRecovery:
                         # Force complete
                         candidate.interview_completed_at = datetime.now()
                         candidate.interview_ai_analysis_status = 'pending'
-                        
-                        # Trigger scoring with what we have
-                        trigger_auto_scoring(candidate.id)
+                        completed_ids.append(candidate.id)
                         
                         logger.warning(f"Force completed stuck interview for candidate {candidate.id}")
             
             session.commit()
             
+            # Trigger scoring with what we have, once the completions are committed
+            for candidate_id in completed_ids:
+                trigger_auto_scoring(candidate_id)
+            
         except Exception as e:
             logger.error(f"Error recovering interviews: {e}")
         finally:
@@ -3702,11 +3730,11 @@ class InterviewErrorRecovery:
             
             # Fix Q&A pairs
             try:
-                qa_pairs = json.loads(candidate.interview_qa_pairs or '[]')
+                json.loads(candidate.interview_qa_pairs or '[]')
             except:
-                qa_pairs = []
                 candidate.interview_qa_pairs = '[]'
                 issues_fixed.append('Reset invalid Q&A data')
+            qa_pairs = qa_pairs_for(session, candidate)
             
             # Fix counts
             if candidate.interview_total_questions != len(qa_pairs):
@@ -1,5 +1,4 @@
 
-from functools import cache
 from flask import Blueprint, jsonify, request, Response
 from datetime import datetime, timezone, timedelta
 import os, json, time, uuid, requests
@@ -12,7 +11,7 @@ from app.routes.interview.helpers import extract_resume_content
 from app.routes.interview.automation import generate_interview_questions
 from app.routes.interview.helpers import create_structured_interview_kb
 from app.routes.interview.helpers import generate_custom_interview_prompt
-from app.routes.candidates import get_cached_candidates
+from app.routes.candidates import invalidate_candidate_cache
 try:
     from app.extensions import executor
 except Exception:
@@ -440,7 +439,7 @@ def fix_missing_knowledge_bases():
         session.commit()
         
         # Clear cache
-        cache.delete_memoized(get_cached_candidates)
+        invalidate_candidate_cache()
         
         return jsonify({
             "success": True,
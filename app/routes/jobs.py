@@ -1,53 +1,81 @@
 
 from flask import Blueprint, jsonify, request
-from sqlalchemy import func
-import os, requests
-from app.extensions import cache, logger
+from sqlalchemy import func, case, and_
+import os
+from app.extensions import logger
 from app.models.db import Candidate, SessionLocal
 from app.routes.shared import rate_limit
+from app.services.recruitment_stats import PASSING_EXAM_PERCENTAGE
+from app.services.job_catalog import job_catalog
+from app.utils.cache_tags import JOBS_TAG, cached
+from app.utils.response_versions import conditional_get, ALL_JOBS_SCOPE
 
 jobs_bp = Blueprint("jobs", __name__)
 
-@cache.memoize(timeout=300)
+EMPTY_JOB_COUNTS = {"applications": 0, "assessed": 0, "passed": 0, "interviewed": 0}
+
+
+def get_job_candidate_counts(session, job_ids=None):
+    """Applicant counts with status breakdowns for many jobs in one grouped query.
+
+    Returns {job_id: {"applications", "assessed", "passed", "interviewed"}}; jobs
+    without candidates are absent. `job_ids=None` counts every job.
+    """
+    def _count_if(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    query = session.query(
+        Candidate.job_id,
+        func.count(Candidate.id),
+        _count_if(Candidate.exam_completed == True),
+        _count_if(and_(Candidate.exam_completed == True,
+                       Candidate.exam_percentage >= PASSING_EXAM_PERCENTAGE)),
+        _count_if(Candidate.interview_completed_at.isnot(None)),
+    )
+    if job_ids is not None:
+        job_ids = [str(j) for j in job_ids]
+        if not job_ids:
+            return {}
+        query = query.filter(Candidate.job_id.in_(job_ids))
+    rows = query.group_by(Candidate.job_id).all()
+    return {
+        str(job_id): {
+            "applications": total,
+            "assessed": int(assessed),
+            "passed": int(passed),
+            "interviewed": int(interviewed),
+        }
+        for job_id, total, assessed, passed, interviewed in rows
+    }
+
+
+@cached(timeout=300, tags=lambda: (ALL_JOBS_SCOPE, JOBS_TAG))
 def get_cached_jobs():
-    """Cached job fetching"""
+    """Cached job fetching (BambooHR openings served stale-while-revalidate)"""
     try:
-        API_KEY = os.getenv("BAMBOOHR_API_KEY")
-        SUBDOMAIN = os.getenv("BAMBOOHR_SUBDOMAIN")
-        
-        if not API_KEY or not SUBDOMAIN:
-            raise ValueError("BambooHR credentials not configured")
-            
-        auth = (API_KEY, "x")
-        headers = {"Accept": "application/json", "Content-Type": "application/json"}
-        url = f"https://api.bamboohr.com/api/gateway.php/{SUBDOMAIN}/v1/applicant_tracking/jobs/"
-        
-        resp = requests.get(url, auth=auth, headers=headers, timeout=10)
-        resp.raise_for_status()
-        
-        jobs = resp.json()
-        open_jobs = []
+        # Returns the last known snapshot immediately; refreshes happen in the background
+        jobs = job_catalog.get_open_jobs()
         
         session = SessionLocal()
         try:
-            for job in jobs:
-                if job.get("status", {}).get("label", "").lower() == "open":
-                    # Get candidate count for this job
-                    candidate_count = session.query(Candidate).filter_by(job_id=str(job["id"])).count()
-                    
-                    open_jobs.append({
-                        "id": job["id"],
-                        "title": job.get("title", {}).get("label", ""),
-                        "location": job.get("location", {}).get("label", ""),
-                        "department": job.get("department", {}).get("label", ""),
-                        "postingUrl": job.get("postingUrl", ""),
-                        "applications": candidate_count,
-                        "status": "Active",
-                        "description": job.get("description", "")
-                    })
+            # Candidate counts for all open jobs in a single grouped query
+            counts = get_job_candidate_counts(session, [job["id"] for job in jobs])
         finally:
             session.close()
         
+        open_jobs = []
+        for job in jobs:
+            open_jobs.append({
+                "id": job["id"],
+                "title": job.get("title", ""),
+                "location": job.get("location", ""),
+                "department": job.get("department", ""),
+                "postingUrl": job.get("postingUrl", ""),
+                **counts.get(str(job["id"]), EMPTY_JOB_COUNTS),
+                "status": "Active",
+                "description": job.get("description", "")
+            })
+        
         return open_jobs
         
     except Exception as e:
@@ -70,6 +98,7 @@ def get_jobs_from_database():
             Candidate.job_id, 
             Candidate.job_title
         ).all()
+        counts = get_job_candidate_counts(session)
         
         jobs = []
         for job_id, job_title, app_count in jobs_data:
@@ -78,6 +107,7 @@ def get_jobs_from_database():
                 'title': job_title,
                 'department': 'Engineering',
                 'location': 'Remote',
+                **counts.get(str(job_id), EMPTY_JOB_COUNTS),
                 'applications': app_count,
                 'status': 'Active',
                 'description': f'Job description for {job_title}',
@@ -90,6 +120,7 @@ def get_jobs_from_database():
 
 @jobs_bp.route('/api/jobs', methods=['GET', 'OPTIONS'])
 @rate_limit(max_calls=30, time_window=60)
+@conditional_get(lambda: (ALL_JOBS_SCOPE, JOBS_TAG))
 def api_jobs():
     """Enhanced API endpoint to get jobs with caching"""
     if request.method == 'OPTIONS':
@@ -4,15 +4,15 @@ import threading
 from flask import Blueprint, logging, request, jsonify
 import time, asyncio
 import logging
-from app.extensions import cache, logger, executor
+from app.extensions import cache, logger
 from app.routes.shared import update_pipeline_status, get_pipeline_status, rate_limit
 from app.services.clint_recruitment_system import run_recruitment_with_invite_link
 from app.services.scraper import scrape_job
 from app.services.testlify_scraper import create_programming_assessment
 from concurrent.futures import ThreadPoolExecutor
-from app.routes.candidates import get_cached_candidates
-from app.routes.jobs import get_cached_jobs
+from app.routes.candidates import invalidate_candidate_cache
 from app.services.criteria_automation import runpipeline as create_criteria_assessment_pipeline
+from app.services.task_queue import task
 
 
 pipeline_bp = Blueprint("pipeline", __name__)
@@ -21,24 +21,40 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 pipeline_status = {}
 pipeline_lock = threading.Lock()
+# Pipelines run as queued tasks in any worker process, so their status lives in
+# the shared cache; the local dict only lists the pipelines this process touched
+PIPELINE_STATUS_TIMEOUT = 24 * 3600
+
+def _pipeline_status_key(job_id):
+    return f"pipeline_status:{job_id}"
 
 def update_pipeline_status(job_id, status, message, progress=None):
-    """Thread-safe pipeline status updates"""
+    """Thread-safe pipeline status updates, shared across workers"""
+    entry = {
+        'status': status,
+        'message': message,
+        'progress': progress,
+        'timestamp': datetime.now().isoformat(),
+        'job_id': str(job_id)
+    }
     with pipeline_lock:
-        pipeline_status[str(job_id)] = {
-            'status': status,
-            'message': message,
-            'progress': progress,
-            'timestamp': datetime.now().isoformat(),
-            'job_id': str(job_id)
-        }
+        pipeline_status[str(job_id)] = entry
+    try:
+        cache.set(_pipeline_status_key(job_id), entry, timeout=PIPELINE_STATUS_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Could not share pipeline status for {job_id}: {e}")
     logger.info(f"Pipeline {job_id}: {status} - {message}")
 
 def get_pipeline_status(job_id=None):
     """Get pipeline status (thread-safe)"""
+    if job_id:
+        try:
+            shared = cache.get(_pipeline_status_key(job_id))
+        except Exception:
+            shared = None
+        with pipeline_lock:
+            return shared or pipeline_status.get(str(job_id))
     with pipeline_lock:
-        if job_id:
-            return pipeline_status.get(str(job_id))
         # return dict(pipeline_status)
         return pipeline_status.copy()
 
@@ -107,9 +123,8 @@ def api_run_full_pipeline():
         # Update status
         update_pipeline_status(job_id, 'starting', f'Initializing pipeline for {job_title}', 0)
         
-        # Start pipeline with assessment flag and provider
-        future = executor.submit(
-            run_pipeline_with_monitoring, 
+        # Start pipeline with assessment flag and provider (durable task queue)
+        task_id = run_pipeline_with_monitoring.delay(
             job_id, 
             job_title, 
             job_desc, 
@@ -117,13 +132,11 @@ def api_run_full_pipeline():
             assessment_provider  # NEW: Pass provider to pipeline
         )
         
-        with pipeline_lock:
-            pipeline_status[str(job_id)]['future'] = future
-        
         return jsonify({
             "success": True, 
             "message": f"Pipeline started for {job_title}",
             "job_id": job_id,
+            "task_id": task_id,
             "create_assessment": create_assessment,
             "assessment_provider": assessment_provider,  # Include provider in response
             "estimated_time": "5-10 minutes"
@@ -133,6 +146,7 @@ def api_run_full_pipeline():
         logger.error(f"Error in run_full_pipeline: {e}", exc_info=True)
         return jsonify({"success": False, "message": str(e)}), 500
 
+@task(queue="pipeline", max_attempts=1, visibility_timeout=3600)
 def run_pipeline_with_monitoring(job_id, job_title, job_desc, create_assessment=False, assessment_provider='testlify'):
     """Enhanced pipeline runner with assessment provider support"""
     start_time = time.time()
@@ -141,9 +155,8 @@ def run_pipeline_with_monitoring(job_id, job_title, job_desc, create_assessment=
         logger.info(f"Starting pipeline for job_id={job_id}, create_assessment={create_assessment}, provider={assessment_provider}")
         update_pipeline_status(job_id, 'running', 'Pipeline started', 10)
         
-        # Clear caches
-        cache.delete_memoized(get_cached_candidates)
-        cache.delete_memoized(get_cached_jobs)
+        # Invalidate this job's cached listings (the job counts carry the all-jobs tag)
+        invalidate_candidate_cache(job_id)
         
         # Run modified pipeline with provider
         full_recruitment_pipeline(job_id, job_title, job_desc, create_assessment, assessment_provider)
@@ -365,9 +378,8 @@ def full_recruitment_pipeline(job_id, job_title, job_desc, create_assessment=Fal
             logger.error(f"AI screening failed: {str(e)}", exc_info=True)
             raise
         
-        # Clear caches
-        cache.delete_memoized(get_cached_candidates)
-        cache.delete_memoized(get_cached_jobs)
+        # Invalidate this job's cached listings (the job counts carry the all-jobs tag)
+        invalidate_candidate_cache(job_id)
         
         # Final status update
         assessment_info = ""
@@ -277,11 +277,7 @@
 #from datetime import datetime
 from datetime import datetime
 import os
-import sys
-import json
-import subprocess
 from flask import Blueprint, request, jsonify
-import threading
 import time
 import asyncio
 import traceback
@@ -289,6 +285,7 @@ from app.routes.shared import rate_limit
 from app.extensions import logger
 from app.utils.email_util import send_email
 from app.models.db import SessionLocal, Candidate, AssessmentResult
+from app.services.task_queue import task, task_queue
 
 scraping_bp = Blueprint("scraping", __name__)
 
@@ -333,17 +330,13 @@ def api_scrape_assessment_results():
         
         logger.info(f"[SCRAPER] Starting results scraping for assessment: {assessment_name} (source={source})")
         
-        # Start scraping in a separate thread
-        scraping_thread = threading.Thread(
-            target=lambda: run_scraping_with_monitoring(assessment_name, source),
-            daemon=True,
-            name=f"scraping_{source}_{assessment_name.replace(' ', '_')}_{int(time.time())}"
-        )
-        scraping_thread.start()
+        # Queue the scrape on the durable scraping queue
+        task_id = run_scraping_with_monitoring.delay(assessment_name, source)
         
         return jsonify({
             "success": True,
             "message": f"Started scraping ({source}) for '{assessment_name}'",
+            "task_id": task_id,
             "estimated_time": "2-10 minutes"
         }), 200
         
@@ -361,16 +354,12 @@ def api_scrape_all_pending_results():
     try:
         logger.info("[SCRAPER] Starting bulk results scraping for all pending assessments")
         
-        scraping_thread = threading.Thread(
-            target=lambda: run_bulk_scraping_with_monitoring(),
-            daemon=True,
-            name=f"bulk_scraping_{int(time.time())}"
-        )
-        scraping_thread.start()
+        task_id = run_bulk_scraping_with_monitoring.delay()
         
         return jsonify({
             "success": True,
             "message": "Started bulk scraping for all pending assessments",
+            "task_id": task_id,
             "estimated_time": "5-15 minutes"
         }), 200
         
@@ -385,20 +374,12 @@ def api_scraping_status():
         return '', 200
         
     try:
-        active_threads = []
-        for thread in threading.enumerate():
-            if thread.name.startswith(('scraping_', 'bulk_scraping_')):
-                thread_info = {
-                    "name": thread.name,
-                    "is_alive": thread.is_alive(),
-                    "daemon": thread.daemon
-                }
-                active_threads.append(thread_info)
+        operations = task_queue.list_tasks("scraping", statuses=("queued", "running"))
         
         return jsonify({
             "success": True,
-            "active_operations": len(active_threads),
-            "operations": active_threads
+            "active_operations": len(operations),
+            "operations": operations
         }), 200
         
     except Exception as e:
@@ -504,6 +485,7 @@ def determine_recommendation(score):
     else:
         return "not_recommend"
 
+@task(queue="scraping", max_attempts=1, visibility_timeout=1800)
 def run_scraping_with_monitoring(assessment_name: str, source: str):
     """Wrapper to run scraping with monitoring and error handling"""
     start_time = time.time()
@@ -547,23 +529,14 @@ def run_testlify_scraper(assessment_name: str):
     try:
         # Import the scraper module
         try:
-            from testlify_results_scraper import scrape_assessment_results_by_name
+            from app.services.testlify_results_scraper import scrape_assessment_results_by_name
         except ImportError as e:
             logger.error(f"[TESTLIFY] Failed to import scraper: {e}")
             raise Exception("Testlify scraper module not found")
         
         logger.info(f"[TESTLIFY] Starting scraper for: {assessment_name}")
         
-        # Create new event loop for async operation
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            results = loop.run_until_complete(
-                scrape_assessment_results_by_name(assessment_name)
-            )
-        finally:
-            loop.close()
+        results = asyncio.run(scrape_assessment_results_by_name(assessment_name))
         
         logger.info(f"[TESTLIFY] Completed. Results found: {len(results) if results else 0}")
         return results
@@ -578,43 +551,9 @@ def run_criteria_scraper(assessment_name: str):
     try:
         logger.info(f"[CRITERIA] Starting scraper for: {assessment_name}")
         
-        # Get the script path (assuming it's in the same directory or project root)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        script_path = os.path.join(script_dir, "Criteria_score.py")
-        
-        # Check if script exists
-        if not os.path.exists(script_path):
-            # Try parent directory
-            script_path = os.path.join(os.path.dirname(script_dir), "Criteria_score.py")
-            
-        if not os.path.exists(script_path):
-            raise FileNotFoundError(f"Criteria_score.py not found. Searched in {script_dir}")
-        
-        # Run the Criteria scraper script
-        process = subprocess.Popen(
-            [sys.executable, script_path, assessment_name],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        stdout, stderr = process.communicate()
-        
-        # Log any errors from the script
-        if stderr:
-            logger.warning(f"[CRITERIA] Script stderr output:\n{stderr}")
-        
-        # Check return code
-        if process.returncode != 0:
-            raise Exception(f"Criteria script failed with return code {process.returncode}")
-        
-        # Parse JSON output
-        try:
-            results = json.loads(stdout)
-        except json.JSONDecodeError as e:
-            logger.error(f"[CRITERIA] Failed to parse JSON output: {e}")
-            logger.error(f"[CRITERIA] Raw output: {stdout}")
-            raise Exception("Invalid JSON output from Criteria scraper")
+        # Scrape in-process on the shared Criteria browser (rows carry a numeric "score")
+        from app.services.criteria_scores import fetch_job_scores
+        results = fetch_job_scores(assessment_name)
         
         logger.info(f"[CRITERIA] Found {len(results)} results")
         
@@ -720,6 +659,7 @@ def run_criteria_scraper(assessment_name: str):
     finally:
         session.close()
 
+@task(queue="scraping", max_attempts=1, visibility_timeout=3600)
 def run_bulk_scraping_with_monitoring():
     """Wrapper to run bulk scraping with monitoring"""
     start_time = time.time()
@@ -729,7 +669,7 @@ def run_bulk_scraping_with_monitoring():
         
         # Import the bulk scraping function
         try:
-            from testlify_results_scraper import scrape_all_pending_assessments
+            from app.services.testlify_results_scraper import scrape_all_pending_assessments
         except ImportError as e:
             logger.error(f"Failed to import scraper: {e}")
             notify_admin(
@@ -738,14 +678,7 @@ def run_bulk_scraping_with_monitoring():
             )
             return
         
-        # Create new event loop for async operation
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            results_summary = loop.run_until_complete(scrape_all_pending_assessments())
-        finally:
-            loop.close()
+        results_summary = asyncio.run(scrape_all_pending_assessments())
         
         duration = time.time() - start_time
         total_candidates = sum(results_summary.values()) if isinstance(results_summary, dict) else 0
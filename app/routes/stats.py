@@ -1,77 +1,42 @@
 from flask import Blueprint, jsonify, request
-from sqlalchemy import func, and_
 from datetime import datetime, timedelta
-from app.extensions import cache, logger
-from app.models.db import Candidate, SessionLocal
+from app.extensions import logger
 from app.routes.shared import rate_limit
+from app.services.recruitment_stats import get_monthly_stats, month_key, METRICS
+from app.utils.cache_tags import STATS_SCOPE, cached
+from app.utils.response_versions import conditional_get
 
 stats_bp = Blueprint("stats", __name__)
 
+
+@cached(timeout=300, tags=lambda months: (STATS_SCOPE,))
+def get_cached_monthly_stats(months):
+    """Monthly aggregates for a tuple of 'YYYY-MM' keys, invalidated by the stats tag"""
+    return get_monthly_stats(months)
+
+
 @stats_bp.route('/api/recruitment-stats', methods=['GET','OPTIONS'])
 @rate_limit(max_calls=20, time_window=60)
-@cache.memoize(timeout=600)  # 10 minute cache
+@conditional_get(lambda: (STATS_SCOPE,))
 def api_recruitment_stats():
-    """Cached recruitment statistics"""
+    """Recruitment statistics for the last 6 months (read from recruitment_stats_monthly)"""
     if request.method == 'OPTIONS':
         return '', 200
     
-    session = SessionLocal()
     try:
-        stats = []
         current_date = datetime.now()
         
-        # Get last 6 months of data efficiently
-        for i in range(6):
-            try:
-                month_date = current_date - timedelta(days=30*i)
-                month_name = month_date.strftime('%b')
-                
-                # Calculate month boundaries
-                month_start = month_date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                if month_start.month == 12:
-                    month_end = month_start.replace(year=month_start.year + 1, month=1, day=1) - timedelta(seconds=1)
-                else:
-                    month_end = month_start.replace(month=month_start.month + 1, day=1) - timedelta(seconds=1)
-                
-                # Single query for all stats
-                applications = session.query(func.count(Candidate.id)).filter(
-                    and_(
-                        Candidate.processed_date >= month_start,
-                        Candidate.processed_date <= month_end
-                    )
-                ).scalar() or 0
-                
-                interviews = session.query(func.count(Candidate.id)).filter(
-                    and_(
-                        Candidate.interview_scheduled == True,
-                        Candidate.interview_date >= month_start,
-                        Candidate.interview_date <= month_end
-                    )
-                ).scalar() or 0
-                
-                hires = session.query(func.count(Candidate.id)).filter(
-                    and_(
-                        Candidate.final_status == "Hired",
-                        Candidate.processed_date >= month_start,
-                        Candidate.processed_date <= month_end
-                    )
-                ).scalar() or 0
-                
-                stats.append({
-                    "month": month_name,
-                    "applications": applications,
-                    "interviews": interviews,
-                    "hires": hires
-                })
-                
-            except Exception as e:
-                logger.error(f"Error calculating stats for month {i}: {e}")
-                stats.append({
-                    "month": (current_date - timedelta(days=30*i)).strftime('%b'),
-                    "applications": 0,
-                    "interviews": 0,
-                    "hires": 0
-                })
+        # Same month buckets as before: today, today-30d, ... today-150d
+        month_dates = [current_date - timedelta(days=30*i) for i in range(6)]
+        monthly = get_cached_monthly_stats(tuple(month_key(d) for d in month_dates))
+        
+        stats = []
+        for month_date in month_dates:
+            row = monthly.get(month_key(month_date), {})
+            stats.append({
+                "month": month_date.strftime('%b'),
+                **{metric: row.get(metric, 0) for metric in METRICS}
+            })
         
         # Reverse to get chronological order
         stats.reverse()
@@ -82,5 +47,3 @@ def api_recruitment_stats():
     except Exception as e:
         logger.error(f"Error in api_recruitment_stats: {e}", exc_info=True)
         return jsonify({"error": "Failed to get statistics", "message": str(e)}), 500
-    finally:
-        session.close()
@@ -6,6 +6,7 @@ FIXED: Properly extracts ALL jobs from custom dropdown (not just "Manager" jobs)
 import argparse
 import json
 import csv
+import os
 import time
 from datetime import datetime
 from pathlib import Path
@@ -17,13 +18,19 @@ import re
 DEFAULT_BASE = "https://hireselect.criteriacorp.com"
 OUT_DIR = Path("criteria_scores")
 OUT_DIR.mkdir(parents=True, exist_ok=True)
+# Step screenshots are off by default (CRITERIA_SCREENSHOTS=1 or --screenshots); error screenshots are always taken
+SCREENSHOTS = os.getenv("CRITERIA_SCREENSHOTS", "0") == "1"
+# Candidate detail pages loaded at once in --detailed mode
+DETAIL_CONCURRENCY = int(os.getenv("CRITERIA_DETAIL_CONCURRENCY", "4") or 4)
 
 def ts() -> str:
     """Generate timestamp"""
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
-def save_screenshot(page: Page, tag: str):
+def save_screenshot(page: Page, tag: str, force: bool = False):
     """Save screenshot"""
+    if not (SCREENSHOTS or force):
+        return
     try:
         path = OUT_DIR / f"{tag}_{ts()}.png"
         page.screenshot(path=str(path), full_page=True)
@@ -370,7 +377,7 @@ def get_available_jobs(page: Page) -> List[Dict]:
         print(f"❌ Error getting jobs: {e}")
         import traceback
         traceback.print_exc()
-        save_screenshot(page, "error_jobs")
+        save_screenshot(page, "error_jobs", force=True)
         return []
 
 # ═══════════════════════ SELECT JOB ═══════════════════════
@@ -436,6 +443,51 @@ def select_job(page: Page, job_title: str, job_info: Dict = None) -> bool:
         return False
 
 # ═══════════════════════ EXTRACT SCORES ═══════════════════════
+# Headers plus every row's cell texts and first link, read in one round trip
+TABLE_JS = """
+() => {
+    const headers = [...document.querySelectorAll('table thead th')]
+        .map(th => th.innerText.trim()).filter(Boolean);
+    const rows = [...document.querySelectorAll('table tbody tr')].map(tr => {
+        const cells = [...tr.querySelectorAll('td')];
+        const link = cells.length ? cells[0].querySelector('a') : null;
+        return {
+            cells: cells.map(td => td.innerText.trim()),
+            link_text: link ? link.innerText.trim() : null,
+            link_href: link && link.href && !link.href.startsWith('javascript') ? link.href : null,
+        };
+    });
+    return {headers, rows};
+}
+"""
+
+# Talent Signal on a candidate detail page: first standalone 0-100 number, else the labelled value
+TALENT_SIGNAL_JS = """
+() => {
+    const numbers = [];
+    for (const el of document.querySelectorAll('body *')) {
+        if (el.children.length) continue;
+        const text = (el.innerText || '').trim();
+        if (/^\\d{2,3}$/.test(text)) numbers.push(parseInt(text, 10));
+        if (numbers.length >= 3) break;
+    }
+    const standalone = numbers.find(n => n >= 0 && n <= 100);
+    if (standalone !== undefined) return String(standalone);
+    const match = document.body.innerText.match(/Talent Signal[:\\s]+(\\d{1,3})/i);
+    return match ? match[1] : '';
+}
+"""
+
+# Candidate detail page rendered: its Talent Signal label is on screen
+DETAIL_READY_JS = "() => /Talent Signal/i.test(document.body.innerText)"
+
+def _wait_for_detail(page: Page, list_url: Optional[str] = None, timeout: int = 15000):
+    """Wait until the candidate detail view is rendered. After a click, first wait for the
+    client-side route change away from `list_url` (networkidle returns before it)."""
+    if list_url:
+        page.wait_for_url(lambda url: url != list_url, timeout=timeout)
+    page.wait_for_function(DETAIL_READY_JS, timeout=timeout)
+
 def extract_candidate_scores(page: Page, job_title: str) -> List[Dict]:
     """Extract all candidate scores"""
     print(f"\n📊 Extracting candidate scores for: {job_title}")
@@ -443,79 +495,64 @@ def extract_candidate_scores(page: Page, job_title: str) -> List[Dict]:
     candidates = []
     
     try:
-        page.wait_for_timeout(3000)
+        try:
+            page.wait_for_selector("table tbody tr", timeout=10000)
+        except Exception:
+            pass
         save_screenshot(page, "06_candidates_table")
         
-        rows = page.locator("table tbody tr").all()
+        table = page.evaluate(TABLE_JS)
+        rows = table["rows"]
+        headers = table["headers"]
         
         if not rows:
             print("❌ No table rows found")
             return []
         
         print(f"📋 Found {len(rows)} candidate rows")
-        
-        headers = []
-        header_elements = page.locator("table thead th").all()
-        for h in header_elements:
-            header_text = h.inner_text().strip()
-            if header_text:
-                headers.append(header_text)
-        
         print(f"📊 Columns: {len(headers)} columns")
         
         for idx, row in enumerate(rows, 1):
-            try:
-                cells = row.locator("td").all()
-                
-                if len(cells) == 0:
-                    continue
-                
-                candidate = {
-                    "id": idx,
-                    "job_title": job_title,
-                    "name": "",
-                    "email": "",
-                    "status": "",
-                    "overall_score": "",
-                    "scores": {}
-                }
-                
-                for cell_idx, cell in enumerate(cells):
-                    try:
-                        cell_text = cell.inner_text().strip()
-                        
-                        if cell_idx == 0:
-                            link = cell.locator("a").first
-                            if link.count() > 0:
-                                candidate["name"] = link.inner_text().strip()
-                            else:
-                                candidate["name"] = cell_text.split('\n')[0].strip()
-                            
-                            if '@' in cell_text:
-                                lines = cell_text.split('\n')
-                                for line in lines:
-                                    if '@' in line:
-                                        candidate["email"] = line.strip()
-                                        break
-                            
-                            if 'incoming' in cell_text.lower():
-                                candidate["status"] = "Incoming"
-                            elif 'completed' in cell_text.lower():
-                                candidate["status"] = "Completed"
-                        
-                        elif cell_idx < len(headers):
-                            header = headers[cell_idx]
-                            candidate["scores"][header] = cell_text
-                    
-                    except:
-                        continue
-                
-                if candidate["name"]:
-                    candidates.append(candidate)
-                    print(f"  ✓ {idx}. {candidate['name']}")
-            
-            except Exception as e:
+            cells = row["cells"]
+            if len(cells) == 0:
                 continue
+            
+            candidate = {
+                "id": idx,
+                "job_title": job_title,
+                "name": "",
+                "email": "",
+                "status": "",
+                "overall_score": "",
+                "scores": {}
+            }
+            
+            first_cell = cells[0]
+            candidate["name"] = row["link_text"] if row["link_text"] is not None else first_cell.split('\n')[0].strip()
+            if row["link_href"]:
+                candidate["detail_url"] = row["link_href"]
+            
+            for line in first_cell.split('\n'):
+                if '@' in line:
+                    candidate["email"] = line.strip()
+                    break
+            
+            if 'incoming' in first_cell.lower():
+                candidate["status"] = "Incoming"
+            elif 'completed' in first_cell.lower():
+                candidate["status"] = "Completed"
+            
+            for cell_idx, cell_text in enumerate(cells[1:len(headers)], 1):
+                header = headers[cell_idx]
+                candidate["scores"][header] = cell_text
+                # Talent Signal shown in the table: no detail page visit needed
+                if "talent signal" in header.lower() and re.fullmatch(r"\d{1,3}", cell_text):
+                    candidate["talent_signal"] = cell_text
+                    candidate["overall_score"] = cell_text
+            
+            if candidate["name"]:
+                candidates.append(candidate)
+                print(f"  ✓ {idx}. {candidate['name']}")
         
         print(f"\n✅ Extracted {len(candidates)} candidates")
         return candidates
@@ -525,58 +562,67 @@ def extract_candidate_scores(page: Page, job_title: str) -> List[Dict]:
         return []
 
 # ═══════════════════════ GET DETAILED SCORES ═══════════════════════
-def get_detailed_scores(page: Page, candidates: List[Dict]) -> List[Dict]:
-    """Get detailed Talent Signal scores"""
+def get_detailed_scores(page: Page, candidates: List[Dict], concurrency: Optional[int] = None) -> List[Dict]:
+    """Get detailed Talent Signal scores for candidates whose table row did not show one"""
     print("\n🔍 Getting detailed Talent Signal scores...")
     
-    for idx, candidate in enumerate(candidates, 1):
+    missing = [c for c in candidates if not c.get("talent_signal")]
+    by_url = [c for c in missing if c.get("detail_url")]
+    by_click = [c for c in missing if not c.get("detail_url")]
+    print(f"  {len(candidates) - len(missing)} from table, {len(by_url)} via detail pages, {len(by_click)} via clicks")
+    
+    # Detail pages with a URL load side by side in extra tabs of the same context
+    concurrency = max(1, concurrency or DETAIL_CONCURRENCY)
+    for start in range(0, len(by_url), concurrency):
+        batch = by_url[start:start + concurrency]
+        tabs = []
+        for candidate in batch:
+            tab = page.context.new_page()
+            tabs.append(tab)
+            try:
+                tab.goto(candidate["detail_url"], wait_until="commit")
+            except Exception as e:
+                print(f"  ⚠️ {candidate['name']}: {e}")
+        for tab, candidate in zip(tabs, batch):
+            try:
+                _wait_for_detail(tab)
+            except Exception:
+                pass
+            try:
+                _set_talent_signal(candidate, tab.evaluate(TALENT_SIGNAL_JS))
+                save_screenshot(tab, f"07_detail_{candidate['id']}")
+            except Exception as e:
+                print(f"  ⚠️ {candidate['name']}: {e}")
+            finally:
+                tab.close()
+    
+    # Rows without a link URL: click through on the main page
+    for candidate in by_click:
         try:
-            print(f"  [{idx}/{len(candidates)}] {candidate['name']}...", end=" ")
-            
             candidate_link = page.locator(f"a:has-text('{candidate['name']}')").first
             
             if candidate_link.count() > 0 and candidate_link.is_visible():
+                list_url = page.url
                 candidate_link.click()
-                page.wait_for_timeout(2000)
-                save_screenshot(page, f"07_detail_{idx}")
-                
-                talent_signal = ""
-                
-                large_nums = page.locator("text=/^\\d{2,3}$/").all()
-                for num in large_nums[:3]:
-                    try:
-                        text = num.inner_text().strip()
-                        if text.isdigit() and 0 <= int(text) <= 100:
-                            talent_signal = text
-                            break
-                    except:
-                        continue
-                
-                if not talent_signal:
-                    try:
-                        page_text = page.inner_text("body")
-                        match = re.search(r'Talent Signal[:\s]+(\d{1,3})', page_text, re.IGNORECASE)
-                        if match:
-                            talent_signal = match.group(1)
-                    except:
-                        pass
-                
-                candidate["talent_signal"] = talent_signal
-                candidate["overall_score"] = talent_signal
-                
-                print(f"✓ Talent Signal: {talent_signal}")
-                
+                _wait_for_detail(page, list_url)
+                save_screenshot(page, f"07_detail_{candidate['id']}")
+                _set_talent_signal(candidate, page.evaluate(TALENT_SIGNAL_JS))
                 page.go_back()
-                page.wait_for_timeout(1500)
+                page.wait_for_selector("table tbody tr", timeout=10000)
             else:
-                print("⚠️ Could not click")
+                print(f"  ⚠️ {candidate['name']}: could not click")
         
         except Exception as e:
-            print(f"⚠️ Error: {e}")
+            print(f"  ⚠️ {candidate['name']}: {e}")
             continue
     
     return candidates
 
+def _set_talent_signal(candidate: Dict, talent_signal: str):
+    candidate["talent_signal"] = talent_signal
+    candidate["overall_score"] = talent_signal
+    print(f"  ✓ {candidate['name']}: Talent Signal {talent_signal}")
+
 # ═══════════════════════ EXPORT ═══════════════════════
 def export_to_json(candidates: List[Dict], job_title: str) -> str:
     """Export to JSON"""
@@ -640,8 +686,12 @@ def main():
     parser.add_argument("--all-jobs", action="store_true", help="Scrape all jobs")
     parser.add_argument("--detailed", action="store_true", help="Get Talent Signal scores")
     parser.add_argument("--format", choices=["json", "csv", "both"], default="both")
+    parser.add_argument("--screenshots", action="store_true", help="Save a screenshot after each step")
     
     args = parser.parse_args()
+    if args.screenshots:
+        global SCREENSHOTS
+        SCREENSHOTS = True
     
     print("\n" + "═" * 70)
     print("   CRITERIA CORP - SCORE SCRAPER V4")
@@ -651,116 +701,147 @@ def main():
     print(f"Detailed: {'Yes' if args.detailed else 'No'}")
     print("═" * 70)
     
+    try:
+        # Shared long-lived browser + persistent Criteria profile when running inside the app
+        from app.services.browser_pool import BrowserLoginError, sync_browser_pool
+        from app.services.criteria_automation import CRITERIA_VENDOR, _launch_persistent_browser
+    except ImportError:
+        sync_browser_pool = None  # executed as a standalone script
+
+    if sync_browser_pool is not None:
+        try:
+            sync_browser_pool.run(CRITERIA_VENDOR.name, _scrape_session, args)
+            print("\n👋 Done!")
+            return
+        except BrowserLoginError:
+            # The pooled login never waits; on the command line a person can log in,
+            # so reopen the same profile visibly and wait for the manual login
+            print("🔁 Saved session expired, opening a visible browser to log in...")
+            sync_browser_pool.invalidate(CRITERIA_VENDOR.name)  # release the profile directory
+        p, context, page = _launch_persistent_browser(headless=False)
+        try:
+            _scrape_session(page, args)
+        finally:
+            context.close()
+            p.stop()
+            print("\n👋 Done!")
+        return
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False, slow_mo=300)
         context = browser.new_context(viewport={"width": 1600, "height": 900})
         page = context.new_page()
-        
         try:
-            if not wait_for_manual_login(page):
-                raise Exception("Login failed")
-            
-            if not navigate_to_results(page):
-                raise Exception("Could not navigate to Results")
-            
-            jobs = get_available_jobs(page)
-            
-            if not jobs:
-                print("\n❌ No jobs found")
-                print("\n⏳ Browser will stay open for 2 minutes for inspection...")
-                page.wait_for_timeout(120000)
+            _scrape_session(page, args)
+        finally:
+            browser.close()
+            print("\n👋 Done!")
+
+
+def _scrape_session(page: Page, args):
+    """Login check, job selection and export on an open page."""
+    try:
+        if not wait_for_manual_login(page):
+            raise Exception("Login failed")
+        
+        if not navigate_to_results(page):
+            raise Exception("Could not navigate to Results")
+        
+        jobs = get_available_jobs(page)
+        
+        if not jobs:
+            print("\n❌ No jobs found")
+            print("\n⏳ Browser will stay open for 2 minutes for inspection...")
+            page.wait_for_timeout(120000)
+            return
+        
+        jobs_to_scrape = []
+        
+        if args.all_jobs:
+            jobs_to_scrape = jobs
+        elif args.job:
+            for job in jobs:
+                if args.job.lower() in job["title"].lower():
+                    jobs_to_scrape.append(job)
+                    break
+            if not jobs_to_scrape:
+                print(f"\n❌ Job not found: {args.job}")
+                print("\n📋 Available jobs:")
+                for job in jobs:
+                    print(f"  - {job['title']}")
+                page.wait_for_timeout(30000)
                 return
+        else:
+            print("\n📋 Available Jobs:")
+            for job in jobs:
+                print(f"  {job['index']}. {job['title']} ({job['candidate_count']} candidates)")
             
-            jobs_to_scrape = []
+            choice = input("\nEnter job number (or 'all'): ").strip()
             
-            if args.all_jobs:
+            if choice.lower() == 'all':
                 jobs_to_scrape = jobs
-            elif args.job:
-                for job in jobs:
-                    if args.job.lower() in job["title"].lower():
-                        jobs_to_scrape.append(job)
-                        break
-                if not jobs_to_scrape:
-                    print(f"\n❌ Job not found: {args.job}")
-                    print("\n📋 Available jobs:")
-                    for job in jobs:
-                        print(f"  - {job['title']}")
-                    page.wait_for_timeout(30000)
-                    return
             else:
-                print("\n📋 Available Jobs:")
-                for job in jobs:
-                    print(f"  {job['index']}. {job['title']} ({job['candidate_count']} candidates)")
-                
-                choice = input("\nEnter job number (or 'all'): ").strip()
-                
-                if choice.lower() == 'all':
-                    jobs_to_scrape = jobs
-                else:
-                    try:
-                        idx = int(choice)
-                        found = [j for j in jobs if j["index"] == idx]
-                        if found:
-                            jobs_to_scrape.append(found[0])
-                    except:
-                        print("Invalid choice")
-                        return
+                try:
+                    idx = int(choice)
+                    found = [j for j in jobs if j["index"] == idx]
+                    if found:
+                        jobs_to_scrape.append(found[0])
+                except:
+                    print("Invalid choice")
+                    return
+        
+        for job in jobs_to_scrape:
+            job_title = job["title"]
+            print(f"\n{'═' * 70}")
+            print(f"SCRAPING: {job_title}")
+            print(f"{'═' * 70}")
             
-            for job in jobs_to_scrape:
-                job_title = job["title"]
-                print(f"\n{'═' * 70}")
-                print(f"SCRAPING: {job_title}")
-                print(f"{'═' * 70}")
-                
-                if not select_job(page, job_title, job):
-                    print(f"❌ Could not select: {job_title}")
-                    continue
-                
-                candidates = extract_candidate_scores(page, job_title)
-                
-                if not candidates:
-                    print(f"⚠️ No candidates found")
-                    continue
-                
-                if args.detailed:
-                    candidates = get_detailed_scores(page, candidates)
-                
-                if args.format in ["json", "both"]:
-                    export_to_json(candidates, job_title)
-                
-                if args.format in ["csv", "both"]:
-                    export_to_csv(candidates, job_title)
-                
-                print(f"\n📊 Statistics:")
-                print(f"   Total: {len(candidates)}")
-                
-                if args.detailed:
-                    scores = [int(c.get("talent_signal", 0) or 0) for c in candidates if c.get("talent_signal")]
-                    if scores:
-                        print(f"   Average: {sum(scores)/len(scores):.1f}")
-                        print(f"   Highest: {max(scores)}")
-                        print(f"   Lowest: {min(scores)}")
+            if not select_job(page, job_title, job):
+                print(f"❌ Could not select: {job_title}")
+                continue
             
-            print("\n" + "═" * 70)
-            print("   COMPLETE!")
-            print("═" * 70)
-            print(f"📁 Files saved in: {OUT_DIR}")
+            candidates = extract_candidate_scores(page, job_title)
             
-            print("\n⏳ Browser stays open for 10 seconds...")
-            page.wait_for_timeout(10000)
+            if not candidates:
+                print(f"⚠️ No candidates found")
+                continue
             
-        except KeyboardInterrupt:
-            print("\n\n⚠️ Interrupted")
-        except Exception as e:
-            print(f"\n❌ Error: {e}")
-            import traceback
-            traceback.print_exc()
-            save_screenshot(page, "error_final")
-            print("\n⏳ Browser open for 60 seconds for debugging...")
-            page.wait_for_timeout(60000)
-        finally:
-            browser.close()
-            print("\n👋 Done!")
+            if args.detailed:
+                candidates = get_detailed_scores(page, candidates)
+            
+            if args.format in ["json", "both"]:
+                export_to_json(candidates, job_title)
+            
+            if args.format in ["csv", "both"]:
+                export_to_csv(candidates, job_title)
+            
+            print(f"\n📊 Statistics:")
+            print(f"   Total: {len(candidates)}")
+            
+            if args.detailed:
+                scores = [int(c.get("talent_signal", 0) or 0) for c in candidates if c.get("talent_signal")]
+                if scores:
+                    print(f"   Average: {sum(scores)/len(scores):.1f}")
+                    print(f"   Highest: {max(scores)}")
+                    print(f"   Lowest: {min(scores)}")
+        
+        print("\n" + "═" * 70)
+        print("   COMPLETE!")
+        print("═" * 70)
+        print(f"📁 Files saved in: {OUT_DIR}")
+        
+        print("\n⏳ Browser stays open for 10 seconds...")
+        page.wait_for_timeout(10000)
+        
+    except KeyboardInterrupt:
+        print("\n\n⚠️ Interrupted")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        save_screenshot(page, "error_final", force=True)
+        print("\n⏳ Browser open for 60 seconds for debugging...")
+        page.wait_for_timeout(60000)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
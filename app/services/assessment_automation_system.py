@@ -9,19 +9,15 @@ Works WITH your existing automation.py to complete the full pipeline:
 import os
 import time
 import logging
-import threading
 import asyncio
-import json
-import subprocess
-import sys
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import Dict, List, Optional, Any
 import requests
 from sqlalchemy import and_, or_, func
 
 # Import your existing database models
 from app.models.db import Candidate, AssessmentResult, SessionLocal, EmailLog
+from app.services.scheduler import scheduler
 
 # Configure logging
 logging.basicConfig(
@@ -37,10 +33,11 @@ class AssessmentAutomationSystem:
     Fetches results from Testlify/Criteria and triggers your existing interview scheduling
     """
     
+    job_name = "assessment_automation"
+    
     def __init__(self):
         self.is_running = False
         self.check_interval = 600  # Check every 10 minutes
-        self.thread = None
         self.pass_threshold = float(os.getenv('ASSESSMENT_MIN_SCORE', '75'))
         
         # API endpoint for your existing automation.py
@@ -64,40 +61,38 @@ class AssessmentAutomationSystem:
             return
         
         self.is_running = True
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
+        # One cycle per interval across all workers; a slow cycle is never overlapped
+        scheduler.register(self.job_name, self._run_cycle, self.check_interval,
+                           first_run=0, lease_seconds=3 * self.check_interval)
+        scheduler.start()
         logger.info("✅ Assessment Automation System started")
     
     def stop(self) -> None:
         """Stop the assessment automation"""
         self.is_running = False
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=5)
+        scheduler.unregister(self.job_name)
         logger.info("🛑 Assessment automation stopped")
     
-    def _run_loop(self) -> None:
-        """Main automation loop"""
-        while self.is_running:
-            try:
-                logger.info("=" * 70)
-                logger.info("🔄 ASSESSMENT AUTOMATION CYCLE STARTING...")
-                logger.info("=" * 70)
-                
-                self._process_all_assessments()
-                
-                logger.info("=" * 70)
-                logger.info("✅ ASSESSMENT CYCLE COMPLETE")
-                logger.info(f"   Next check in {self.check_interval} seconds...")
-                logger.info("=" * 70)
-                
-            except Exception as e:
-                logger.error(f"❌ Error in automation loop: {e}", exc_info=True)
-                self.stats['errors'].append({
-                    'time': datetime.now().isoformat(),
-                    'error': str(e)
-                })
+    def _run_cycle(self) -> None:
+        """One automation cycle (scheduled every check_interval)"""
+        try:
+            logger.info("=" * 70)
+            logger.info("🔄 ASSESSMENT AUTOMATION CYCLE STARTING...")
+            logger.info("=" * 70)
+            
+            self._process_all_assessments()
             
-            time.sleep(self.check_interval)
+            logger.info("=" * 70)
+            logger.info("✅ ASSESSMENT CYCLE COMPLETE")
+            logger.info(f"   Next check in {self.check_interval} seconds...")
+            logger.info("=" * 70)
+            
+        except Exception as e:
+            self.stats['errors'].append({
+                'time': datetime.now().isoformat(),
+                'error': str(e)
+            })
+            raise  # the scheduler logs it and counts the failure
     
     def _process_all_assessments(self) -> None:
         """Process all pending assessments"""
@@ -161,11 +156,19 @@ class AssessmentAutomationSystem:
             
             processed = 0
             
+            # Scrape all assessments concurrently (parallel tabs of one Testlify context)
+            results_by_assessment = self._run_testlify_scraper(assessment_names)
+            
+            # Look up every scraped email in one query
+            emails = {r.get('email') for results in results_by_assessment.values() for r in results if r.get('email')}
+            candidates_by_email = {}
+            if emails:
+                for row in session.query(Candidate).filter(Candidate.email.in_(emails)).order_by(Candidate.id):
+                    candidates_by_email.setdefault(row.email, row)
+            
             for assessment_name in assessment_names:
                 logger.info(f"   🔍 Checking: {assessment_name}")
-                
-                # Run your existing Testlify scraper
-                results = self._run_testlify_scraper(assessment_name)
+                results = results_by_assessment.get(assessment_name)
                 
                 if results:
                     logger.info(f"      Found {len(results)} results")
@@ -175,7 +178,7 @@ class AssessmentAutomationSystem:
                         if not email:
                             continue
                         
-                        candidate = session.query(Candidate).filter_by(email=email).first()
+                        candidate = candidates_by_email.get(email)
                         if not candidate or candidate.exam_completed:
                             continue
                         
@@ -211,25 +214,16 @@ class AssessmentAutomationSystem:
             logger.error(f"Error processing Testlify: {e}")
             return 0
     
-    def _run_testlify_scraper(self, assessment_name: str) -> List[Dict]:
-        """Run your existing Testlify scraper"""
+    def _run_testlify_scraper(self, assessment_names: List[str]) -> Dict[str, List[Dict]]:
+        """Run your existing Testlify scraper for all assessments in one event loop"""
         try:
-            from testlify_results_scraper import scrape_assessment_results_by_name
-            
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            from app.services.testlify_results_scraper import scrape_assessments_by_name
             
-            try:
-                results = loop.run_until_complete(
-                    scrape_assessment_results_by_name(assessment_name)
-                )
-                return results
-            finally:
-                loop.close()
+            return asyncio.run(scrape_assessments_by_name(assessment_names))
                 
         except Exception as e:
             logger.error(f"Failed to run Testlify scraper: {e}")
-            return []
+            return {}
     
     # ===================== CRITERIA PROCESSING =====================
     
@@ -310,33 +304,11 @@ class AssessmentAutomationSystem:
             return 0
     
     def _run_criteria_scraper(self, job_title: str) -> List[Dict]:
-        """Run your existing Criteria scraper"""
+        """Run your existing Criteria scraper in-process on the shared Criteria browser"""
         try:
-            process = subprocess.Popen(
-                [sys.executable, "Criteria_score.py", "--job", job_title, "--format", "json"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = process.communicate(timeout=300)
-            
-            if process.returncode != 0:
-                logger.error(f"Criteria scraper failed: {stderr}")
-                return []
-            
-            # Find output file
-            output_dir = Path("criteria_scores")
-            json_files = list(output_dir.glob(f"*{job_title.replace(' ', '_')}*.json"))
-            
-            if not json_files:
-                return []
-            
-            latest_file = max(json_files, key=lambda p: p.stat().st_mtime)
+            from app.services.criteria_scores import fetch_job_scores
             
-            with open(latest_file, 'r') as f:
-                data = json.load(f)
-                return data.get('candidates', [])
+            return fetch_job_scores(job_title, export=True)
                 
         except Exception as e:
             logger.error(f"Failed to run Criteria scraper: {e}")
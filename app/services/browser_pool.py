@@ -0,0 +1,513 @@
+# app/services/browser_pool.py
+"""
+Long-lived Playwright browsers shared by the scrapers.
+- One Chromium per process (per API flavour) instead of one launch per scrape.
+- One authenticated context per vendor (bamboohr, testlify, criteria, ...):
+  the vendor's login runs when the context is created, not on every run.
+  Vendors with a `user_data_dir` get a persistent context (saved sessions).
+- Pages are leased to callers, health-checked before reuse, and recycled after
+  `max_page_uses` leases; contexts are rebuilt after `max_context_uses`.
+
+Playwright objects are bound to the thread (sync API) or event loop (async API)
+that created them, so callers hand their work to the pool instead of holding a
+page across threads:
+
+    links = await async_browser_pool.arun("testlify", scrape_links, name)   # async fn(page, *args)
+    result = sync_browser_pool.run("criteria", run_automation, title)       # sync fn(page, *args)
+
+Configuration (environment):
+    BROWSER_HEADLESS            1 (default) / 0 for a visible browser
+    BROWSER_MAX_PAGE_USES       leases before a page is replaced (default 25)
+    BROWSER_MAX_CONTEXT_USES    leases before a context is rebuilt (default 200)
+    BROWSER_PAGES_PER_VENDOR    concurrent pages per vendor (default 2)
+
+Smoke check (headless, e.g. against a local HTML fixture):
+    python -m app.services.browser_pool --url file:///path/to/fixture.html
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_TIMEOUT_MS = 5000
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return int(os.getenv(key, "") or default)
+    except ValueError:
+        return default
+
+
+class BrowserLoginError(RuntimeError):
+    """Raised when a vendor's login callback reports failure."""
+
+
+@dataclass
+class VendorProfile:
+    name: str
+    # login(page) -> bool; async for the async pool, sync for the sync pool
+    login: Optional[Callable[..., Any]] = None
+    user_data_dir: Optional[str] = None
+    context_options: Dict[str, Any] = field(default_factory=dict)
+    launch_args: List[str] = field(default_factory=list)
+    headless: Optional[bool] = None
+    max_pages: Optional[int] = None
+
+
+class _VendorSlot:
+    """Per-vendor context, idle pages and use counters."""
+
+    def __init__(self, profile: VendorProfile, max_pages: int):
+        self.profile = profile
+        self.context = None
+        self.context_uses = 0
+        self.idle: List[Any] = []
+        self.page_uses: Dict[int, int] = {}
+        self.leased = 0
+        self.max_pages = profile.max_pages or max_pages
+
+
+class _PoolBase:
+    def __init__(self, headless: Optional[bool] = None, max_page_uses: Optional[int] = None,
+                 max_context_uses: Optional[int] = None, pages_per_vendor: Optional[int] = None):
+        self.headless = headless if headless is not None else os.getenv("BROWSER_HEADLESS", "1") != "0"
+        self.max_page_uses = max_page_uses or _env_int("BROWSER_MAX_PAGE_USES", 25)
+        self.max_context_uses = max_context_uses or _env_int("BROWSER_MAX_CONTEXT_USES", 200)
+        self.pages_per_vendor = pages_per_vendor or _env_int("BROWSER_PAGES_PER_VENDOR", 2)
+        self.profiles: Dict[str, VendorProfile] = {}
+        self._slots: Dict[str, _VendorSlot] = {}
+        self._playwright = None
+        self._browser = None
+
+    def register(self, profile: VendorProfile, replace: bool = False) -> None:
+        """Declare a vendor. Modules sharing a vendor register it once; the first wins."""
+        if profile.name in self.profiles and not replace:
+            return
+        self.profiles[profile.name] = profile
+
+    def _profile(self, vendor: str) -> VendorProfile:
+        return self.profiles.get(vendor) or self.profiles.setdefault(vendor, VendorProfile(vendor))
+
+    def _headless(self, profile: VendorProfile) -> bool:
+        return self.headless if profile.headless is None else profile.headless
+
+    def _persistent_dir(self, profile: VendorProfile) -> str:
+        Path(profile.user_data_dir).mkdir(parents=True, exist_ok=True)
+        return profile.user_data_dir
+
+    def _should_recycle_context(self, slot: _VendorSlot) -> bool:
+        return slot.context is not None and slot.context_uses >= self.max_context_uses and slot.leased == 0
+
+
+class AsyncBrowserPool(_PoolBase):
+    """Browser pool for async Playwright code; runs on its own event-loop thread."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    # ---- public API ----
+    def submit(self, vendor: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Schedule `await fn(page, *args, **kwargs)` on the pool loop."""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._run(vendor, fn, *args, **kwargs), loop)
+
+    def run(self, vendor: str, fn: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs):
+        """Blocking variant of `arun` for synchronous callers."""
+        return self.submit(vendor, fn, *args, **kwargs).result(timeout)
+
+    async def arun(self, vendor: str, fn: Callable[..., Any], *args, **kwargs):
+        """Await `fn(page, *args, **kwargs)` from any event loop."""
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if current is not None and current is self._loop:
+            return await self._run(vendor, fn, *args, **kwargs)
+        return await asyncio.wrap_future(self.submit(vendor, fn, *args, **kwargs))
+
+    def invalidate(self, vendor: str) -> None:
+        """Drop the vendor's context (e.g. after a logout) so the next lease logs in again."""
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._close_slot(vendor), self._loop).result()
+
+    def close(self) -> None:
+        if self._loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=30)
+        except Exception as e:
+            logger.warning(f"Async browser pool shutdown failed: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+    # ---- internals ----
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="browser-pool-async", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    async def _run(self, vendor: str, fn, *args, **kwargs):
+        profile = self._profile(vendor)
+        semaphore = self._semaphores.get(vendor)
+        if semaphore is None:
+            semaphore = self._semaphores[vendor] = asyncio.Semaphore(profile.max_pages or self.pages_per_vendor)
+        async with semaphore:
+            slot, page = await self._lease(vendor)
+            healthy = False
+            try:
+                result = await fn(page, *args, **kwargs)
+                healthy = True
+                return result
+            finally:
+                await self._release(slot, page, healthy)
+
+    def _lock(self, vendor: str) -> asyncio.Lock:
+        lock = self._locks.get(vendor)
+        if lock is None:
+            lock = self._locks[vendor] = asyncio.Lock()
+        return lock
+
+    async def _lease(self, vendor: str):
+        async with self._lock(vendor):
+            slot = self._slots.get(vendor)
+            if slot is None:
+                slot = self._slots[vendor] = _VendorSlot(self._profile(vendor), self.pages_per_vendor)
+            if self._should_recycle_context(slot):
+                await self._close_context(slot)
+
+            while slot.idle:
+                page = slot.idle.pop()
+                if await self._healthy(page):
+                    break
+                await self._close_page(slot, page)
+            else:
+                page = await self._new_page(slot)
+            slot.leased += 1
+            slot.context_uses += 1
+            slot.page_uses[id(page)] = slot.page_uses.get(id(page), 0) + 1
+            return slot, page
+
+    async def _release(self, slot: _VendorSlot, page, healthy: bool) -> None:
+        slot.leased -= 1
+        if healthy and not page.is_closed() and slot.page_uses.get(id(page), 0) < self.max_page_uses:
+            slot.idle.append(page)
+        else:
+            # A failed call may leave dialogs/navigation half done; start fresh next time
+            await self._close_page(slot, page)
+
+    async def _healthy(self, page) -> bool:
+        if page.is_closed():
+            return False
+        try:
+            await asyncio.wait_for(page.evaluate("1"), HEALTH_CHECK_TIMEOUT_MS / 1000)
+            return True
+        except Exception:
+            return False
+
+    async def _new_page(self, slot: _VendorSlot):
+        if slot.context is not None:
+            try:
+                return await slot.context.new_page()
+            except Exception as e:
+                logger.warning(f"[{slot.profile.name}] context unusable, rebuilding: {e}")
+                await self._close_context(slot)
+        await self._open_context(slot)
+        # Persistent contexts start with a blank page; reuse it
+        pages = [p for p in slot.context.pages if not p.is_closed()]
+        return pages[0] if pages else await slot.context.new_page()
+
+    async def _open_context(self, slot: _VendorSlot) -> None:
+        profile = slot.profile
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        launch = {"headless": self._headless(profile), "args": list(profile.launch_args)}
+        if profile.user_data_dir:
+            slot.context = await self._playwright.chromium.launch_persistent_context(
+                self._persistent_dir(profile), **launch, **profile.context_options
+            )
+        else:
+            if self._browser is None or not self._browser.is_connected():
+                self._browser = await self._playwright.chromium.launch(**launch)
+            slot.context = await self._browser.new_context(**profile.context_options)
+        slot.context_uses = 0
+        logger.info(f"[{profile.name}] browser context opened")
+
+        if profile.login:
+            pages = [p for p in slot.context.pages if not p.is_closed()]
+            try:
+                page = pages[0] if pages else await slot.context.new_page()
+                logged_in = await profile.login(page)
+            except Exception as e:
+                await self._close_context(slot)
+                raise BrowserLoginError(f"Login failed for {profile.name}: {e}") from e
+            if not logged_in:
+                await self._close_context(slot)
+                raise BrowserLoginError(f"Login failed for {profile.name}")
+            logger.info(f"[{profile.name}] logged in")
+
+    async def _close_page(self, slot: _VendorSlot, page) -> None:
+        slot.page_uses.pop(id(page), None)
+        try:
+            if not page.is_closed():
+                await page.close()
+        except Exception:
+            pass
+
+    async def _close_context(self, slot: _VendorSlot) -> None:
+        context, slot.context = slot.context, None
+        slot.idle.clear()
+        slot.page_uses.clear()
+        if context is not None:
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+    async def _close_slot(self, vendor: str) -> None:
+        slot = self._slots.get(vendor)
+        if slot is not None:
+            async with self._lock(vendor):
+                await self._close_context(slot)
+
+    async def _shutdown(self) -> None:
+        for slot in list(self._slots.values()):
+            await self._close_context(slot)
+        self._slots.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+class SyncBrowserPool(_PoolBase):
+    """Browser pool for sync Playwright code; all work runs on one dedicated thread."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    # ---- public API ----
+    def submit(self, vendor: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        future: Future = Future()
+        if self._thread is not None and threading.current_thread() is self._thread:
+            # Nested call from pool work: run inline to avoid deadlocking the worker
+            future.set_result(self._run(vendor, fn, args, kwargs))
+            return future
+        self._ensure_thread()
+        self._jobs.put((vendor, fn, args, kwargs, future))
+        return future
+
+    def run(self, vendor: str, fn: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs):
+        """Run `fn(page, *args, **kwargs)` on the browser thread and return its result."""
+        return self.submit(vendor, fn, *args, **kwargs).result(timeout)
+
+    def invalidate(self, vendor: str) -> None:
+        self.submit(vendor, None).result()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            done: Future = Future()
+            self._jobs.put((None, None, (), {}, done))
+            done.result(timeout=30)
+            self._thread = None
+
+    # ---- internals ----
+    def _ensure_thread(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="browser-pool-sync", daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            vendor, fn, args, kwargs, future = self._jobs.get()
+            if vendor is None:
+                self._shutdown()
+                future.set_result(None)
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if fn is None:
+                    slot = self._slots.get(vendor)
+                    if slot is not None:
+                        self._close_context(slot)
+                    future.set_result(None)
+                else:
+                    future.set_result(self._run(vendor, fn, args, kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _run(self, vendor: str, fn, args, kwargs):
+        slot = self._slots.get(vendor)
+        if slot is None:
+            slot = self._slots[vendor] = _VendorSlot(self._profile(vendor), self.pages_per_vendor)
+        if self._should_recycle_context(slot):
+            self._close_context(slot)
+
+        page = None
+        while slot.idle:
+            candidate = slot.idle.pop()
+            if self._healthy(candidate):
+                page = candidate
+                break
+            self._close_page(slot, candidate)
+        if page is None:
+            page = self._new_page(slot)
+        slot.leased += 1
+        slot.context_uses += 1
+        slot.page_uses[id(page)] = slot.page_uses.get(id(page), 0) + 1
+
+        healthy = False
+        try:
+            result = fn(page, *args, **kwargs)
+            healthy = True
+            return result
+        finally:
+            slot.leased -= 1
+            if healthy and not page.is_closed() and slot.page_uses.get(id(page), 0) < self.max_page_uses:
+                slot.idle.append(page)
+            else:
+                self._close_page(slot, page)
+
+    def _healthy(self, page) -> bool:
+        if page.is_closed():
+            return False
+        try:
+            page.evaluate("1")
+            return True
+        except Exception:
+            return False
+
+    def _new_page(self, slot: _VendorSlot):
+        if slot.context is not None:
+            try:
+                return slot.context.new_page()
+            except Exception as e:
+                logger.warning(f"[{slot.profile.name}] context unusable, rebuilding: {e}")
+                self._close_context(slot)
+        self._open_context(slot)
+        pages = [p for p in slot.context.pages if not p.is_closed()]
+        return pages[0] if pages else slot.context.new_page()
+
+    def _open_context(self, slot: _VendorSlot) -> None:
+        profile = slot.profile
+        if self._playwright is None:
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+        launch = {"headless": self._headless(profile), "args": list(profile.launch_args)}
+        if profile.user_data_dir:
+            slot.context = self._playwright.chromium.launch_persistent_context(
+                self._persistent_dir(profile), **launch, **profile.context_options
+            )
+        else:
+            if self._browser is None or not self._browser.is_connected():
+                self._browser = self._playwright.chromium.launch(**launch)
+            slot.context = self._browser.new_context(**profile.context_options)
+        slot.context_uses = 0
+        logger.info(f"[{profile.name}] browser context opened")
+
+        if profile.login:
+            pages = [p for p in slot.context.pages if not p.is_closed()]
+            try:
+                page = pages[0] if pages else slot.context.new_page()
+                logged_in = profile.login(page)
+            except Exception as e:
+                self._close_context(slot)
+                raise BrowserLoginError(f"Login failed for {profile.name}: {e}") from e
+            if not logged_in:
+                self._close_context(slot)
+                raise BrowserLoginError(f"Login failed for {profile.name}")
+            logger.info(f"[{profile.name}] logged in")
+
+    def _close_page(self, slot: _VendorSlot, page) -> None:
+        slot.page_uses.pop(id(page), None)
+        try:
+            if not page.is_closed():
+                page.close()
+        except Exception:
+            pass
+
+    def _close_context(self, slot: _VendorSlot) -> None:
+        context, slot.context = slot.context, None
+        slot.idle.clear()
+        slot.page_uses.clear()
+        if context is not None:
+            try:
+                context.close()
+            except Exception:
+                pass
+
+    def _shutdown(self) -> None:
+        for slot in list(self._slots.values()):
+            self._close_context(slot)
+        self._slots.clear()
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+
+# Process-wide pools used by the scrapers
+async_browser_pool = AsyncBrowserPool()
+sync_browser_pool = SyncBrowserPool()
+
+
+@atexit.register
+def _close_pools() -> None:
+    for pool in (async_browser_pool, sync_browser_pool):
+        try:
+            pool.close()
+        except Exception:
+            pass
+
+
+__all__ = [
+    "VendorProfile", "BrowserLoginError", "AsyncBrowserPool", "SyncBrowserPool",
+    "async_browser_pool", "sync_browser_pool",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Browser pool smoke check")
+    parser.add_argument("--url", required=True, help="page to open, e.g. file:///tmp/fixture.html")
+    parser.add_argument("--leases", type=int, default=3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    async def _title(page, url):
+        await page.goto(url)
+        return await page.title()
+
+    for i in range(args.leases):
+        print(f"async lease {i + 1}: {async_browser_pool.run('fixture', _title, args.url)}")
+    for i in range(args.leases):
+        print(f"sync lease {i + 1}: {sync_browser_pool.run('fixture', lambda page: (page.goto(args.url), page.title())[1])}")
@@ -2,21 +2,20 @@ import os
 import re
 import json
 # import openai
-import docx2txt
-import PyPDF2
 import smtplib
 import logging
 from langchain_openai import ChatOpenAI
 import shutil
 from email.mime.text import MIMEText
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
+import threading
 from dotenv import load_dotenv
 from typing import Dict, List, Optional
 from langchain_openai import ChatOpenAI
 # === DB Imports (make sure your db.py has Candidate, SessionLocal) ===
-from app.models.db import Candidate, SessionLocal
+from app.models.db import Candidate, SessionLocal, init_db
 # LangChain, LangGraph imports
 from langchain_core.messages import AIMessage
 from langchain_core.output_parsers import JsonOutputParser
@@ -27,6 +26,12 @@ from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from pydantic import BaseModel, Field
 from app.config_paths import RESUME_DIR, PROCESSED_RESUME_DIR
+from app.services import scrape_sync
+from app.services.llm_clients import llm_clients
+from app.services.resume_text import content_hash as resume_content_hash, get_resume_documents, get_resume_text
+from app.services.screening_cache import (
+    cache_key, get_result, requirements_hash, store_result, text_sha256,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -53,16 +58,17 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_API_KEY:
     logger.error("OPENAI_API_KEY not found in environment variables")
     raise ValueError("OPENAI_API_KEY not found in environment variables")
+llm_clients.api_key = OPENAI_API_KEY
 
 # -------------------------
 # Utilities
 # -------------------------
-def get_llm(temperature=0, model="gpt-4o"):
-    return ChatOpenAI(
-        temperature=temperature,
-        model=model,
-        api_key=OPENAI_API_KEY
-    )
+SCREENING_MODEL = "gpt-4o"
+FEEDBACK_ERROR = "Feedback could not be generated due to an error."
+
+def get_llm(temperature=0, model=SCREENING_MODEL):
+    # Shared, pooled client (see app/services/llm_clients.py)
+    return llm_clients.get(model=model, temperature=temperature)
 
 def get_env_int(key, default):
     value = os.getenv(key, "")
@@ -74,24 +80,30 @@ def get_env_int(key, default):
         return default
 
 # === DB utils ===
+def _candidate_to_dict(candidate: Candidate) -> dict:
+    data = dict(candidate.__dict__)
+    data.pop('_sa_instance_state', None)
+    return data
+
 def get_all_candidates_from_db() -> list:
     session = SessionLocal()
     try:
-        candidates = session.query(Candidate).all()
-        data = [c.__dict__ for c in candidates]
-        for d in data:
-            d.pop('_sa_instance_state', None)
-        return data
+        return [_candidate_to_dict(c) for c in session.query(Candidate).all()]
     finally:
         session.close()
 
-def save_candidate_to_db(candidate_info: dict):
+def save_candidate_to_db(candidate_info: dict, candidate_id: Optional[int] = None) -> Optional[dict]:
     """
     Upsert by email (if you also want to make it by (email,job_id) you can adjust this here).
+    When the row id is already known, it is loaded by primary key instead.
+    Returns the saved row as a dict, or None on error.
     """
+    candidate_info = dict(candidate_info)
     session = SessionLocal()
     try:
-        cand = session.query(Candidate).filter_by(email=candidate_info.get("email", "")).first()
+        cand = session.get(Candidate, candidate_id) if candidate_id else None
+        if cand is None:
+            cand = session.query(Candidate).filter_by(email=candidate_info.get("email", "")).first()
         if 'id' in candidate_info:
             candidate_info.pop('id', None)
         if 'created_at' in candidate_info and not candidate_info['created_at']:
@@ -106,34 +118,35 @@ def save_candidate_to_db(candidate_info: dict):
                     setattr(cand, k, v)
         logger.info("Committing candidate to DB")
         session.commit()
+        return _candidate_to_dict(cand)
     except Exception as e:
         print(f"❌ DB error for {candidate_info.get('email')}: {str(e)}")
         logger.exception("DB error")
         session.rollback()
+        return None
     finally:
         session.close()
 
-def extract_text_from_resume(resume_path: str) -> str:
+def update_candidate_fields(candidate_id: int, **values) -> None:
+    """Update a few columns of one candidate through the ORM, so the
+    cache-version and recruitment-stats session hooks see the change."""
+    session = SessionLocal()
     try:
-        if resume_path.lower().endswith('.pdf'):
-            with open(resume_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text() or ""
-                    text += page_text
-                return text
-        elif resume_path.lower().endswith('.docx'):
-            return docx2txt.process(resume_path)
-        elif resume_path.lower().endswith('.txt'):
-            with open(resume_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        else:
-            logger.warning(f"Unsupported file format for {resume_path}")
-            return ""
-    except Exception as e:
-        logger.error(f"Error extracting text from {resume_path}: {str(e)}")
-        return ""
+        cand = session.get(Candidate, candidate_id)
+        if cand is None:
+            return
+        for k, v in values.items():
+            setattr(cand, k, v)
+        session.commit()
+    except Exception:
+        logger.exception("DB error")
+        session.rollback()
+    finally:
+        session.close()
+
+def extract_text_from_resume(resume_path: str) -> str:
+    # Parsed once per file content (see app/services/resume_text.py)
+    return get_resume_text(resume_path)
 
 def send_email_notification(
     candidate_info: Dict,
@@ -454,7 +467,7 @@ def feedback_generator(state: RecruitmentState) -> RecruitmentState:
     except Exception as e:
         logger.error(f"Error in feedback generator agent: {str(e)}")
         print(f"❌ Error in feedback generator: {str(e)}")
-        state.feedback = "Feedback could not be generated due to an error."
+        state.feedback = FEEDBACK_ERROR
         return state
 
 def email_notifier(state: RecruitmentState) -> RecruitmentState:
@@ -491,12 +504,112 @@ def email_notifier(state: RecruitmentState) -> RecruitmentState:
         print(f"⚠️ Failed to send email to {state.candidate.email}")
     return state
 
+# -------------------------
+# Memoized screening
+# -------------------------
+CACHED_CANDIDATE_FIELDS = (
+    "name", "email", "linkedin", "github", "ats_score", "status", "score_reasoning", "decision_reason",
+)
+
+def _is_cacheable(state: RecruitmentState) -> bool:
+    # Agents swallow LLM errors and fall back to defaults; never memoize those
+    candidate = state.candidate
+    return (
+        bool(candidate.email)
+        and candidate.status in ("Shortlisted", "Rejected")
+        and not candidate.score_reasoning.startswith("Error occurred")
+        and state.feedback != FEEDBACK_ERROR
+    )
+
+def screen_resume(graph, resume_path: str, job_requirements: JobRequirements,
+                  ats_threshold: float, invite_link: str = "",
+                  content_hash: Optional[str] = None) -> Optional[RecruitmentState]:
+    """
+    Run the agent graph for one resume. When the same resume bytes were already
+    scored against the same requirements/threshold/prompt version, the stored
+    result is reused and only the email notifier runs (no extraction, no LLM calls).
+    Returns None when no text could be extracted.
+    """
+    content_hash = content_hash or resume_content_hash(resume_path)
+    req_hash = requirements_hash(job_requirements.model_dump(), ats_threshold=ats_threshold, model=SCREENING_MODEL)
+    key = cache_key("screening", content_hash, req_hash)
+
+    cached = get_result(key)
+    if cached:
+        print(f"♻️ Reusing cached screening result for {os.path.basename(resume_path)}")
+        candidate = CandidateInfo(**{k: v for k, v in cached.get("candidate", {}).items() if k in CACHED_CANDIDATE_FIELDS})
+        candidate.job_title = job_requirements.title
+        candidate.testlify_link = invite_link or ""
+        candidate.assessment_invite_link = invite_link or ""
+        state = RecruitmentState(
+            candidate=candidate,
+            job_requirements=job_requirements,
+            ats_threshold=ats_threshold,
+            feedback=cached.get("feedback", ""),
+            testlify_link=invite_link or "",
+        )
+        return email_notifier(state)
+
+    resume_text = extract_text_from_resume(resume_path)
+    if not resume_text:
+        return None
+
+    initial_state = RecruitmentState(
+        resume_text=resume_text,
+        job_requirements=job_requirements,
+        ats_threshold=ats_threshold,
+        testlify_link=invite_link or ""  # ensure string
+    )
+    raw_state = graph.invoke(initial_state.model_dump())
+    final_state = raw_state if isinstance(raw_state, RecruitmentState) else RecruitmentState(**raw_state)
+
+    if _is_cacheable(final_state):
+        store_result(
+            key, "screening",
+            {
+                "candidate": final_state.candidate.model_dump(include=set(CACHED_CANDIDATE_FIELDS)),
+                "feedback": final_state.feedback,
+            },
+            content_hash=content_hash, requirements=req_hash, model=SCREENING_MODEL,
+        )
+    return final_state
+
+def extract_job_skills(job_title: str, job_desc: str) -> Optional[Dict[str, List[str]]]:
+    """Required/preferred skills for a job description, memoized per description."""
+    desc_hash = text_sha256(f"{job_title}\n{job_desc}")
+    key = cache_key("skills", desc_hash, SCREENING_MODEL)
+    cached = get_result(key)
+    if cached:
+        return cached
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "Extract required and preferred skills from job description. Return JSON with 'required_skills' and 'preferred_skills'."),
+        ("human", "Job Title: {title}\nJob Description: {desc}")
+    ])
+    parser = JsonOutputParser()
+    skill_chain = prompt | get_llm() | parser
+    result = skill_chain.invoke({"title": job_title, "desc": job_desc})
+    skills = {
+        "required_skills": list(result.get("required_skills") or []),
+        "preferred_skills": list(result.get("preferred_skills") or []),
+    }
+    if skills["required_skills"]:
+        store_result(key, "skills", skills, requirements=desc_hash, model=SCREENING_MODEL)
+    return skills
+
 # -------------------------
 # Orchestrator
 # -------------------------
 class ClintRecruitmentSystem:
     def __init__(self, testlify_link: Optional[str] = None):
         self.candidates = []
+        # Duplicate index, built once per run and updated after every save
+        self._index_lock = threading.RLock()
+        self._index_loaded = False
+        self._by_id: Dict[int, dict] = {}
+        self._by_filename: Dict[str, dict] = {}
+        self._by_email_job: Dict[tuple, dict] = {}
+        self._by_content_hash: Dict[str, dict] = {}
         self.ats_threshold = float(os.getenv("ATS_THRESHOLD", "70"))
         self.max_workers = get_env_int("MAX_WORKERS", 4)
         # make sure it's always a string
@@ -555,34 +668,70 @@ class ClintRecruitmentSystem:
         else:
             print(f"⚠️ Invalid threshold value: {threshold}")
 
+    # ---- duplicate index ----
+    @staticmethod
+    def _email_job_key(email, job_id) -> tuple:
+        return ((email or "").strip().lower(), str(job_id or ""))
+
+    def _ensure_index(self):
+        """Load candidates once per run; later updates are applied incrementally."""
+        with self._index_lock:
+            if self._index_loaded:
+                return
+            self.candidates = []
+            for candidate in get_all_candidates_from_db():
+                self._index_candidate(candidate)
+            self._index_loaded = True
+
+    def _index_candidate(self, candidate: dict, content_hash: Optional[str] = None):
+        with self._index_lock:
+            previous = self._by_id.get(candidate.get('id'))
+            if previous is not None:
+                previous.update(candidate)
+                candidate = previous
+            else:
+                self.candidates.append(candidate)
+                if candidate.get('id') is not None:
+                    self._by_id[candidate['id']] = candidate
+            if candidate.get('resume_path'):
+                self._by_filename[os.path.basename(candidate['resume_path'])] = candidate
+            if candidate.get('email'):
+                self._by_email_job[self._email_job_key(candidate['email'], candidate.get('job_id'))] = candidate
+            if content_hash:
+                self._by_content_hash[content_hash] = candidate
+
+    def _find_duplicate(self, resume_path: str, content_hash: str) -> Optional[dict]:
+        with self._index_lock:
+            return (
+                self._by_filename.get(os.path.basename(resume_path))
+                or self._by_content_hash.get(content_hash)
+            )
+
     def process_resume(self, resume_path):
         try:
             if not os.path.exists(resume_path):
                 print(f"⚠️ Resume file not found: {resume_path}")
                 return False
 
+            self._ensure_index()
             resume_filename = os.path.basename(resume_path)
-            for candidate in self.candidates:
-                if os.path.basename(candidate.get('resume_path', '')) == resume_filename:
-                    print(f"⚠️ Resume {resume_filename} already processed, skipping...")
-                    return False
+            content_hash = resume_content_hash(resume_path)
+            if self._find_duplicate(resume_path, content_hash):
+                print(f"⚠️ Resume {resume_filename} already processed, skipping...")
+                return False
+            with self._index_lock:
+                # Claim the hash so a concurrent worker skips an identical file
+                self._by_content_hash[content_hash] = {'resume_path': resume_path}
 
             print(f"📄 Processing resume: {resume_path}")
-            resume_text = extract_text_from_resume(resume_path)
-            if not resume_text:
+            result_state = screen_resume(
+                self.graph, resume_path, self.job_requirements, self.ats_threshold, self.testlify_link,
+                content_hash=content_hash
+            )
+            if result_state is None:
                 print(f"⚠️ Could not extract text from {resume_path}")
                 return False
 
-            initial_state = RecruitmentState(
-                resume_text=resume_text,
-                job_requirements=self.job_requirements,
-                ats_threshold=self.ats_threshold,
-                testlify_link=self.testlify_link or ""  # ensure string
-            )
-
-            raw_state = self.graph.invoke(initial_state)
-            result_state = raw_state if isinstance(raw_state, RecruitmentState) else RecruitmentState(**raw_state)
-
             candidate_info = result_state.candidate.model_dump()
             candidate_info["resume_path"] = resume_path
 
@@ -598,8 +747,15 @@ class ClintRecruitmentSystem:
                 if isinstance(candidate_info.get(field), dict):
                     candidate_info[field] = json.dumps(candidate_info[field])
 
-            save_candidate_to_db(candidate_info)
-            self.candidates = get_all_candidates_from_db()
+            existing = self._by_email_job.get(
+                self._email_job_key(candidate_info.get("email"), self.job_requirements.job_id)
+            )
+            saved = save_candidate_to_db(candidate_info, candidate_id=(existing or {}).get('id'))
+            if saved is None:
+                with self._index_lock:
+                    self._by_content_hash.pop(content_hash, None)
+                return False
+            self._index_candidate(saved, content_hash=content_hash)
 
             # move resume
             try:
@@ -611,10 +767,9 @@ class ClintRecruitmentSystem:
                     destination = os.path.join(PROCESSED_FOLDER, f"{name}_{timestamp}{ext}")
                 shutil.copy2(resume_path, destination)
                 os.remove(resume_path)
-                for candidate in self.candidates:
-                    if candidate.get('resume_path') == resume_path:
-                        candidate['resume_path'] = destination
-                        save_candidate_to_db(candidate)
+                update_candidate_fields(saved['id'], resume_path=destination)
+                scrape_sync.record_moved(resume_path, destination)
+                self._index_candidate({'id': saved['id'], 'resume_path': destination})
                 print(f"📁 Moved resume to: {destination}")
             except Exception as e:
                 print(f"⚠️ Could not move resume file: {str(e)}")
@@ -645,6 +800,7 @@ class ClintRecruitmentSystem:
         print(f"🔍 Found {num_files} resume files to process")
         start_time = time.time()
         processed_count = 0
+        get_resume_documents(resume_files)  # bulk parse in the extraction process pool
 
         if use_threads and num_files > 1:
             with ThreadPoolExecutor(max_workers=min(self.max_workers, num_files)) as executor:
@@ -684,6 +840,7 @@ class ClintRecruitmentSystem:
         print("\n" + "=" * 50)
 
     def retry_failed_notifications(self):
+        self._ensure_index()
         retry_count = 0
         for candidate in self.candidates:
             if candidate.get('email') and not candidate.get('notification_sent', False):
@@ -718,7 +875,7 @@ class ClintRecruitmentSystem:
                 )
                 if success:
                     candidate['notification_sent'] = True
-                    save_candidate_to_db(candidate)
+                    update_candidate_fields(candidate['id'], notification_sent=True)
                     retry_count += 1
 
         if retry_count > 0:
@@ -786,13 +943,7 @@ def run_recruitment_with_invite_link(job_id, job_title, job_desc, invite_link):
 
     if job_desc:
         try:
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", "Extract required and preferred skills from job description. Return JSON with 'required_skills' and 'preferred_skills'."),
-                ("human", "Job Title: {title}\nJob Description: {desc}")
-            ])
-            parser = JsonOutputParser()
-            skill_chain = prompt | get_llm() | parser
-            skills_result = skill_chain.invoke({"title": job_title, "desc": job_desc})
+            skills_result = extract_job_skills(job_title, job_desc)
             required_skills = (skills_result.get("required_skills") or required_skills)[:5]
             preferred_skills = (skills_result.get("preferred_skills") or preferred_skills)[:5]
             print(f"📋 Extracted skills - Required: {required_skills}, Preferred: {preferred_skills}")
@@ -839,93 +990,152 @@ def run_recruitment_with_invite_link(job_id, job_title, job_desc, invite_link):
 
     print(f"📁 Found {len(resume_files)} resume files to process in {resume_folder}")
 
+    concurrency = max(1, get_env_int("RECRUITMENT_CONCURRENCY", recruitment_system.max_workers))
+    batch_size = max(1, get_env_int("RECRUITMENT_COMMIT_BATCH", 10))
+
     session = SessionLocal()
     processed_count = 0
     shortlisted_count = 0
+    pending = []  # (candidate_data, shortlisted) flushed but not yet committed
 
     try:
+        # One query for every resume already screened for this job
+        already_processed = {
+            path for (path,) in session.query(Candidate.resume_path).filter(
+                Candidate.job_id == job_id,
+                Candidate.resume_path.in_(resume_files),
+                Candidate.status.isnot(None),
+                Candidate.status != "",
+            )
+        }
+        to_process = []
         for resume_path in resume_files:
-            filename = os.path.basename(resume_path)
+            if resume_path in already_processed:
+                print(f"⚠️ Resume already processed for this job: {os.path.basename(resume_path)}")
+            else:
+                to_process.append(resume_path)
+
+        def upsert(candidate_data):
+            existing = session.query(Candidate).filter_by(
+                resume_path=candidate_data["resume_path"],
+                job_id=job_id
+            ).first() or session.query(Candidate).filter_by(
+                email=candidate_data["email"],
+                job_id=job_id
+            ).first()
+            if existing:
+                for key, value in candidate_data.items():
+                    if key != 'id':
+                        setattr(existing, key, value)
+            else:
+                session.add(Candidate(**candidate_data))
+            session.flush()
+
+        def saved(batch):
+            nonlocal processed_count, shortlisted_count
+            processed_count += len(batch)
+            shortlisted_count += sum(1 for _, shortlisted in batch if shortlisted)
+
+        def replay_one_by_one(batch):
+            # A failed flush/commit rolled back the whole batch; save each row on its own
+            for candidate_data, shortlisted in batch:
+                try:
+                    upsert(candidate_data)
+                    session.commit()
+                    saved([(candidate_data, shortlisted)])
+                except Exception as e:
+                    session.rollback()
+                    logger.exception("Could not save candidate")
+                    print(f"❌ Could not save {candidate_data['name']}: {str(e)}")
+
+        def commit_batch():
+            batch = list(pending)
+            pending.clear()
             try:
-                print(f"\n📄 Processing resume: {filename}")
-
-                existing = session.query(Candidate).filter_by(
-                    resume_path=resume_path,
-                    job_id=job_id
-                ).first()
-                if existing and existing.status:
-                    print(f"⚠️ Resume already processed for this job: {filename}")
-                    continue
-
-                resume_text = extract_text_from_resume(resume_path)
-                if not resume_text:
-                    print(f"⚠️ Could not extract text from {filename}")
-                    continue
-
-                # ensure link is a string
-                initial_state = RecruitmentState(
-                    resume_text=resume_text,
-                    job_requirements=recruitment_system.job_requirements,
-                    ats_threshold=ats_threshold,
-                    testlify_link=(invite_link or "")
-                )
+                session.commit()
+                saved(batch)
+            except Exception as e:
+                logger.exception("Batch commit failed")
+                print(f"⚠️ Batch commit of {len(batch)} candidates failed, saving individually: {str(e)}")
+                session.rollback()
+                replay_one_by_one(batch)
+
+        def screen(resume_path):
+            # Runs on a worker thread: extraction + LLM graph only, no DB session
+            print(f"\n📄 Processing resume: {os.path.basename(resume_path)}")
+            print("🔄 Running AI analysis...")
+            return screen_resume(
+                recruitment_system.graph, resume_path, recruitment_system.job_requirements,
+                ats_threshold, invite_link or ""
+            )
 
-                print("🔄 Running AI analysis...")
-                result = recruitment_system.graph.invoke(initial_state.model_dump())
-                final_state = result if isinstance(result, RecruitmentState) else RecruitmentState(**result)
-
-                candidate_data = {
-                    "name": final_state.candidate.name,
-                    "email": final_state.candidate.email,
-                    "resume_path": resume_path,
-                    "job_id": job_id,
-                    "job_title": job_title,
-                    "ats_score": final_state.candidate.ats_score,
-                    "status": final_state.candidate.status,
-                    "score_reasoning": str(final_state.candidate.score_reasoning)[:500],
-                    # persist whichever provider link we used
-                    "assessment_invite_link": (invite_link or ""),
-                    "notification_sent": final_state.candidate.notification_sent,
-                    "processed_date": datetime.now()
-                }
+        # Parse all new files up front in the extraction process pool
+        get_resume_documents(to_process)
 
-                if final_state.candidate.status == "Shortlisted":
-                    candidate_data.update({
-                        "exam_link_sent": True,
-                        "exam_link_sent_date": datetime.now()
-                    })
-                    shortlisted_count += 1
-
-                if existing:
-                    for key, value in candidate_data.items():
-                        if key != 'id':
-                            setattr(existing, key, value)
-                else:
-                    existing_by_email = session.query(Candidate).filter_by(
-                        email=candidate_data["email"],
-                        job_id=job_id
-                    ).first()
-                    if existing_by_email:
-                        for key, value in candidate_data.items():
-                            if key != 'id':
-                                setattr(existing_by_email, key, value)
+        print(f"⚙️ Screening {len(to_process)} resumes with concurrency={concurrency}, commit batch={batch_size}")
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(to_process) or 1)) as pool:
+            futures = {pool.submit(screen, resume_path): resume_path for resume_path in to_process}
+            for future in as_completed(futures):
+                resume_path = futures[future]
+                filename = os.path.basename(resume_path)
+                try:
+                    final_state = future.result()
+                    if final_state is None:
+                        print(f"⚠️ Could not extract text from {filename}")
+                        continue
+
+                    candidate_data = {
+                        "name": final_state.candidate.name,
+                        "email": final_state.candidate.email,
+                        "resume_path": resume_path,
+                        "job_id": job_id,
+                        "job_title": job_title,
+                        "ats_score": final_state.candidate.ats_score,
+                        "status": final_state.candidate.status,
+                        "score_reasoning": str(final_state.candidate.score_reasoning)[:500],
+                        # persist whichever provider link we used
+                        "assessment_invite_link": (invite_link or ""),
+                        "notification_sent": final_state.candidate.notification_sent,
+                        "processed_date": datetime.now()
+                    }
+
+                    shortlisted = final_state.candidate.status == "Shortlisted"
+                    if shortlisted:
+                        candidate_data.update({
+                            "exam_link_sent": True,
+                            "exam_link_sent_date": datetime.now()
+                        })
+
+                    try:
+                        upsert(candidate_data)
+                    except Exception as e:
+                        # No savepoints (pysqlite would commit them on their own): the
+                        # rollback drops the uncommitted batch, so replay it row by row
+                        logger.exception("Could not save candidate")
+                        print(f"❌ Could not save {filename}: {str(e)}")
+                        session.rollback()
+                        batch = list(pending)
+                        pending.clear()
+                        replay_one_by_one(batch)
+                        continue
+
+                    pending.append((candidate_data, shortlisted))
+                    if shortlisted:
+                        print(f"✅ {candidate_data['name']} - SHORTLISTED (Score: {candidate_data['ats_score']:.1f})")
+                        print(f"   Email sent: {final_state.candidate.notification_sent}")
                     else:
-                        session.add(Candidate(**candidate_data))
+                        print(f"❌ {candidate_data['name']} - REJECTED (Score: {candidate_data['ats_score']:.1f})")
 
-                session.commit()
-                processed_count += 1
+                    if len(pending) >= batch_size:
+                        commit_batch()
 
-                if final_state.candidate.status == "Shortlisted":
-                    print(f"✅ {candidate_data['name']} - SHORTLISTED (Score: {candidate_data['ats_score']:.1f})")
-                    print(f"   Email sent: {final_state.candidate.notification_sent}")
-                else:
-                    print(f"❌ {candidate_data['name']} - REJECTED (Score: {candidate_data['ats_score']:.1f})")
+                except Exception as e:
+                    logger.exception("Error processing single resume")
+                    print(f"❌ Error processing resume {filename}: {str(e)}")
+                    continue
 
-            except Exception as e:
-                logger.exception("Error processing single resume")
-                print(f"❌ Error processing resume {filename}: {str(e)}")
-                session.rollback()
-                continue
+        if pending:
+            commit_batch()
 
         print("\n" + "="*50)
         print("📊 RECRUITMENT SUMMARY")
@@ -951,4 +1161,5 @@ def run_recruitment_with_invite_link(job_id, job_title, job_desc, invite_link):
 if __name__ == "__main__":
     print("🤖 Welcome to Clint Agentic AI Recruitment System with LangGraph (DB Mode)")
     print("=" * 50)
+    init_db()  # standalone run: create the resume/screening/sync tables if missing
     main()
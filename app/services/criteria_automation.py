@@ -7,6 +7,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Tuple
 from playwright.sync_api import sync_playwright, Page, TimeoutError as PWTimeout
+from app.services.browser_pool import BrowserLoginError, VendorProfile, sync_browser_pool
 # from app.services.criteria_automation import runpipeline as create_criteria_assessment_pipeline
 
 
@@ -41,14 +42,38 @@ def wait_and_click(page: Page, selector: str, timeout: int = 40000) -> bool:
         return False
 
 # ═══════════════════════ LOGIN HANDLER ═══════════════════════
-def ensure_logged_in(page: Page) -> bool:
-    """Ensure user is logged in."""
+LOGIN_CHECK_SECONDS = 10  # how long a non-interactive check waits for the dashboard
+
+
+def _is_logged_in(page: Page) -> bool:
+    return page.locator("text='Dashboard'").count() > 0 or \
+        page.locator("text='Create Job'").count() > 0 or \
+        "/dashboard" in page.url
+
+
+def ensure_logged_in(page: Page, wait_seconds: float = 300) -> bool:
+    """Ensure user is logged in.
+
+    Waits up to `wait_seconds` for a manual login in a visible browser. With
+    wait_seconds=0 (pooled/headless runs, where nobody can log in by hand) it
+    only checks the saved session and returns False quickly.
+    """
     print("🔐 Checking login status...")
 
     if "dashboard" in page.url or page.locator("text='Dashboard'").count() > 0:
         print("✅ Already logged in")
         return True
 
+    if not wait_seconds:
+        deadline = time.time() + LOGIN_CHECK_SECONDS
+        while time.time() < deadline:
+            if _is_logged_in(page):
+                print("✅ Already logged in")
+                return True
+            page.wait_for_timeout(1000)
+        print("❌ Not logged in (saved session expired)")
+        return False
+
     print("📝 Please complete login in the browser...")
 
     if "/login" not in page.url:
@@ -56,11 +81,9 @@ def ensure_logged_in(page: Page) -> bool:
 
     save_screenshot(page, "login_page")
 
-    deadline = time.time() + 300
+    deadline = time.time() + wait_seconds
     while time.time() < deadline:
-        if page.locator("text='Dashboard'").count() > 0 or \
-           page.locator("text='Create Job'").count() > 0 or \
-           "/dashboard" in page.url:
+        if _is_logged_in(page):
             print("✅ Login successful!")
             return True
         page.wait_for_timeout(5000)
@@ -384,9 +407,50 @@ def _launch_persistent_browser(headless: bool = True, slowmo: int = 0):
     return p, context, page
 
 
+# ═══════════════════════ POOLED BROWSER ═══════════════════════
+def _pooled_login(page: Page) -> bool:
+    # Runs on the shared pool thread: never wait for a manual login there
+    page.goto(DEFAULT_BASE, wait_until="domcontentloaded")
+    return ensure_logged_in(page, wait_seconds=0)
+
+
+def _profile_dir() -> str:
+    profile_path = Path(PROFILE_DIR).expanduser().resolve()
+    if (profile_path / "Default").exists():
+        profile_path = profile_path / "Default"
+    return str(profile_path)
+
+
+CRITERIA_VENDOR = VendorProfile(
+    name="criteria",
+    login=_pooled_login,
+    user_data_dir=_profile_dir(),
+    context_options={"viewport": {"width": 1440, "height": 900}, "ignore_https_errors": True},
+    launch_args=["--no-sandbox", "--disable-blink-features=AutomationControlled"],
+)
+sync_browser_pool.register(CRITERIA_VENDOR)
+
+
+def _pooled_automation(page: Page, job_title: str, occupation: str) -> Optional[str]:
+    page.goto(DEFAULT_BASE, wait_until="domcontentloaded")
+    if not ensure_logged_in(page, wait_seconds=0):
+        raise BrowserLoginError("Criteria session expired")
+    result = run_automation(page, job_title, occupation)
+    return (result or {}).get("assessment_link")
+
+
 # ═══════════════════════ MAIN PIPELINE ═══════════════════════
 def runpipeline(job_title: str, occupation: str = "python developer",
                 *, headless: bool = True, slowmo: int = 0) -> Optional[str]:
+    if headless and not slowmo:
+        # Long-lived browser: launch and login happen once per process
+        try:
+            return sync_browser_pool.run(CRITERIA_VENDOR.name, _pooled_automation, job_title, occupation)
+        except BrowserLoginError:
+            print("🔁 Retrying login in visible mode...")
+            sync_browser_pool.invalidate(CRITERIA_VENDOR.name)  # release the profile directory
+            return runpipeline(job_title, occupation, headless=False)
+
     p, context, page = _launch_persistent_browser(headless=headless, slowmo=slowmo)
     try:
         page.goto(DEFAULT_BASE, wait_until="domcontentloaded")
@@ -0,0 +1,81 @@
+# app/services/criteria_scores.py
+"""
+In-process Criteria score scraping for the service layer.
+- fetch_job_scores(job_title) runs the Criteria_score extraction on the shared
+  Criteria browser (sync_browser_pool, persistent profile) and returns the
+  candidate rows directly; no subprocess, no output-file globbing.
+- Runs are serialized on the pool's worker thread, so concurrent callers never
+  race on the browser profile.
+- Each row gets a numeric `score` (Talent Signal, else overall score) or None.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from playwright.sync_api import Page
+
+from app.services import Criteria_score as criteria
+from app.services.browser_pool import BrowserLoginError, sync_browser_pool
+from app.services.criteria_automation import CRITERIA_VENDOR, DEFAULT_BASE, ensure_logged_in
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_TIMEOUT_SECONDS = 300
+
+
+class CriteriaJobNotFound(LookupError):
+    """The job title is not listed on the Criteria results page."""
+
+
+def _numeric_score(candidate: Dict) -> Optional[float]:
+    value = candidate.get("talent_signal") or candidate.get("overall_score")
+    try:
+        return float(str(value).replace("%", "")) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+def _scrape_job(page: Page, job_title: str, detailed: bool) -> List[Dict]:
+    page.goto(DEFAULT_BASE, wait_until="domcontentloaded")
+    # Fail fast: a manual login cannot happen on the headless pool thread and
+    # waiting for one would stall every other sync-pool vendor
+    if not ensure_logged_in(page, wait_seconds=0):
+        raise BrowserLoginError(
+            f"Criteria session expired; log in once with python -m app.services.Criteria_score "
+            f"(visible browser, profile {CRITERIA_VENDOR.user_data_dir})"
+        )
+    if not criteria.navigate_to_results(page):
+        raise RuntimeError("Could not navigate to Criteria results")
+
+    jobs = criteria.get_available_jobs(page)
+    job = next((j for j in jobs if job_title.lower() in j["title"].lower()), None)
+    if job is None:
+        raise CriteriaJobNotFound(job_title)
+    if not criteria.select_job(page, job["title"], job):
+        raise RuntimeError(f"Could not select Criteria job: {job['title']}")
+
+    candidates = criteria.extract_candidate_scores(page, job["title"])
+    if detailed and candidates:
+        candidates = criteria.get_detailed_scores(page, candidates)
+    for candidate in candidates:
+        candidate["score"] = _numeric_score(candidate)
+    return candidates
+
+
+def fetch_job_scores(job_title: str, detailed: bool = False, export: bool = False,
+                     timeout: Optional[float] = SCRAPE_TIMEOUT_SECONDS) -> List[Dict]:
+    """Scrape one Criteria job's candidate scores on the pooled browser.
+
+    Raises CriteriaJobNotFound when the job is not listed and BrowserLoginError
+    when the saved session is no longer logged in.
+    """
+    candidates = sync_browser_pool.run(
+        CRITERIA_VENDOR.name, _scrape_job, job_title, detailed, timeout=timeout
+    )
+    logger.info(f"Criteria: {len(candidates)} candidates for {job_title}")
+    if export and candidates:
+        criteria.export_to_json(candidates, job_title)
+    return candidates
+
+
+__all__ = ["CriteriaJobNotFound", "fetch_job_scores"]
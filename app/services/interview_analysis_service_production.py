@@ -24,8 +24,10 @@ import os
 import re
 
 from app.models.db import SessionLocal, Candidate
+from app.services.interview_events import qa_pairs_for
 from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import cache as shared_cache  # centralized cache
+from app.services.scheduler import scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -57,7 +59,7 @@ class ProductionInterviewAnalysisService:
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.analysis_queue = queue.PriorityQueue()
         self.is_running = False
-        self.monitor_thread = None
+        self.monitor_job = "interview_analysis_monitor"
         self.worker_threads = []
         self.failed_analyses: Dict[int, Dict[str, Any]] = {}
         self.completed_analyses: set[int] = set()
@@ -105,10 +107,10 @@ class ProductionInterviewAnalysisService:
             return
         self.is_running = True
 
-        self.monitor_thread = threading.Thread(
-            target=self._monitor_loop, name="AnalysisMonitor", daemon=True
-        )
-        self.monitor_thread.start()
+        # Queue feeding runs on the app scheduler (one worker process at a time);
+        # the analysis workers below drain this process's queue
+        scheduler.register(self.monitor_job, self._monitor_pass, self.config['monitor_interval'], first_run=0)
+        scheduler.start()
         
         for i in range(2):
             worker = threading.Thread(
@@ -122,23 +124,18 @@ class ProductionInterviewAnalysisService:
         logger.info("Stopping Interview Analysis Service...")
         self.is_running = False
         
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
+        scheduler.unregister(self.monitor_job)
         for worker in self.worker_threads:
             worker.join(timeout=5)
         self.executor.shutdown(wait=True)
         logger.info("Interview Analysis Service stopped")
     
     # ---- loops ----
-    def _monitor_loop(self):
-        while self.is_running:
-            try:
-                self._check_pending_interviews()
-                self._check_stale_analyses()
-                self._retry_failed_analyses()
-            except Exception as e:
-                logger.error("Monitor loop error: %s", e, exc_info=True)
-            time.sleep(self.config['monitor_interval'])
+    def _monitor_pass(self):
+        # Errors propagate to the scheduler, which logs them and counts the failure
+        self._check_pending_interviews()
+        self._check_stale_analyses()
+        self._retry_failed_analyses()
     
     def _worker_loop(self):
         while self.is_running:
@@ -306,14 +303,14 @@ class ProductionInterviewAnalysisService:
             return self._generate_error_result(str(e))
     
     def _parse_qa_data_safely(self, candidate) -> List[Dict]:
-        # Prefer single field if present
-        if candidate.interview_qa_pairs:
-            try:
-                data = json.loads(candidate.interview_qa_pairs)
-                if isinstance(data, list) and data:
-                    return data
-            except json.JSONDecodeError:
-                logger.warning("Failed to parse interview_qa_pairs for %s", candidate.id)
+        # Prefer the Q&A pairs (event log, else the interview_qa_pairs column)
+        session = SessionLocal()
+        try:
+            data = qa_pairs_for(session, candidate)
+        finally:
+            session.close()
+        if isinstance(data, list) and data:
+            return data
         # Fall back to separate arrays
         qa_pairs: List[Dict] = []
         try:
@@ -591,11 +588,9 @@ RECOMMENDATIONS
                 else:
                     candidate.interview_final_status = 'Failed'
                     candidate.final_status = 'Interview Failed'
+            # The commit bumps the candidate's cache tags (candidate:<id>, job:<id>)
             session.commit()
             logger.info("Saved analysis results for candidate %s (overall=%s)", candidate.id, results['overall_score'])
-            if self.cache:
-                self.cache.delete(f"candidate_{candidate.id}")
-                self.cache.delete("interview_results")
         except Exception as e:
             logger.error("Error saving analysis results: %s", e)
             session.rollback()
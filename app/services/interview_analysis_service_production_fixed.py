@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 import os
 from app.models.db import Candidate, SessionLocal
+from app.services.interview_events import qa_pairs_for
 import openai
 import re
 
@@ -87,9 +88,12 @@ class DynamicInterviewAnalyzer:
         
         try:
             # Try different sources of Q&A data
-            if candidate.interview_qa_pairs:
-                qa_pairs = json.loads(candidate.interview_qa_pairs)
-            elif candidate.interview_questions_asked and candidate.interview_answers_given:
+            session = SessionLocal()
+            try:
+                qa_pairs = qa_pairs_for(session, candidate)
+            finally:
+                session.close()
+            if not qa_pairs and candidate.interview_questions_asked and candidate.interview_answers_given:
                 questions = json.loads(candidate.interview_questions_asked or '[]')
                 answers = json.loads(candidate.interview_answers_given or '[]')
                 
@@ -7,8 +7,6 @@ Interview automation service for TalentFlow.
 """
 
 import os
-import time
-import threading
 import logging
 import uuid
 from datetime import datetime, timedelta
@@ -18,6 +16,7 @@ import json
 from sqlalchemy import and_, or_
 
 from app.models.db import Candidate, SessionLocal
+from app.services.scheduler import scheduler
 # If your real email util lives elsewhere, update this import:
 try:
     from app.utils.email_util import send_email
@@ -32,12 +31,13 @@ logger = logging.getLogger(__name__)
 
 
 class InterviewAutomationSystem:
-    """Automated interview system that runs on an interval in a background thread."""
+    """Automated interview system that runs on an interval on the app scheduler."""
+
+    job_name = "interview_automation"
 
     def __init__(self):
         self.is_running = False
         self.check_interval = 1800  # 30 minutes
-        self.thread: threading.Thread | None = None
 
         self.heygen_api_key = os.getenv("HEYGEN_API_KEY")
         self.heygen_api_url = "https://api.heygen.com/v1/streaming/knowledge_base/create"
@@ -48,25 +48,20 @@ class InterviewAutomationSystem:
             logger.warning("Interview automation system already running")
             return
         self.is_running = True
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
+        scheduler.register(self.job_name, self._run_check, self.check_interval, first_run=0)
+        scheduler.start()
         logger.info("Interview automation system started")
 
     def stop(self) -> None:
         self.is_running = False
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=5)
+        scheduler.unregister(self.job_name)
         logger.info("Interview automation system stopped")
 
-    # ---- loop ----
-    def _run_loop(self) -> None:
-        while self.is_running:
-            try:
-                logger.info("🔄 Running interview automation check...")
-                self._process_candidates()
-            except Exception as e:
-                logger.error("Error in interview automation loop: %s", e, exc_info=True)
-            time.sleep(self.check_interval)
+    # ---- scheduled check ----
+    def _run_check(self) -> None:
+        # Errors propagate to the scheduler, which logs them and counts the failure
+        logger.info("🔄 Running interview automation check...")
+        self._process_candidates()
 
     # ---- core logic ----
     def _process_candidates(self) -> None:
@@ -0,0 +1,334 @@
+# app/services/interview_events.py
+"""
+Append-only interview event log for TalentFlow.
+- Tracking endpoints insert one InterviewEvent row per utterance instead of
+  re-parsing and rewriting the candidate's JSON text columns.
+- The legacy views (qa_pairs, conversation, structured conversation) are derived
+  from the log on read; candidates without events fall back to the old columns.
+  Each view reads only the sources that used to write its column: qa/track
+  (knowledge_base, voice_transcription) for qa_pairs and conversation, the
+  conversation snapshot (or, without one, qa/track-enhanced) for the
+  structured conversation.
+- Snapshot entries are keyed by their entry id (else type, timestamp and
+  content). A snapshot logs only the entries that are new or changed, including
+  their position, and retracts the ones it no longer contains, so the
+  structured view follows the latest snapshot even when it corrects or
+  reorders earlier entries.
+- Question/answer counters are recomputed from the view each endpoint feeds
+  (qa_counts, structured_counts), never incremented in place.
+- `materialize_legacy_columns` writes `interview_qa_pairs` back once (completion,
+  scoring) for code that still reads the column directly.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.models.db import InterviewEvent
+
+logger = logging.getLogger(__name__)
+
+QA_SOURCES = ("knowledge_base", "voice_transcription")  # /api/interview/qa/track
+SNAPSHOT_SOURCE = "snapshot"                           # /api/interview/conversation/update
+ENHANCED_SOURCE = "enhanced"                           # /api/interview/qa/track-enhanced
+RETRACT_EVENT = "retract"  # snapshot entry dropped by a later snapshot
+
+
+def _metadata(event: InterviewEvent) -> Dict[str, Any]:
+    try:
+        return json.loads(event.event_metadata or "{}")
+    except (TypeError, ValueError):
+        return {}
+
+
+# ---- writes ----
+def last_sequence(session, session_id: str) -> int:
+    """Highest sequence logged for a session (0 when empty); served by the unique index."""
+    value = (
+        session.query(func.max(InterviewEvent.sequence))
+        .filter(InterviewEvent.session_id == session_id)
+        .scalar()
+    )
+    return value or 0
+
+
+def append_event(session, session_id: str, event_type: str, content: str, *,
+                 candidate_id: Optional[int] = None, speaker: Optional[str] = None,
+                 timestamp: Optional[str] = None, source: Optional[str] = None,
+                 metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Insert a single event row. The caller owns the commit."""
+    table = InterviewEvent.__table__
+    next_sequence = (
+        select(func.coalesce(func.max(table.c.sequence), 0) + 1)
+        .where(table.c.session_id == session_id)
+        .scalar_subquery()
+    )
+    # The sequence is taken in the INSERT itself, so concurrent trackers for the
+    # same session cannot pick the same number between a read and the write.
+    stmt = table.insert().values(
+        session_id=session_id,
+        candidate_id=candidate_id,
+        sequence=next_sequence,
+        speaker=speaker or ("avatar" if event_type == "question" else "candidate"),
+        type=event_type,
+        content=content,
+        timestamp=timestamp or datetime.now().isoformat(),
+        source=source,
+        metadata=json.dumps(metadata or {}),
+        created_at=datetime.now(),
+    )
+    connection = session.connection()
+    if connection.dialect.name == "sqlite":
+        # SQLite serializes writers, and pysqlite would commit a savepoint on its own
+        session.execute(stmt)
+        return
+    # Other databases can still collide under concurrency; retry in a savepoint
+    # so the surrounding transaction stays usable
+    for attempt in range(3):
+        try:
+            with session.begin_nested():
+                session.execute(stmt)
+            return
+        except IntegrityError:
+            if attempt == 2:
+                raise
+
+
+def count_events(session, session_id: str, source: Optional[str] = None,
+                 event_type: Optional[str] = None) -> int:
+    query = session.query(func.count(InterviewEvent.id)).filter(InterviewEvent.session_id == session_id)
+    if source:
+        query = query.filter(InterviewEvent.source == source)
+    if event_type:
+        query = query.filter(InterviewEvent.type == event_type)
+    return query.scalar() or 0
+
+
+def snapshot_entry_key(entry: Dict[str, Any]) -> str:
+    """Stable identity of a snapshot entry across snapshots."""
+    entry_id = entry.get("id") or entry.get("entry_id")
+    if entry_id:
+        return str(entry_id)
+    return f"{entry.get('type')}|{entry.get('timestamp')}|{(entry.get('content') or '').strip()}"
+
+
+def log_snapshot(session, session_id: str, candidate_id: int, conversation_data: List[Dict[str, Any]]) -> int:
+    """Log the entries of a conversation snapshot that differ from the current one.
+
+    New, corrected and moved entries are appended; entries missing from the
+    snapshot are retracted. Returns the number of events written. The caller
+    owns the commit.
+    """
+    current = {
+        _snapshot_key(event): event
+        for event in _current_snapshot(load_events(session, candidate_id, sources=(SNAPSHOT_SOURCE,)))
+    }
+    written, seen = 0, set()
+    for position, entry in enumerate(conversation_data):
+        key = snapshot_entry_key(entry)
+        seen.add(key)
+        content = (entry.get("content") or "").strip()
+        metadata = {k: v for k, v in entry.items() if k not in ("type", "speaker", "content", "timestamp")}
+        metadata.update(entry_key=key, position=position)
+        logged = current.get(key)
+        if (logged is not None and logged.type == entry.get("type") and logged.content == content
+                and logged.timestamp == entry.get("timestamp") and _metadata(logged) == metadata):
+            continue
+        append_event(session, session_id, entry.get("type"), content, candidate_id=candidate_id,
+                     speaker=entry.get("speaker"), timestamp=entry.get("timestamp"),
+                     source=SNAPSHOT_SOURCE, metadata=metadata)
+        written += 1
+    for key, event in current.items():
+        if key not in seen:
+            append_event(session, session_id, RETRACT_EVENT, "", candidate_id=candidate_id,
+                         speaker=event.speaker, source=SNAPSHOT_SOURCE, metadata={"entry_key": key})
+            written += 1
+    return written
+
+
+# ---- reads ----
+def load_events(session, candidate_id: int, after_id: int = 0,
+                sources: Optional[Iterable[str]] = None) -> List[InterviewEvent]:
+    """Events for a candidate in insertion order, optionally only those after `after_id`
+    and only from the given sources."""
+    query = session.query(InterviewEvent).filter(InterviewEvent.candidate_id == candidate_id)
+    if after_id:
+        query = query.filter(InterviewEvent.id > after_id)
+    if sources is not None:
+        query = query.filter(InterviewEvent.source.in_(list(sources)))
+    return query.order_by(InterviewEvent.id).all()
+
+
+def _snapshot_key(event: InterviewEvent) -> str:
+    meta = _metadata(event)
+    return meta.get("entry_key") or snapshot_entry_key({
+        "id": meta.get("id"), "type": event.type, "timestamp": event.timestamp, "content": event.content,
+    })
+
+
+def _current_snapshot(events: List[InterviewEvent]) -> List[InterviewEvent]:
+    """Latest version of each snapshot entry still present, in snapshot order."""
+    latest: Dict[str, InterviewEvent] = {}
+    for event in events:
+        key = _snapshot_key(event)
+        latest.pop(key, None)
+        if event.type != RETRACT_EVENT:
+            latest[key] = event
+    ordered = list(latest.values())
+    return sorted(ordered, key=lambda e: _metadata(e).get("position", len(ordered)))
+
+
+def build_qa_pairs(events: List[InterviewEvent]) -> List[Dict[str, Any]]:
+    """Rebuild the legacy `interview_qa_pairs` list (answers fill the latest open question)."""
+    qa_pairs: List[Dict[str, Any]] = []
+    for event in events:
+        meta = _metadata(event)
+        if event.type == "question":
+            created = int((event.created_at or datetime.now()).timestamp())
+            qa_pairs.append({
+                "id": f"q_{len(qa_pairs) + 1}_{created}",
+                "question": event.content,
+                "answer": None,
+                "timestamp": event.timestamp,
+                "source": event.source or "knowledge_base",
+                "is_transcribed": False,
+                "metadata": meta,
+            })
+        elif event.type == "answer":
+            for qa in reversed(qa_pairs):
+                if qa.get("question") and not qa.get("answer"):
+                    qa["answer"] = event.content
+                    qa["answer_timestamp"] = event.timestamp
+                    qa["answer_source"] = event.source or "voice_transcription"
+                    qa["is_answer_transcribed"] = True
+                    qa["answer_metadata"] = meta
+                    break
+    return qa_pairs
+
+
+def build_conversation(events: List[InterviewEvent]) -> List[Dict[str, Any]]:
+    """Rebuild the legacy `interview_conversation` list (Avatar/Candidate speakers)."""
+    return [
+        {
+            "type": event.type,
+            "speaker": "Avatar" if event.type == "question" else "Candidate",
+            "content": event.content,
+            "timestamp": event.timestamp,
+            "source": event.source,
+            "sequence": event.sequence,
+            "metadata": _metadata(event),
+        }
+        for event in events
+    ]
+
+
+def build_structured_conversation(events: List[InterviewEvent]) -> List[Dict[str, Any]]:
+    """Rebuild the legacy `interview_conversation_structured` entries."""
+    entries = []
+    for event in events:
+        meta = _metadata(event)
+        content = event.content or ""
+        entries.append({
+            "id": meta.get("entry_id") or meta.get("id") or f"{event.type}_{event.sequence}",
+            "type": event.type,
+            "speaker": event.speaker,
+            "content": content,
+            "timestamp": event.timestamp,
+            "sequence": meta.get("sequence", event.sequence),
+            "linked_question_id": meta.get("linked_question_id"),
+            "word_count": meta.get("word_count", len(content.split())),
+            "confidence": meta.get("confidence", 1.0),
+            "is_complete": meta.get("is_complete", True),
+        })
+    return entries
+
+
+def _legacy_json(candidate, column: str) -> List[Dict[str, Any]]:
+    try:
+        return json.loads(getattr(candidate, column, None) or "[]")
+    except (TypeError, ValueError):
+        return []
+
+
+def qa_pairs_for(session, candidate) -> List[Dict[str, Any]]:
+    events = load_events(session, candidate.id, sources=QA_SOURCES)
+    return build_qa_pairs(events) if events else _legacy_json(candidate, "interview_qa_pairs")
+
+
+def conversation_for(session, candidate) -> List[Dict[str, Any]]:
+    events = load_events(session, candidate.id, sources=QA_SOURCES)
+    return build_conversation(events) if events else _legacy_json(candidate, "interview_conversation")
+
+
+def structured_conversation_for(session, candidate) -> List[Dict[str, Any]]:
+    # A snapshot is the client's whole conversation and used to replace the column,
+    # so it wins over the entries appended one by one by track-enhanced
+    snapshot = load_events(session, candidate.id, sources=(SNAPSHOT_SOURCE,))
+    events = _current_snapshot(snapshot) if snapshot else load_events(
+        session, candidate.id, sources=(ENHANCED_SOURCE,))
+    if snapshot or events:
+        return build_structured_conversation(events)
+    return _legacy_json(candidate, "interview_conversation_structured")
+
+
+def qa_counts(session, candidate) -> Tuple[int, int]:
+    """(total, answered) questions of the qa_pairs view, read from the event types only."""
+    types = session.query(InterviewEvent.type).filter(
+        InterviewEvent.candidate_id == candidate.id, InterviewEvent.source.in_(QA_SOURCES)
+    ).order_by(InterviewEvent.id).all()
+    if not types:
+        qa_pairs = _legacy_json(candidate, "interview_qa_pairs")
+        return len(qa_pairs), sum(1 for qa in qa_pairs if qa.get("answer"))
+    total = answered = 0
+    for (event_type,) in types:
+        if event_type == "question":
+            total += 1
+        elif event_type == "answer" and answered < total:
+            answered += 1  # build_qa_pairs gives each answer the latest open question
+    return total, answered
+
+
+def structured_counts(session, candidate) -> Tuple[int, int]:
+    """(questions, answers) in the structured conversation view."""
+    def by_type(source: str) -> Dict[str, int]:
+        return dict(session.query(InterviewEvent.type, func.count(InterviewEvent.id)).filter(
+            InterviewEvent.candidate_id == candidate.id, InterviewEvent.source == source
+        ).group_by(InterviewEvent.type).all())
+
+    # Without a snapshot the view is every track-enhanced entry, so plain counts do
+    if not by_type(SNAPSHOT_SOURCE):
+        counts = by_type(ENHANCED_SOURCE)
+        if counts:
+            return counts.get("question", 0), counts.get("answer", 0)
+    entries = structured_conversation_for(session, candidate)
+    return (sum(1 for e in entries if e.get("type") == "question"),
+            sum(1 for e in entries if e.get("type") == "answer"))
+
+
+def materialize_legacy_columns(session, candidate) -> List[Dict[str, Any]]:
+    """Derive `interview_qa_pairs` from the event log and store it on the candidate.
+
+    No-op for candidates that have no events (their column is still authoritative).
+    Returns the current qa_pairs either way. The caller owns the commit.
+    """
+    events = load_events(session, candidate.id, sources=QA_SOURCES)
+    if not events:
+        return _legacy_json(candidate, "interview_qa_pairs")
+    qa_pairs = build_qa_pairs(events)
+    serialized = json.dumps(qa_pairs)
+    if candidate.interview_qa_pairs != serialized:
+        candidate.interview_qa_pairs = serialized
+    return qa_pairs
+
+
+__all__ = [
+    "append_event", "last_sequence", "count_events", "load_events",
+    "snapshot_entry_key", "log_snapshot", "qa_counts", "structured_counts",
+    "build_qa_pairs", "build_conversation", "build_structured_conversation",
+    "qa_pairs_for", "conversation_for", "structured_conversation_for",
+    "materialize_legacy_columns", "QA_SOURCES", "SNAPSHOT_SOURCE", "ENHANCED_SOURCE",
+]
@@ -0,0 +1,169 @@
+# app/services/interview_transcript.py
+"""
+Incremental interview transcript builder for TalentFlow.
+- A transcript renders one source family, chosen the way the structured view
+  is: the conversation snapshot if there is one, else qa/track-enhanced, else
+  qa/track. Events from the other endpoints never end up interleaved in it.
+- Each tracking call renders only the events logged since the family's last
+  chunk and inserts them as one InterviewTranscriptChunk row; the candidate row
+  is not rewritten. Chunks are unique on their first event id, so concurrent
+  calls never store an event twice.
+- A snapshot can correct or drop earlier entries, so that family is rendered
+  from the current snapshot on read instead of being chunked.
+- `transcript_for` assembles the transcript; `materialize_transcript` writes it
+  to `interview_transcript` once, at completion.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import func
+
+from app.models.db import InterviewEvent, InterviewTranscriptChunk, insert_ignore
+from app.services.interview_events import (
+    ENHANCED_SOURCE, QA_SOURCES, SNAPSHOT_SOURCE, load_events,
+    structured_conversation_for,
+)
+
+logger = logging.getLogger(__name__)
+
+# Chunked families and their sources; qa/track uses the compact one-line format.
+_FAMILIES = {"qa": QA_SOURCES, "enhanced": (ENHANCED_SOURCE,)}
+_COMPACT_SOURCES = set(QA_SOURCES)
+
+
+# ---- formatting ----
+def format_transcript_header(candidate_name: str) -> str:
+    return (
+        f"Interview Transcript - {candidate_name}\n"
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        + "=" * 70 + "\n\n"
+    )
+
+
+def format_transcript_entry(entry: Dict[str, Any]) -> str:
+    """Render one structured conversation entry; raises KeyError/ValueError on bad input."""
+    timestamp = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
+    time_str = timestamp.strftime('%H:%M:%S')
+    speaker = 'AI Interviewer' if entry['speaker'] == 'avatar' else 'Candidate'
+    content = entry['content'].strip()
+    return f"[{time_str}] {speaker}:\n{content}\n\n"
+
+
+def format_transcript_entries(entries: Iterable[Dict[str, Any]]) -> str:
+    parts = []
+    for entry in entries:
+        try:
+            parts.append(format_transcript_entry(entry))
+        except (KeyError, ValueError, AttributeError) as e:
+            logger.warning(f"Error formatting entry: {e}")
+    return "".join(parts)
+
+
+def _render_event(event) -> str:
+    if event.source in _COMPACT_SOURCES:
+        try:
+            time_str = datetime.fromisoformat(event.timestamp).strftime('%H:%M:%S')
+        except (TypeError, ValueError):
+            time_str = (event.created_at or datetime.now()).strftime('%H:%M:%S')
+        if event.type == 'question':
+            return f"\n[{time_str}] Avatar (KB): {event.content}\n"
+        return f"[{time_str}] Candidate (Voice): {event.content}\n"
+    return format_transcript_entries([{
+        'timestamp': event.timestamp,
+        'speaker': event.speaker,
+        'content': event.content,
+    }])
+
+
+# ---- incremental update ----
+def _family(session, candidate) -> Optional[str]:
+    """Source family the candidate's transcript renders; None when it has no events."""
+    def has(sources) -> bool:
+        return session.query(InterviewEvent.id).filter(
+            InterviewEvent.candidate_id == candidate.id, InterviewEvent.source.in_(sources)
+        ).first() is not None
+
+    if has((SNAPSHOT_SOURCE,)):
+        return "snapshot"
+    if has((ENHANCED_SOURCE,)):
+        return "enhanced"
+    if has(QA_SOURCES):
+        return "qa"
+    return None
+
+
+def _last_chunked_id(session, candidate, family: str) -> int:
+    return session.query(func.max(InterviewTranscriptChunk.last_event_id)).filter(
+        InterviewTranscriptChunk.candidate_id == candidate.id,
+        InterviewTranscriptChunk.family == family,
+    ).scalar() or 0
+
+
+def append_new_entries(session, candidate) -> int:
+    """Render the family's events logged since its last chunk into a new chunk row.
+
+    Only the new rows are loaded and rendered. Returns the number of events
+    stored (0 when there was nothing new or a concurrent call stored them first).
+    The caller owns the commit.
+    """
+    family = _family(session, candidate)
+    if family not in _FAMILIES:
+        return 0
+
+    events = load_events(session, candidate.id, after_id=_last_chunked_id(session, candidate, family),
+                         sources=_FAMILIES[family])
+    if not events:
+        return 0
+
+    connection = session.connection()
+    stored = connection.execute(insert_ignore(connection, InterviewTranscriptChunk.__table__, dict(
+        candidate_id=candidate.id,
+        session_id=candidate.interview_session_id,
+        family=family,
+        first_event_id=events[0].id,
+        last_event_id=events[-1].id,
+        content="".join(_render_event(event) for event in events),
+        created_at=datetime.now(),
+    ))).rowcount
+    return len(events) if stored else 0
+
+
+def transcript_for(session, candidate) -> str:
+    """Current transcript text; candidates without events fall back to the old column."""
+    family = _family(session, candidate)
+    if family is None:
+        return candidate.interview_transcript or ""
+    header = format_transcript_header(candidate.name)
+    if family == "snapshot":
+        return header + format_transcript_entries(structured_conversation_for(session, candidate))
+
+    chunks = session.query(InterviewTranscriptChunk.content).filter(
+        InterviewTranscriptChunk.candidate_id == candidate.id,
+        InterviewTranscriptChunk.family == family,
+    ).order_by(InterviewTranscriptChunk.first_event_id).all()
+    # Events not chunked yet (e.g. logged by a call that has not committed its chunk)
+    pending = load_events(session, candidate.id, after_id=_last_chunked_id(session, candidate, family),
+                          sources=_FAMILIES[family])
+    body = "".join(content or "" for (content,) in chunks) + "".join(_render_event(e) for e in pending)
+    return body if family == "qa" else header + body
+
+
+def materialize_transcript(session, candidate) -> str:
+    """Store `transcript_for` in `interview_transcript` for code that reads the column.
+
+    No-op for candidates without events. The caller owns the commit.
+    """
+    if _family(session, candidate) is None:
+        return candidate.interview_transcript or ""
+    transcript = transcript_for(session, candidate)
+    if candidate.interview_transcript != transcript:
+        candidate.interview_transcript = transcript
+    return transcript
+
+
+__all__ = [
+    "format_transcript_header", "format_transcript_entry", "format_transcript_entries",
+    "append_new_entries", "transcript_for", "materialize_transcript",
+]
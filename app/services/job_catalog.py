@@ -0,0 +1,243 @@
+# app/services/job_catalog.py
+"""
+Stale-while-revalidate cache for BambooHR job openings.
+- Serves the last known open-jobs list immediately, from memory or from the
+  `job_catalog_snapshots` row shared by all workers (so cold starts do not wait).
+- When the snapshot is older than the TTL, one background refresh is started.
+  Refreshes are single-flight within a process (flag) and across gunicorn workers
+  (a lease column claimed with a conditional UPDATE).
+- Only a worker with no snapshot at all calls BambooHR synchronously.
+- Storing a changed list bumps the `jobs` cache tag, so memoized job listings
+  in every worker pick it up.
+
+The API base URL is configurable (BAMBOOHR_API_BASE), so the catalog can be
+exercised against a local stub HTTP server.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import requests
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+
+from flask import current_app, has_app_context
+
+from app.models.db import JobCatalogSnapshot, SessionLocal
+from app.utils.cache_tags import JOBS_TAG, invalidate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE = "https://api.bamboohr.com"
+
+
+class JobCatalog:
+    """Open-jobs catalog with stale-while-revalidate semantics."""
+
+    def __init__(self, api_key: Optional[str] = None, subdomain: Optional[str] = None,
+                 base_url: Optional[str] = None, ttl_seconds: int = 300,
+                 lease_seconds: int = 60, request_timeout: int = 10):
+        self.api_key = api_key
+        self.subdomain = subdomain
+        self.base_url = base_url
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.lease = timedelta(seconds=lease_seconds)
+        self.request_timeout = request_timeout
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._jobs: Optional[List[Dict[str, Any]]] = None
+        self._fetched_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    # ---- config ----
+    @property
+    def _api_key(self) -> Optional[str]:
+        return self.api_key or os.getenv("BAMBOOHR_API_KEY")
+
+    @property
+    def _subdomain(self) -> Optional[str]:
+        return self.subdomain or os.getenv("BAMBOOHR_SUBDOMAIN")
+
+    @property
+    def _base_url(self) -> str:
+        return (self.base_url or os.getenv("BAMBOOHR_API_BASE") or DEFAULT_API_BASE).rstrip("/")
+
+    @property
+    def source(self) -> str:
+        return f"bamboohr:{self._subdomain}"
+
+    # ---- public API ----
+    def get_open_jobs(self) -> List[Dict[str, Any]]:
+        """Return the open jobs without waiting on BambooHR whenever a snapshot exists."""
+        if not self._api_key or not self._subdomain:
+            raise ValueError("BambooHR credentials not configured")
+
+        if self._jobs is None or self._is_stale():
+            # Another worker may already have refreshed the shared snapshot
+            self._load_snapshot()
+
+        if self._jobs is None:
+            # Cold start with no snapshot anywhere: nothing to serve but a live fetch
+            with self._lock:
+                if self._jobs is None:
+                    self._store(self.fetch_open_jobs())
+            return list(self._jobs)
+
+        if self._is_stale():
+            self.refresh_async()
+        return list(self._jobs)
+
+    def refresh_async(self) -> bool:
+        """Start a background refresh unless one is already running here or elsewhere."""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        if not self._claim_lease():
+            with self._lock:
+                self._refreshing = False
+            return False
+        # Carry the app context over so the refresh can invalidate cached listings
+        app = current_app._get_current_object() if has_app_context() else None
+        threading.Thread(target=self._refresh, args=(app,), name="job-catalog-refresh", daemon=True).start()
+        return True
+
+    def refresh(self) -> List[Dict[str, Any]]:
+        """Synchronously fetch and persist the open jobs."""
+        jobs = self.fetch_open_jobs()
+        self._store(jobs)
+        return jobs
+
+    def fetch_open_jobs(self) -> List[Dict[str, Any]]:
+        url = f"{self._base_url}/api/gateway.php/{self._subdomain}/v1/applicant_tracking/jobs/"
+        headers = {"Accept": "application/json", "Content-Type": "application/json"}
+        resp = requests.get(url, auth=(self._api_key, "x"), headers=headers, timeout=self.request_timeout)
+        resp.raise_for_status()
+        return [
+            {
+                "id": job["id"],
+                "title": job.get("title", {}).get("label", ""),
+                "location": job.get("location", {}).get("label", ""),
+                "department": job.get("department", {}).get("label", ""),
+                "postingUrl": job.get("postingUrl", ""),
+                "description": job.get("description", ""),
+            }
+            for job in resp.json()
+            if job.get("status", {}).get("label", "").lower() == "open"
+        ]
+
+    # ---- internals ----
+    def _is_stale(self) -> bool:
+        return self._fetched_at is None or datetime.now() - self._fetched_at > self.ttl
+
+    def _refresh(self, app=None) -> None:
+        try:
+            if app is not None:
+                with app.app_context():
+                    self.refresh()
+            else:
+                self.refresh()
+            logger.info(f"Job catalog refreshed ({len(self._jobs or [])} open jobs)")
+        except Exception as e:
+            logger.error(f"Job catalog refresh failed, serving last snapshot: {e}")
+            self._record_failure(str(e))
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _load_snapshot(self) -> None:
+        try:
+            session = SessionLocal()
+            try:
+                row = session.get(JobCatalogSnapshot, self.source)
+                if row and row.payload and row.fetched_at and (
+                    self._fetched_at is None or row.fetched_at > self._fetched_at
+                ):
+                    self._jobs = json.loads(row.payload)
+                    self._fetched_at = row.fetched_at
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"Could not read job catalog snapshot: {e}")
+
+    def _store(self, jobs: List[Dict[str, Any]]) -> None:
+        now = datetime.now()
+        changed = jobs != self._jobs
+        self._jobs, self._fetched_at = jobs, now
+        try:
+            session = SessionLocal()
+            try:
+                row = session.get(JobCatalogSnapshot, self.source)
+                if row is None:
+                    row = JobCatalogSnapshot(source=self.source)
+                    session.add(row)
+                row.payload = json.dumps(jobs)
+                row.fetched_at = now
+                row.refresh_owner = None
+                row.refresh_lease_until = None
+                row.last_error = None
+                session.commit()
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"Could not persist job catalog snapshot: {e}")
+        if changed:
+            invalidate(JOBS_TAG)
+
+    def _claim_lease(self) -> bool:
+        """Claim the cross-worker refresh lease; False if another worker holds it."""
+        now = datetime.now()
+        try:
+            session = SessionLocal()
+            try:
+                if session.get(JobCatalogSnapshot, self.source) is None:
+                    try:
+                        session.add(JobCatalogSnapshot(source=self.source))
+                        session.commit()
+                    except IntegrityError:
+                        session.rollback()  # another worker created the row first
+                table = JobCatalogSnapshot.__table__
+                claimed = session.execute(
+                    update(table)
+                    .where(table.c.source == self.source)
+                    .where(or_(table.c.refresh_lease_until.is_(None), table.c.refresh_lease_until < now))
+                    .values(refresh_owner=self.owner, refresh_lease_until=now + self.lease)
+                ).rowcount
+                session.commit()
+                return bool(claimed)
+            finally:
+                session.close()
+        except Exception as e:
+            # Without the shared table fall back to per-process single-flight
+            logger.warning(f"Job catalog lease unavailable: {e}")
+            return True
+
+    def _record_failure(self, error: str) -> None:
+        """Keep the lease until it expires so a failing upstream is retried once per lease."""
+        try:
+            session = SessionLocal()
+            try:
+                table = JobCatalogSnapshot.__table__
+                session.execute(
+                    update(table)
+                    .where(table.c.source == self.source)
+                    .where(table.c.refresh_owner == self.owner)
+                    .values(last_error=error)
+                )
+                session.commit()
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"Could not record job catalog failure: {e}")
+
+
+# Process-wide catalog used by the jobs routes
+job_catalog = JobCatalog()
+
+__all__ = ["JobCatalog", "job_catalog"]
@@ -0,0 +1,182 @@
+# app/services/llm_clients.py
+"""
+Process-wide LLM client registry for the recruitment pipeline.
+- One ChatOpenAI per (model, temperature), created on first use and shared by
+  every agent node and worker thread.
+- All clients share keep-alive httpx connection pools (one per base URL), so a
+  batch of resumes reuses TCP/TLS connections instead of opening one per call.
+- Per-model concurrency limits cap the number of in-flight completions.
+
+Configuration (environment):
+    OPENAI_BASE_URL        chat-completions endpoint (e.g. a local fake server)
+    LLM_MAX_CONNECTIONS    pool size per base URL (default 20)
+    LLM_KEEPALIVE_SECONDS  idle keep-alive expiry (default 60)
+    LLM_MAX_CONCURRENCY    in-flight requests per model (default 8)
+    LLM_TIMEOUT_SECONDS    request timeout (default 60)
+    LLM_MAX_RETRIES        SDK retries (default 2)
+    LLM_MODEL_CONFIG       JSON overrides per model, e.g.
+                           {"gpt-4o": {"max_concurrency": 4, "timeout": 90}}
+
+Smoke check against the configured endpoint:
+    python -m app.services.llm_clients --ping
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Optional, Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-4o"
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        return int(os.getenv(key, "") or default)
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class ModelConfig:
+    base_url: Optional[str] = None
+    max_concurrency: int = 8
+    timeout: float = 60.0
+    max_retries: int = 2
+
+
+class PooledChatOpenAI(ChatOpenAI):
+    """ChatOpenAI that waits for a per-model slot before each completion."""
+
+    def _generate(self, *args, **kwargs):
+        with llm_clients.slot(self.model_name):
+            return super()._generate(*args, **kwargs)
+
+
+class LLMClientRegistry:
+    """Caches chat clients and the HTTP pools they share."""
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key
+        self._clients: Dict[Tuple[str, float], ChatOpenAI] = {}
+        self._http_clients: Dict[Optional[str], httpx.Client] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._overrides: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    # ---- config ----
+    def configure(self, model: str, **overrides) -> None:
+        """Override settings for one model; existing clients for it are rebuilt."""
+        with self._lock:
+            self._overrides.setdefault(model, {}).update(overrides)
+            self._semaphores.pop(model, None)
+            for key in [k for k in self._clients if k[0] == model]:
+                del self._clients[key]
+
+    def config_for(self, model: str) -> ModelConfig:
+        config = ModelConfig(
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            max_concurrency=_env_int("LLM_MAX_CONCURRENCY", 8),
+            timeout=float(_env_int("LLM_TIMEOUT_SECONDS", 60)),
+            max_retries=_env_int("LLM_MAX_RETRIES", 2),
+        )
+        try:
+            env_overrides = json.loads(os.getenv("LLM_MODEL_CONFIG", "") or "{}").get(model, {})
+        except (ValueError, AttributeError):
+            logger.warning("Ignoring invalid LLM_MODEL_CONFIG")
+            env_overrides = {}
+        overrides = {**env_overrides, **self._overrides.get(model, {})}
+        known = {f.name for f in fields(ModelConfig)}
+        return replace(config, **{k: v for k, v in overrides.items() if k in known})
+
+    # ---- clients ----
+    def get(self, model: str = DEFAULT_MODEL, temperature: float = 0) -> ChatOpenAI:
+        key = (model, float(temperature))
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                config = self.config_for(model)
+                client = PooledChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    api_key=self.api_key or os.getenv("OPENAI_API_KEY"),
+                    base_url=config.base_url,
+                    timeout=config.timeout,
+                    max_retries=config.max_retries,
+                    http_client=self._http_client(config.base_url),
+                )
+                self._clients[key] = client
+                logger.info(f"Created LLM client for {model} (temperature={temperature})")
+        return client
+
+    def _http_client(self, base_url: Optional[str]) -> httpx.Client:
+        # Called with self._lock held
+        http_client = self._http_clients.get(base_url)
+        if http_client is None:
+            max_connections = _env_int("LLM_MAX_CONNECTIONS", 20)
+            http_client = httpx.Client(limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=_env_int("LLM_KEEPALIVE_SECONDS", 60),
+            ))
+            self._http_clients[base_url] = http_client
+        return http_client
+
+    @contextmanager
+    def slot(self, model: str):
+        """Hold one of the model's concurrency slots for the duration of a call."""
+        semaphore = self._semaphores.get(model)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._semaphores.get(model)
+                if semaphore is None:
+                    limit = max(1, self.config_for(model).max_concurrency)
+                    semaphore = self._semaphores[model] = threading.BoundedSemaphore(limit)
+        with semaphore:
+            yield
+
+    def close(self) -> None:
+        """Drop cached clients and close the pooled connections."""
+        with self._lock:
+            self._clients.clear()
+            self._semaphores.clear()
+            for http_client in self._http_clients.values():
+                http_client.close()
+            self._http_clients.clear()
+
+
+# Process-wide registry used by the recruitment agents
+llm_clients = LLMClientRegistry()
+
+
+def get_chat_model(model: str = DEFAULT_MODEL, temperature: float = 0) -> ChatOpenAI:
+    return llm_clients.get(model=model, temperature=temperature)
+
+
+__all__ = ["LLMClientRegistry", "ModelConfig", "PooledChatOpenAI", "llm_clients", "get_chat_model"]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="LLM client registry")
+    parser.add_argument("--ping", action="store_true", help="send one completion to the configured endpoint")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    args = parser.parse_args()
+    if args.ping:
+        logging.basicConfig(level=logging.INFO)
+        reply = get_chat_model(args.model).invoke("Reply with the word pong.")
+        print(reply.content)
+        llm_clients.close()
+    else:
+        parser.print_help()
@@ -0,0 +1,222 @@
+# app/services/recruitment_stats.py
+"""
+Materialized monthly recruitment aggregates for TalentFlow.
+- `recruitment_stats_monthly` holds one row per calendar month (applications,
+  interviews, hires, exams passed, rejections).
+- A SessionLocal before_flush hook applies +/- deltas for every Candidate insert,
+  update or delete in the same transaction, so the table stays consistent across
+  gunicorn workers without recomputation.
+- Writes that bypass the ORM unit of work (raw SQL, bulk Query.update) are not
+  seen by the hook; those call paths run `rebuild_recruitment_stats()` after
+  their commit.
+- Commits that changed the aggregates bump the `stats` cache tag.
+- `rebuild_recruitment_stats()` recomputes everything from `candidates` (backfill):
+      python -m app.services.recruitment_stats --rebuild
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime
+from itertools import chain
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import load_only
+
+from app.models.db import Candidate, RecruitmentStatsMonthly, SessionLocal, init_db, insert_ignore
+from app.utils.response_versions import STATS_SCOPE, bump_version
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("applications", "interviews", "hires", "exams_passed", "rejections")
+PASSING_EXAM_PERCENTAGE = 70
+
+# Candidate columns that feed the aggregates; only changes to these produce deltas.
+TRACKED_COLUMNS = (
+    "processed_date", "status", "final_status",
+    "interview_scheduled", "interview_date",
+    "exam_completed", "exam_percentage", "exam_completed_date",
+)
+
+
+def month_key(value: datetime) -> str:
+    return value.strftime("%Y-%m")
+
+
+def contributions(values: Dict[str, object]) -> Counter:
+    """(month, metric) -> count for one candidate's tracked column values."""
+    result: Counter = Counter()
+    processed = values.get("processed_date") or datetime.now()
+
+    result[(month_key(processed), "applications")] += 1
+    if values.get("interview_scheduled") and values.get("interview_date"):
+        result[(month_key(values["interview_date"]), "interviews")] += 1
+    if values.get("final_status") == "Hired":
+        result[(month_key(processed), "hires")] += 1
+    if values.get("exam_completed") and (values.get("exam_percentage") or 0) >= PASSING_EXAM_PERCENTAGE:
+        result[(month_key(values.get("exam_completed_date") or processed), "exams_passed")] += 1
+    if values.get("status") == "Rejected":
+        result[(month_key(processed), "rejections")] += 1
+    return result
+
+
+def _current_values(obj: Candidate) -> Dict[str, object]:
+    return {col: getattr(obj, col) for col in TRACKED_COLUMNS}
+
+
+def _previous_values(obj: Candidate) -> Tuple[Dict[str, object], bool]:
+    """Committed values of the tracked columns, and whether any of them changed."""
+    state = inspect(obj)
+    values, changed = {}, False
+    for col in TRACKED_COLUMNS:
+        history = state.attrs[col].history
+        if history.has_changes():
+            changed = True
+            values[col] = history.deleted[0] if history.deleted else None
+        else:
+            values[col] = getattr(obj, col)
+    return values, changed
+
+
+def _apply_deltas(connection, deltas: Counter) -> None:
+    table = RecruitmentStatsMonthly.__table__
+    by_month: Dict[str, Dict[str, int]] = {}
+    for (month, metric), delta in deltas.items():
+        if delta:
+            by_month.setdefault(month, {})[metric] = delta
+
+    now = datetime.now()
+    for month, metrics in by_month.items():
+        stmt = (
+            update(table)
+            .where(table.c.month == month)
+            .values(updated_at=now, **{m: table.c[m] + d for m, d in metrics.items()})
+        )
+        if connection.execute(stmt).rowcount:
+            continue
+        values = dict(month=month, updated_at=now, **{m: max(metrics.get(m, 0), 0) for m in METRICS})
+        if not connection.execute(insert_ignore(connection, table, values)).rowcount:
+            # Another worker created the month row first
+            connection.execute(stmt)
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _track_candidate_changes(session, flush_context, instances):
+    deltas: Counter = Counter()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Candidate):
+            continue
+        if obj in session.new:
+            deltas.update(contributions(_current_values(obj)))
+        elif obj in session.deleted:
+            deltas.subtract(contributions(_previous_values(obj)[0]))
+        else:
+            previous, changed = _previous_values(obj)
+            if changed:
+                deltas.subtract(contributions(previous))
+                deltas.update(contributions(_current_values(obj)))
+    if any(deltas.values()):
+        try:
+            connection = session.connection()
+            if connection.dialect.name == "sqlite":
+                # pysqlite emits no BEGIN before a SAVEPOINT, so its RELEASE would commit
+                # the deltas on their own; run them in the session's transaction instead.
+                _apply_deltas(connection, deltas)
+            else:
+                with connection.begin_nested():
+                    _apply_deltas(connection, deltas)
+            session.info["recruitment_stats_changed"] = True
+        except Exception as e:
+            # Never block candidate writes on the aggregate; a rebuild repairs drift
+            logger.error(f"Failed to update recruitment_stats_monthly: {e}")
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _bump_stats_version(session):
+    if session.info.pop("recruitment_stats_changed", False):
+        try:
+            bump_version(STATS_SCOPE)
+        except Exception as e:
+            logger.warning(f"Failed to bump the stats cache tag: {e}")
+
+
+# ---- reads / backfill ----
+def get_monthly_stats(months: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """Aggregates for the given 'YYYY-MM' keys in one indexed range scan."""
+    months = sorted(set(months))
+    if not months:
+        return {}
+    session = SessionLocal()
+    try:
+        empty = session.query(RecruitmentStatsMonthly.month).first() is None
+    finally:
+        session.close()
+    if empty:
+        # First use after deploy: backfill from candidates once
+        rebuild_recruitment_stats()
+
+    session = SessionLocal()
+    try:
+        rows = (
+            session.query(RecruitmentStatsMonthly)
+            .filter(RecruitmentStatsMonthly.month.between(months[0], months[-1]))
+            .all()
+        )
+        return {
+            row.month: {m: getattr(row, m) or 0 for m in METRICS}
+            for row in rows if row.month in months
+        }
+    finally:
+        session.close()
+
+
+def rebuild_recruitment_stats() -> int:
+    """Recompute every month from the candidates table. Returns the month count."""
+    session = SessionLocal()
+    try:
+        totals: Counter = Counter()
+        query = (
+            session.query(Candidate)
+            .options(load_only(*(getattr(Candidate, col) for col in TRACKED_COLUMNS)))
+            .execution_options(yield_per=1000)
+        )
+        for candidate in query:
+            totals.update(contributions(_current_values(candidate)))
+
+        rows: Dict[str, Dict[str, int]] = {}
+        for (month, metric), count in totals.items():
+            rows.setdefault(month, {m: 0 for m in METRICS})[metric] = count
+
+        now = datetime.now()
+        table = RecruitmentStatsMonthly.__table__
+        session.execute(table.delete())
+        if rows:
+            session.execute(table.insert(), [
+                {"month": month, "updated_at": now, **metrics} for month, metrics in rows.items()
+            ])
+        session.info["recruitment_stats_changed"] = True
+        session.commit()
+        logger.info(f"Rebuilt recruitment_stats_monthly for {len(rows)} months")
+        return len(rows)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+__all__ = ["get_monthly_stats", "rebuild_recruitment_stats", "month_key", "METRICS"]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Maintain recruitment_stats_monthly")
+    parser.add_argument("--rebuild", action="store_true", help="recompute all months from candidates")
+    args = parser.parse_args()
+    if args.rebuild:
+        logging.basicConfig(level=logging.INFO)
+        init_db()
+        print(f"Rebuilt {rebuild_recruitment_stats()} months")
+    else:
+        parser.print_help()
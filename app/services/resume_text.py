@@ -0,0 +1,371 @@
+# app/services/resume_text.py
+"""
+Shared resume text extraction for TalentFlow.
+- Each file is parsed once; the normalized text, page count and extractor used
+  are stored in `resume_texts`, keyed by the SHA-256 of the file bytes.
+- A per-process map of path -> (size, mtime, content hash) avoids re-hashing
+  unchanged files; a modified file hashes differently and is re-extracted.
+- Recently used texts are kept in a small in-memory LRU in front of the table.
+
+PDFs try PyPDF2, then pdfplumber, then PyMuPDF; DOCX tries python-docx (with
+tables), then docx2txt; TXT is read as UTF-8 with a latin-1 fallback.
+
+Parsing runs in a dedicated process pool (true parallelism, isolated from
+request threads). Each document gets a timeout; a worker that overruns it is
+killed and the pool recreated, and workers run under an address-space limit.
+    RESUME_EXTRACT_POOL         0 disables the pool (parse in the calling thread)
+    RESUME_EXTRACT_WORKERS      pool size (default min(4, CPUs))
+    RESUME_EXTRACT_TIMEOUT      seconds per document (default 30)
+    RESUME_EXTRACT_MEMORY_MB    per-worker memory cap (default 1024, 0 = none)
+"""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.models.db import ResumeText, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+MEMORY_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class ExtractedResume:
+    text: str
+    page_count: int
+    extractor: str
+    content_hash: str
+
+
+_lock = threading.Lock()
+_hash_by_path: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_memory: "OrderedDict[str, ExtractedResume]" = OrderedDict()
+
+
+# ---- extraction ----
+def normalize_text(text: str) -> str:
+    text = (text or "").replace("\x00", "").replace("\r\n", "\n").replace("\r", "\n")
+    text = re.sub(r"[ \t]+\n", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def _pdf_pypdf2(path: str) -> Tuple[str, int]:
+    import PyPDF2
+    with open(path, "rb") as fh:
+        reader = PyPDF2.PdfReader(fh)
+        return "\n".join(page.extract_text() or "" for page in reader.pages), len(reader.pages)
+
+
+def _pdf_pdfplumber(path: str) -> Tuple[str, int]:
+    import pdfplumber
+    with pdfplumber.open(path) as pdf:
+        return "\n".join(page.extract_text() or "" for page in pdf.pages), len(pdf.pages)
+
+
+def _pdf_pymupdf(path: str) -> Tuple[str, int]:
+    import fitz  # pymupdf
+    doc = fitz.open(path)
+    try:
+        return "\n".join(page.get_text() for page in doc), doc.page_count
+    finally:
+        doc.close()
+
+
+def _docx_python_docx(path: str) -> Tuple[str, int]:
+    from docx import Document
+    doc = Document(path)
+    parts = [para.text for para in doc.paragraphs if para.text.strip()]
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                if cell.text.strip():
+                    parts.append(cell.text.strip())
+    return "\n".join(parts), 0
+
+
+def _docx_docx2txt(path: str) -> Tuple[str, int]:
+    import docx2txt
+    return docx2txt.process(path) or "", 0
+
+
+def _plain_text(path: str) -> Tuple[str, int]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return fh.read(), 0
+    except UnicodeDecodeError:
+        with open(path, "r", encoding="latin-1") as fh:
+            return fh.read(), 0
+
+
+EXTRACTORS = {
+    ".pdf": (("pypdf2", _pdf_pypdf2), ("pdfplumber", _pdf_pdfplumber), ("pymupdf", _pdf_pymupdf)),
+    ".docx": (("python-docx", _docx_python_docx), ("docx2txt", _docx_docx2txt)),
+    ".doc": (("python-docx", _docx_python_docx),),
+    ".txt": (("text", _plain_text),),
+}
+
+
+def extract_document(path: str) -> Tuple[str, int, str]:
+    """Parse a file with the first extractor that yields text: (text, page_count, extractor)."""
+    chain = EXTRACTORS.get(os.path.splitext(path)[1].lower())
+    if not chain:
+        logger.warning(f"Unsupported resume format: {path}")
+        return "", 0, ""
+    for name, extractor in chain:
+        try:
+            text, pages = extractor(path)
+        except Exception as e:
+            logger.warning(f"{name} failed for {path}: {e}")
+            continue
+        text = normalize_text(text)
+        if text:
+            return text, pages, name
+    return "", 0, ""
+
+
+# ---- process pool ----
+def _env_int(key: str, default: int) -> int:
+    try:
+        return int(os.getenv(key, "") or default)
+    except ValueError:
+        return default
+
+
+def _limit_worker_memory(limit_mb: int) -> None:
+    """Pool initializer: cap the worker's address space so a hostile PDF raises MemoryError."""
+    if limit_mb <= 0:
+        return
+    try:
+        import resource
+        limit = limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        logger.warning(f"Could not set extraction memory limit: {e}")
+
+
+class ExtractionPool:
+    """Process pool for `extract_document` with per-document timeouts."""
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None,
+                 memory_mb: Optional[int] = None):
+        self.workers = workers or _env_int("RESUME_EXTRACT_WORKERS", min(4, os.cpu_count() or 1))
+        self.timeout = timeout or _env_int("RESUME_EXTRACT_TIMEOUT", 30)
+        self.memory_mb = memory_mb if memory_mb is not None else _env_int("RESUME_EXTRACT_MEMORY_MB", 1024)
+        self.enabled = os.getenv("RESUME_EXTRACT_POOL", "1") != "0"
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # fork: workers inherit the loaded extractor code without re-importing the app
+                method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(method),
+                    initializer=_limit_worker_memory,
+                    initargs=(self.memory_mb,),
+                )
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a pool whose worker is stuck; the next submit starts a fresh one."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, path: str) -> Tuple[ProcessPoolExecutor, Future]:
+        executor = self._pool()
+        return executor, executor.submit(extract_document, path)
+
+    def result(self, path: str, submitted: Tuple[ProcessPoolExecutor, Future],
+               deadline: float) -> Tuple[str, int, str]:
+        """Wait for a submitted document; resubmits once if a sibling's timeout killed the pool.
+
+        A reset pool fails its running futures with BrokenProcessPool and cancels
+        the queued ones; both are retried on the fresh pool.
+        """
+        for attempt in range(2):
+            executor, future = submitted
+            try:
+                return future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                logger.error(f"Resume extraction timed out after {self.timeout}s: {path}")
+                self._reset(executor)
+                return "", 0, ""
+            except (BrokenProcessPool, CancelledError):
+                self._reset(executor)
+                if attempt:
+                    break
+                submitted = self.submit(path)
+                deadline = time.monotonic() + self.timeout
+        logger.error(f"Resume extraction worker crashed: {path}")
+        return "", 0, ""
+
+    def extract(self, path: str) -> Tuple[str, int, str]:
+        if not self.enabled:
+            return extract_document(path)
+        try:
+            submitted = self.submit(path)
+        except Exception as e:
+            logger.warning(f"Extraction pool unavailable, parsing in-process: {e}")
+            return extract_document(path)
+        return self.result(path, submitted, time.monotonic() + self.timeout)
+
+    def extract_many(self, paths: Iterable[str]) -> Dict[str, Tuple[str, int, str]]:
+        """Parse several documents in parallel; each gets its own timeout budget."""
+        paths = list(dict.fromkeys(paths))
+        if not self.enabled:
+            return {path: extract_document(path) for path in paths}
+        try:
+            submitted = {path: self.submit(path) for path in paths}
+        except Exception as e:
+            logger.warning(f"Extraction pool unavailable, parsing in-process: {e}")
+            return {path: extract_document(path) for path in paths}
+        # Documents queue behind each other, so budgets are staggered per pool round
+        start = time.monotonic()
+        return {
+            path: self.result(path, future, start + self.timeout * (1 + i // self.workers))
+            for i, (path, future) in enumerate(submitted.items())
+        }
+
+
+extraction_pool = ExtractionPool()
+
+
+# ---- store ----
+def content_hash(path: str) -> str:
+    """SHA-256 of the file bytes, memoized per (path, size, mtime)."""
+    stat = os.stat(path)
+    key, signature = os.path.abspath(path), (stat.st_size, stat.st_mtime_ns)
+    cached = _hash_by_path.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _lock:
+        _hash_by_path[key] = (signature, value)
+    return value
+
+
+def _remember(result: ExtractedResume) -> ExtractedResume:
+    with _lock:
+        _memory[result.content_hash] = result
+        _memory.move_to_end(result.content_hash)
+        while len(_memory) > MEMORY_CACHE_SIZE:
+            _memory.popitem(last=False)
+    return result
+
+
+def _load(digest: str) -> Optional[ExtractedResume]:
+    with _lock:
+        result = _memory.get(digest)
+        if result is not None:
+            _memory.move_to_end(digest)
+            return result
+    try:
+        session = SessionLocal()
+        try:
+            row = session.get(ResumeText, digest)
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning(f"Resume text store read failed: {e}")
+        return None
+    if row is None or not row.text:
+        return None
+    return _remember(ExtractedResume(row.text, row.page_count or 0, row.extractor or "", digest))
+
+
+def _save(result: ExtractedResume) -> None:
+    try:
+        session = SessionLocal()
+        try:
+            if session.get(ResumeText, result.content_hash) is None:
+                session.add(ResumeText(
+                    content_hash=result.content_hash,
+                    text=result.text,
+                    page_count=result.page_count,
+                    extractor=result.extractor,
+                    char_count=len(result.text),
+                ))
+                session.commit()
+        except Exception:
+            session.rollback()  # most likely a concurrent insert of the same hash
+            raise
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning(f"Resume text store write failed: {e}")
+
+
+def get_resume_document(path: str) -> Optional[ExtractedResume]:
+    """Extracted text plus metadata for a resume file, or None if missing/unreadable."""
+    if not path or not os.path.exists(path):
+        logger.error(f"Resume file not found: {path}")
+        return None
+    digest = content_hash(path)
+    result = _load(digest)
+    if result is not None:
+        return result
+
+    return _store_extraction(path, digest, extraction_pool.extract(path))
+
+
+def _store_extraction(path: str, digest: str, extraction: Tuple[str, int, str]) -> Optional[ExtractedResume]:
+    text, pages, extractor = extraction
+    if not text:
+        logger.error(f"Failed to extract any text from {path}")
+        return None
+    logger.info(f"Resume extracted with {extractor}: {len(text)} chars, {pages} pages ({path})")
+    result = _remember(ExtractedResume(text, pages, extractor, digest))
+    _save(result)
+    return result
+
+
+def get_resume_documents(paths: Iterable[str]) -> Dict[str, Optional[ExtractedResume]]:
+    """Bulk variant of `get_resume_document`: stored texts are reused, the rest parsed in parallel."""
+    results: Dict[str, Optional[ExtractedResume]] = {}
+    missing: Dict[str, str] = {}
+    for path in paths:
+        if not path or not os.path.exists(path):
+            results[path] = None
+            continue
+        digest = content_hash(path)
+        results[path] = _load(digest)
+        if results[path] is None:
+            missing[path] = digest
+    if missing:
+        for path, extraction in extraction_pool.extract_many(missing).items():
+            results[path] = _store_extraction(path, missing[path], extraction)
+    return results
+
+
+def get_resume_text(path: str) -> str:
+    """Normalized resume text ("" when the file is missing or unreadable)."""
+    result = get_resume_document(path)
+    return result.text if result else ""
+
+
+__all__ = [
+    "ExtractedResume", "ExtractionPool", "extraction_pool", "extract_document", "normalize_text",
+    "content_hash", "get_resume_document", "get_resume_documents", "get_resume_text",
+]
@@ -0,0 +1,319 @@
+# app/services/scheduler.py
+"""
+Single background scheduler for the app's periodic jobs.
+- Jobs are registered by name with an interval; one scheduler thread per process
+  dispatches due jobs to a small thread pool.
+- Leader election per job through a `scheduler_leases` row: a run first claims
+  the lease with a conditional UPDATE, so with several gunicorn workers only the
+  lease holder runs the job. The holder renews the lease on every run and, while
+  a run is in progress, from a heartbeat; if it dies another worker takes over
+  once the lease expires.
+- Overlap protection: a job is never started while its previous run is still
+  going (in this process), and the lease covers the run across processes.
+- Jitter spreads runs so jobs with equal intervals do not fire together.
+- Run count, failures and durations are kept in memory (status()) and in the
+  lease row (last run only).
+
+Configuration (environment):
+    SCHEDULER_ENABLED   1 (default) / 0 to run no background jobs in this process
+    SCHEDULER_WORKERS   threads running jobs (default 4)
+
+Inspect the shared lease rows:
+    python -m app.services.scheduler --status
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app.models.db import SchedulerLease, SessionLocal, ensure_tables
+
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = 1.0
+HEARTBEAT_FRACTION = 1 / 3  # renew a running job's lease after this share of it
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[[], Any]
+    interval: float
+    jitter: float = 0.1               # +/- fraction of the interval
+    lease_seconds: Optional[float] = None
+    leader_only: bool = True
+    next_run: float = 0.0
+    running: bool = False
+    stats: Dict[str, Any] = field(default_factory=lambda: {
+        "runs": 0, "failures": 0, "skipped_not_leader": 0, "skipped_overlap": 0,
+        "last_started_at": None, "last_duration": None, "max_duration": 0.0, "total_duration": 0.0,
+        "last_error": None,
+    })
+
+    @property
+    def lease(self) -> timedelta:
+        seconds = self.lease_seconds or self.interval + max(60.0, self.interval / 2)
+        return timedelta(seconds=seconds)
+
+    def schedule_next(self, now: float) -> None:
+        spread = self.interval * self.jitter
+        self.next_run = now + self.interval + random.uniform(-spread, spread)
+
+
+class Scheduler:
+    """Registry of periodic jobs plus the dispatcher thread that runs them."""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.workers = workers or int(os.getenv("SCHEDULER_WORKERS", "4") or 4)
+        self.enabled = os.getenv("SCHEDULER_ENABLED", "1") != "0"
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.app = None
+
+    def init_app(self, app) -> None:
+        """Run jobs inside this Flask app's context (cache, config)."""
+        self.app = app
+
+    # ---- registration ----
+    def register(self, name: str, func: Callable[[], Any], interval: float, *, jitter: float = 0.1,
+                 first_run: Optional[float] = None, lease_seconds: Optional[float] = None,
+                 leader_only: bool = True) -> ScheduledJob:
+        """Add or replace a job. The first run happens after `first_run` seconds (default: one interval)."""
+        with self._lock:
+            job = self._jobs.get(name)
+            if job is None:
+                job = self._jobs[name] = ScheduledJob(name=name, func=func, interval=interval)
+            # Re-registering keeps the run state and stats of the existing job
+            job.func, job.interval, job.jitter = func, interval, jitter
+            job.lease_seconds, job.leader_only = lease_seconds, leader_only
+            now = time.monotonic()
+            if first_run is None:
+                job.schedule_next(now)
+            else:
+                job.next_run = now + first_run + random.uniform(0, interval * jitter)
+        logger.info(f"Scheduler: registered {name} every {interval:g}s")
+        return job
+
+    def unregister(self, name: str) -> None:
+        """Stop scheduling a job (a run in progress finishes normally)."""
+        with self._lock:
+            self._jobs.pop(name, None)
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._jobs
+
+    # ---- lifecycle ----
+    def start(self) -> None:
+        if not self.enabled:
+            logger.info("Scheduler disabled (SCHEDULER_ENABLED=0)")
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scheduler-job")
+            self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+            self._thread.start()
+        logger.info(f"Scheduler started ({self.owner})")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def run_now(self, name: str) -> None:
+        """Make a registered job due immediately."""
+        job = self._jobs.get(name)
+        if job is not None:
+            job.next_run = 0.0
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {
+            job.name: {
+                "interval": job.interval,
+                "running": job.running,
+                "next_run_in": max(0.0, round(job.next_run - time.monotonic(), 1)),
+                **job.stats,
+                "avg_duration": (job.stats["total_duration"] / job.stats["runs"]) if job.stats["runs"] else None,
+            }
+            for job in jobs
+        }
+
+    # ---- dispatch ----
+    def _loop(self) -> None:
+        while not self._stop.wait(TICK_SECONDS):
+            now = time.monotonic()
+            with self._lock:
+                due = [job for job in self._jobs.values() if job.next_run <= now]
+            for job in due:
+                job.schedule_next(now)
+                if job.running:
+                    job.stats["skipped_overlap"] += 1
+                    logger.debug(f"Scheduler: {job.name} still running, skipping this slot")
+                    continue
+                job.running = True
+                try:
+                    self._pool.submit(self._execute, job)
+                except RuntimeError:
+                    job.running = False  # pool shut down
+
+    def _execute(self, job: ScheduledJob) -> None:
+        try:
+            if job.leader_only and not self._claim(job):
+                job.stats["skipped_not_leader"] += 1
+                return
+            started_at = datetime.now()
+            start = time.monotonic()
+            error = None
+            finished = threading.Event()
+            if job.leader_only:
+                threading.Thread(target=self._heartbeat, args=(job, finished),
+                                 name=f"scheduler-heartbeat-{job.name}", daemon=True).start()
+            try:
+                if self.app is not None:
+                    with self.app.app_context():
+                        job.func()
+                else:
+                    job.func()
+            except Exception as e:
+                error = e
+                job.stats["failures"] += 1
+                job.stats["last_error"] = str(e)
+                logger.error(f"Scheduler: job {job.name} failed: {e}", exc_info=True)
+            finally:
+                finished.set()
+            duration = time.monotonic() - start
+            job.stats["runs"] += 1
+            job.stats["last_started_at"] = started_at.isoformat()
+            job.stats["last_duration"] = round(duration, 3)
+            job.stats["total_duration"] += duration
+            job.stats["max_duration"] = max(job.stats["max_duration"], duration)
+            logger.debug(f"Scheduler: {job.name} finished in {duration:.2f}s")
+            if job.leader_only:
+                self._record(job, started_at, duration, error)
+        finally:
+            job.running = False
+
+    # ---- leases ----
+    def _claim(self, job: ScheduledJob) -> bool:
+        """Claim or renew the job's lease; False if another live worker holds it."""
+        now = datetime.now()
+        try:
+            session = SessionLocal()
+            try:
+                if session.get(SchedulerLease, job.name) is None:
+                    try:
+                        session.add(SchedulerLease(job_name=job.name, run_count=0, failure_count=0))
+                        session.commit()
+                    except IntegrityError:
+                        session.rollback()  # another worker created the row first
+                table = SchedulerLease.__table__
+                claimed = session.execute(
+                    update(table)
+                    .where(table.c.job_name == job.name)
+                    .where(or_(table.c.owner == self.owner, table.c.lease_until.is_(None),
+                               table.c.lease_until < now))
+                    .values(owner=self.owner, lease_until=now + job.lease, last_started_at=now)
+                ).rowcount
+                session.commit()
+                return bool(claimed)
+            finally:
+                session.close()
+        except Exception as e:
+            # Without the shared table every worker runs the job, as before
+            logger.warning(f"Scheduler lease unavailable for {job.name}: {e}")
+            return True
+
+    def _heartbeat(self, job: ScheduledJob, finished: threading.Event) -> None:
+        """Keep the lease of a run in progress from expiring under it."""
+        interval = job.lease.total_seconds() * HEARTBEAT_FRACTION
+        while not finished.wait(interval):
+            try:
+                session = SessionLocal()
+                try:
+                    table = SchedulerLease.__table__
+                    session.execute(
+                        update(table)
+                        .where(table.c.job_name == job.name)
+                        .where(table.c.owner == self.owner)
+                        .values(lease_until=datetime.now() + job.lease)
+                    )
+                    session.commit()
+                finally:
+                    session.close()
+            except Exception as e:
+                logger.warning(f"Could not renew scheduler lease for {job.name}: {e}")
+
+    def _record(self, job: ScheduledJob, started_at: datetime, duration: float, error: Optional[Exception]) -> None:
+        try:
+            finished_at = datetime.now()
+            session = SessionLocal()
+            try:
+                table = SchedulerLease.__table__
+                values = dict(
+                    lease_until=finished_at + job.lease,
+                    last_finished_at=finished_at,
+                    last_duration_ms=int(duration * 1000),
+                    last_status="error" if error else "ok",
+                    last_error=str(error) if error else None,
+                    run_count=table.c.run_count + 1,
+                )
+                if error:
+                    values["failure_count"] = table.c.failure_count + 1
+                session.execute(
+                    update(table)
+                    .where(table.c.job_name == job.name)
+                    .where(table.c.owner == self.owner)
+                    .values(**values)
+                )
+                session.commit()
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"Could not record scheduler run for {job.name}: {e}")
+
+
+# Process-wide scheduler shared by all background jobs
+scheduler = Scheduler()
+
+__all__ = ["ScheduledJob", "Scheduler", "scheduler"]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Background job scheduler")
+    parser.add_argument("--status", action="store_true", help="print the shared lease rows")
+    args = parser.parse_args()
+    if args.status:
+        session = SessionLocal()
+        try:
+            ensure_tables(SchedulerLease)
+            for row in session.query(SchedulerLease).order_by(SchedulerLease.job_name):
+                print(f"{row.job_name:40} owner={row.owner} lease_until={row.lease_until} "
+                      f"last={row.last_status} {row.last_duration_ms}ms runs={row.run_count} "
+                      f"failures={row.failure_count}")
+        finally:
+            session.close()
+    else:
+        parser.print_help()
@@ -0,0 +1,142 @@
+# app/services/scrape_sync.py
+"""
+Per-job sync state for the BambooHR resume scraper.
+- One `applicant_sync_state` row per (job, applicant) records the downloaded
+  resume (path, URL, sha256) and the ETag/Last-Modified validators BambooHR
+  returned for it.
+- A repeat scrape downloads only applicants without a stored resume (or whose
+  file is gone); known ones are revalidated with a conditional GET and
+  re-stored only when the bytes actually changed.
+- The screening pipeline moves resumes to processed_resumes; record_moved()
+  follows the file so the applicant stays known.
+- high_water_mark() is the highest applicant ID seen for a job, used to report
+  how many applicants are new since the last run.
+"""
+
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, update
+
+from app.models.db import ApplicantSyncState, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def bytes_sha256(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _row_to_dict(row: ApplicantSyncState) -> Dict[str, Any]:
+    return {
+        "applicant_id": row.applicant_id,
+        "name": row.name,
+        "resume_path": row.resume_path,
+        "resume_url": row.resume_url,
+        "content_hash": row.content_hash,
+        "etag": row.etag,
+        "last_modified": row.last_modified,
+        "size": row.size,
+        "last_synced_at": row.last_synced_at,
+    }
+
+
+def load_job_state(job_id: str) -> Dict[str, Dict[str, Any]]:
+    """Applicant ID -> stored sync state for one job. Empty on any DB error."""
+    try:
+        session = SessionLocal()
+        try:
+            rows = session.execute(
+                select(ApplicantSyncState).where(ApplicantSyncState.job_id == str(job_id))
+            ).scalars()
+            return {row.applicant_id: _row_to_dict(row) for row in rows}
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning(f"Could not load sync state for job {job_id}: {e}")
+        return {}
+
+
+def high_water_mark(state: Dict[str, Dict[str, Any]]) -> Optional[int]:
+    ids = [int(applicant_id) for applicant_id in state if str(applicant_id).isdigit()]
+    return max(ids) if ids else None
+
+
+def has_resume(entry: Optional[Dict[str, Any]]) -> bool:
+    """True when the stored resume for an applicant is still on disk."""
+    return bool(entry and entry.get("resume_path") and Path(entry["resume_path"]).exists())
+
+
+def record_resume(job_id: str, candidate: Dict[str, str], path, *, content: Optional[bytes] = None,
+                  url: Optional[str] = None, etag: Optional[str] = None,
+                  last_modified: Optional[str] = None) -> None:
+    """Store the resume just saved for an applicant. Never raises."""
+    try:
+        if content is None:
+            content = Path(path).read_bytes()
+        now = datetime.now()
+        session = SessionLocal()
+        try:
+            row = session.get(ApplicantSyncState, (str(job_id), str(candidate["id"])))
+            if row is None:
+                row = ApplicantSyncState(job_id=str(job_id), applicant_id=str(candidate["id"]), first_seen_at=now)
+                session.add(row)
+            row.name = candidate.get("name")
+            row.resume_path = str(path)
+            row.resume_url = url or row.resume_url
+            row.content_hash = bytes_sha256(content)
+            row.etag = etag
+            row.last_modified = last_modified
+            row.size = len(content)
+            row.last_synced_at = now
+            row.last_checked_at = now
+            session.commit()
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning(f"Could not record sync state for applicant {candidate.get('id')}: {e}")
+
+
+def mark_checked(job_id: str, applicant_id: str, *, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None) -> None:
+    """Note a revalidation that found the resume unchanged. Never raises."""
+    try:
+        session = SessionLocal()
+        try:
+            row = session.get(ApplicantSyncState, (str(job_id), str(applicant_id)))
+            if row is not None:
+                row.etag = etag or row.etag
+                row.last_modified = last_modified or row.last_modified
+                row.last_checked_at = datetime.now()
+                session.commit()
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning(f"Could not update sync state for applicant {applicant_id}: {e}")
+
+
+def record_moved(old_path, new_path) -> None:
+    """Point sync rows at a resume's new location after it was moved. Never raises."""
+    try:
+        old_paths = {str(old_path), str(Path(old_path).resolve())}
+        session = SessionLocal()
+        try:
+            session.execute(
+                update(ApplicantSyncState)
+                .where(ApplicantSyncState.resume_path.in_(old_paths))
+                .values(resume_path=str(new_path))
+            )
+            session.commit()
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning(f"Could not update sync state for moved resume {old_path}: {e}")
+
+
+__all__ = [
+    "bytes_sha256", "load_job_state", "high_water_mark", "has_resume",
+    "record_resume", "mark_checked", "record_moved",
+]
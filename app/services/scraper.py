@@ -12,6 +12,8 @@ from datetime import datetime
 import sys
 import httpx
 from app.config_paths import RESUME_DIR
+from app.services import scrape_sync
+from app.services.browser_pool import BrowserLoginError, VendorProfile, async_browser_pool
 
 
 print("🚀 BambooHR Resume Scraper starting...")
@@ -22,7 +24,10 @@ CONFIG = {
     'RETRY_DELAY': 1.0,    # 1 second between retries
     'MAX_RETRIES': 3,      # Retry navigation up to 3 times
     'MIN_PDF_SIZE': 1000,
-    'HEADLESS': False,     # Set to True for production
+    'CONTENT_TIMEOUT': 5000,  # max wait for candidate page content / network idle
+    'DOWNLOAD_CONCURRENCY': int(os.getenv("BAMBOOHR_DOWNLOAD_CONCURRENCY", "4") or 4),
+    'FULL_RESYNC': os.getenv("BAMBOOHR_FULL_RESYNC", "0") == "1",  # ignore stored sync state
+    'HEADLESS': os.getenv("BROWSER_HEADLESS", "1") != "0",  # BROWSER_HEADLESS=0 for a visible browser
     'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 }
 
@@ -636,6 +641,102 @@ async def get_candidates_for_job(page: Page, job_id: str) -> List[Dict[str, str]
         await page.screenshot(path=f"job_{job_id}_error.png")
         return []
 
+# Anything that shows the candidate page has rendered its documents area
+CANDIDATE_CONTENT_SELECTOR = ", ".join([
+    "a[href*='/files/download']", "a[href*='download.php']", "a[href*='resume']", "a[href*='.pdf']",
+    "[class*='attachment']", "a[role='tab']", "button[role='tab']", "iframe",
+])
+
+async def download_resumes(context: BrowserContext, candidates: List[Dict[str, str]], job_id: str,
+                           concurrency: Optional[int] = None) -> List[Dict[str, str]]:
+    """Download resumes on several pages of the same authenticated context.
+
+    Returns the candidates whose download failed.
+    """
+    concurrency = max(1, min(concurrency or CONFIG['DOWNLOAD_CONCURRENCY'], len(candidates) or 1))
+    work: asyncio.Queue = asyncio.Queue()
+    for i, candidate in enumerate(candidates, 1):
+        work.put_nowait((i, candidate))
+    failed: List[Dict[str, str]] = []
+
+    async def worker():
+        page = await context.new_page()
+        try:
+            while True:
+                try:
+                    i, candidate = work.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                logger.info(f"\n[{i}/{len(candidates)}] Processing {candidate['name']}")
+                if not await download_resume(context, page, candidate, job_id, is_first=(i == 1)):
+                    failed.append(candidate)
+        finally:
+            await page.close()
+
+    logger.info(f"📥 Downloading with {concurrency} parallel pages")
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return failed
+
+async def revalidate_resumes(context: BrowserContext, candidates: List[Dict[str, str]], job_id: str) -> List[Dict[str, str]]:
+    """Skip applicants whose stored resume is unchanged; return those that need the full page download.
+
+    Known applicants with validators get a conditional GET on the stored resume URL;
+    a 304 (or identical bytes) leaves them alone, changed bytes are saved as a new file.
+    Known applicants without validators are kept as-is.
+    """
+    state = scrape_sync.load_job_state(job_id)
+    mark = scrape_sync.high_water_mark(state)
+    pending = [c for c in candidates if not scrape_sync.has_resume(state.get(c['id']))]
+    known = [c for c in candidates if scrape_sync.has_resume(state.get(c['id']))]
+    new_since_mark = sum(1 for c in pending if mark is None or (c['id'].isdigit() and int(c['id']) > mark))
+    logger.info(f"🔁 Sync state: {len(known)} known applicants, {len(pending)} to download "
+                f"({new_since_mark} new since applicant {mark})")
+
+    semaphore = asyncio.Semaphore(CONFIG['DOWNLOAD_CONCURRENCY'])
+    changed = 0
+
+    async def revalidate(candidate):
+        nonlocal changed
+        entry = state[candidate['id']]
+        if not entry.get("resume_url") or not (entry.get("etag") or entry.get("last_modified")):
+            return
+        headers = {"User-Agent": CONFIG['USER_AGENT'], "Accept": "application/pdf,application/octet-stream,*/*"}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        async with semaphore:
+            try:
+                response = await context.request.get(entry["resume_url"], headers=headers, timeout=CONFIG['TIMEOUT'])
+            except Exception as e:
+                logger.debug(f"   Revalidation failed for {candidate['name']}: {e}")
+                pending.append(candidate)
+                return
+            etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+            if response.status == 304:
+                scrape_sync.mark_checked(job_id, candidate['id'], etag=etag, last_modified=last_modified)
+                return
+            if not response.ok:
+                pending.append(candidate)
+                return
+            content = await response.body()
+            if scrape_sync.bytes_sha256(content) == entry.get("content_hash"):
+                scrape_sync.mark_checked(job_id, candidate['id'], etag=etag, last_modified=last_modified)
+                return
+            safe_name = sanitize_filename(candidate["name"])
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = Path(DOWNLOAD_DIR) / f"job_{job_id}_{candidate['id']}_{safe_name}_{timestamp}.pdf"
+            output_path.write_bytes(content)
+            scrape_sync.record_resume(job_id, candidate, output_path, content=content,
+                                      url=entry["resume_url"], etag=etag, last_modified=last_modified)
+            changed += 1
+            logger.info(f"   ♻️  Resume changed for {candidate['name']}, saved {output_path.name}")
+
+    await asyncio.gather(*(revalidate(c) for c in known))
+    if changed:
+        logger.info(f"♻️  {changed} known applicants had an updated resume")
+    return pending
+
 async def download_resume(context: BrowserContext, page: Page, candidate: Dict[str, str], job_id: str, is_first: bool = False) -> bool:
     """Download resume PDF for a specific candidate."""
     try:
@@ -646,11 +747,13 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
             logger.error(f"Failed to navigate to candidate page")
             return False
             
-        await page.wait_for_timeout(2000)  # Give more time for page to load
-        
-        # Wait for any dynamic content
+        # Wait for the attachments/tabs to render instead of sleeping a fixed time
+        try:
+            await page.wait_for_selector(CANDIDATE_CONTENT_SELECTOR, state="attached", timeout=CONFIG['CONTENT_TIMEOUT'])
+        except:
+            pass
         try:
-            await page.wait_for_load_state("networkidle", timeout=3000)
+            await page.wait_for_load_state("networkidle", timeout=CONFIG['CONTENT_TIMEOUT'])
         except:
             pass
         
@@ -676,7 +779,11 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
                     logger.debug(f"      Found tab: {tab_selector}")
                     await page.click(tab_selector)
                     tab_clicked = True
-                    await page.wait_for_timeout(1000)  # Wait for tab content to load
+                    try:
+                        # Wait for tab content to load
+                        await page.wait_for_load_state("networkidle", timeout=CONFIG['CONTENT_TIMEOUT'])
+                    except:
+                        pass
                     break
             except:
                 continue
@@ -852,6 +959,7 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
                             output_path = Path(DOWNLOAD_DIR) / filename
                             
                             await download.save_as(output_path)
+                            scrape_sync.record_resume(job_id, candidate, output_path)
                             logger.info(f"      ✅ Downloaded via click: {filename}")
                             return True
                             
@@ -989,6 +1097,7 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
                 output_path = Path(DOWNLOAD_DIR) / filename
                 
                 await download.save_as(output_path)
+                scrape_sync.record_resume(job_id, candidate, output_path, url=pdf_url)
                 logger.info(f"      ✅ Downloaded via navigation: {filename}")
                 return True
                 
@@ -1015,6 +1124,10 @@ async def download_resume(context: BrowserContext, page: Page, candidate: Dict[s
         # Write file
         with open(output_path, "wb") as f:
             f.write(content)
+        scrape_sync.record_resume(
+            job_id, candidate, output_path, content=content, url=pdf_url,
+            etag=response.headers.get("etag"), last_modified=response.headers.get("last-modified"),
+        )
         
         logger.info(f"      ✅ Saved {filename} ({len(content):,} bytes)")
         return True
@@ -1052,194 +1165,176 @@ async def save_candidate_metadata(candidates: List[Dict], job_id: str):
     except Exception as e:
         logger.error(f"Error saving metadata: {e}")
 
-async def scrape_job(job_id: str, use_manual_login: bool = False):
-    """Main function to scrape resumes for a specific job."""
-    if not validate_job_id(job_id):
-        logger.error("❌ Invalid job ID")
-        return
-    
-    Path(DOWNLOAD_DIR).mkdir(parents=True, exist_ok=True)
-    
-    logger.info(f"🚀 Starting scrape for job ID: {job_id}")
-    logger.info(f"📁 Download directory: {DOWNLOAD_DIR}")
-    logger.info(f"🐛 Debug mode: {'ON' if DEBUG_MODE else 'OFF'}")
-    
+async def bamboohr_login(page: Page) -> bool:
+    """Pool login hook: automatic login, trust-device page, then let the session settle."""
+    if not await auto_login(page, BAMBOOHR_DOMAIN):
+        return False
+    current_url = page.url.lower()
+    if "trusted_browser" in current_url or "trust" in current_url:
+        await handle_trust_device(page)
+    logger.info("→ Waiting for session to stabilize...")
+    await page.wait_for_timeout(3000)  # Give the session time to fully establish
+    return True
+
+
+async_browser_pool.register(VendorProfile(
+    name="bamboohr",
+    login=bamboohr_login,
+    launch_args=['--no-sandbox', '--disable-setuid-sandbox'],
+    context_options={
+        'user_agent': CONFIG['USER_AGENT'],
+        'viewport': {'width': 1920, 'height': 1080},
+        'accept_downloads': True,
+    },
+    headless=CONFIG['HEADLESS'],
+    max_pages=1,
+))
+
+
+async def _scrape_with_page(page: Page, job_id: str, full_sync: bool = False):
+    """Scrape one job on an authenticated page (pooled or manual-login browser)."""
+    context = page.context
+    try:
+        # Try to go to home page first (helps establish session)
+        logger.info("→ Navigating to home page first...")
+        if await safe_goto(page, f"{BAMBOOHR_DOMAIN}/home", "domcontentloaded"):
+            await page.wait_for_timeout(1000)
+        
+        # Now navigate to hiring section
+        logger.info("→ Navigating to hiring section...")
+        if not await safe_goto(page, f"{BAMBOOHR_DOMAIN}/hiring", "domcontentloaded"):
+            logger.error("Failed to navigate to hiring section")
+            # Try direct navigation to job page as fallback
+            logger.info("→ Trying direct navigation to job page...")
+        
+        # Get candidates
+        candidates = await get_candidates_for_job(page, job_id)
+        
+        if not candidates:
+            logger.warning("⚠️ No candidates found for this job ID")
+            logger.info(f"Final URL: {page.url}")
+            logger.info("Check the screenshot 'job_XX_no_candidates.png' to see what page was loaded")
+            
+            # Offer manual inspection
+            if not CONFIG['HEADLESS']:
+                manual_check = input("\n🔍 Would you like to manually inspect the page? (y/n): ").lower()
+                if manual_check == 'y':
+                    logger.info("→ Browser is open. Please check if you can see candidates on the page.")
+                    logger.info("   - Try clicking on any tabs or filters")
+                    logger.info("   - Look for 'Candidates', 'Applications', or 'Active' tabs")
+                    input("   👉 Press ENTER when ready to continue (or Ctrl+C to exit): ")
+                    
+                    # Try searching for candidates again
+                    logger.info("→ Retrying candidate search...")
+                    candidates = await get_candidates_for_job(page, job_id)
+                    
+                    if candidates:
+                        logger.info(f"✅ Found {len(candidates)} candidates after manual intervention!")
+                    else:
+                        logger.info("Still no candidates found. The job might have no applicants.")
+            
+            if not candidates:
+                return
+        
+        # Save metadata
+        await save_candidate_metadata(candidates, job_id)
+        
+        # Only new applicants (or ones whose stored resume is gone/changed) need the page flow
+        if full_sync or CONFIG['FULL_RESYNC']:
+            pending = candidates
+        else:
+            pending = await revalidate_resumes(context, candidates, job_id)
+        
+        # Download resumes
+        logger.info(f"📥 Starting download of {len(pending)} resumes...")
+        failed_downloads = await download_resumes(context, pending, job_id) if pending else []
+        successful_downloads = len(pending) - len(failed_downloads)
+        
+        # Summary
+        logger.info("\n" + "="*50)
+        logger.info("📊 SCRAPING SUMMARY")
+        logger.info("="*50)
+        logger.info(f"Job ID: {job_id}")
+        logger.info(f"Total candidates: {len(candidates)}")
+        logger.info(f"⏭️  Unchanged (skipped): {len(candidates) - len(pending)}")
+        logger.info(f"✅ Successful downloads: {successful_downloads}")
+        logger.info(f"❌ Failed downloads: {len(failed_downloads)}")
+        
+        if failed_downloads:
+            logger.warning("\nFailed downloads:")
+            for candidate in failed_downloads[:10]:  # Show first 10
+                logger.warning(f"   - {candidate['name']} (ID: {candidate['id']})")
+            if len(failed_downloads) > 10:
+                logger.warning(f"   ... and {len(failed_downloads) - 10} more")
+            
+            # If all downloads failed, offer manual inspection
+            if successful_downloads == 0 and not CONFIG['HEADLESS']:
+                logger.info("\n⚠️  All downloads failed. This might be a selector issue.")
+                inspect = input("\n🔍 Would you like to manually inspect a candidate page? (y/n): ").lower()
+                if inspect == 'y':
+                    # Navigate to first candidate
+                    first_candidate = candidates[0]
+                    logger.info(f"→ Navigating to {first_candidate['name']}'s page...")
+                    await page.goto(first_candidate['url'])
+                    
+                    logger.info("\n📋 Please check the page for:")
+                    logger.info("   - Any 'Download', 'Resume', 'View', or 'PDF' links/buttons")
+                    logger.info("   - File attachments section")
+                    logger.info("   - Document tabs or sections")
+                    logger.info("   - Right-click on any resume link and check the URL")
+                    
+                    input("\n👉 Press ENTER when you've identified how to download resumes: ")
+                    
+                    # Ask for selector hint
+                    hint = input("\n💡 If you found a pattern, describe it (or press ENTER to skip): ").strip()
+                    if hint:
+                        logger.info(f"User hint: {hint}")
+                        logger.info("Please update the download_selectors in the script with this information.")
+        
+        logger.info(f"\n📁 Files saved to: {DOWNLOAD_DIR}")
+        
+        # If in debug mode and downloads failed, remind about HTML files
+        if DEBUG_MODE and failed_downloads:
+            logger.info("\n🐛 Debug files created:")
+            logger.info(f"   - candidate_{candidates[0]['id']}_page.html (first candidate's page)")
+            logger.info("   - job_XX_no_candidates.png (if no candidates found)")
+            logger.info("   - candidate_XX_no_resume.png (for failed downloads)")
+            logger.info("\nAnalyze these files to identify the correct selectors.")
+        
+    except Exception as e:
+        logger.error(f"Fatal error during scraping: {e}")
+        # Take a screenshot for debugging
+        try:
+            await page.screenshot(path=f"job_{job_id}_fatal_error.png", full_page=True)
+            logger.info(f"Screenshot saved: job_{job_id}_fatal_error.png")
+        except:
+            pass
+        raise
+
+
+async def _manual_login_scrape(job_id: str, full_sync: bool = False):
+    """Interactive fallback: standalone headed browser, login completed by hand."""
     async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=False,
+            args=['--no-sandbox', '--disable-setuid-sandbox']
+        )
         try:
-            # Launch browser
-            browser = await playwright.chromium.launch(
-                headless=CONFIG['HEADLESS'],
-                args=['--no-sandbox', '--disable-setuid-sandbox']
-            )
-            
-            # Create context
             context = await browser.new_context(
                 user_agent=CONFIG['USER_AGENT'],
                 viewport={'width': 1920, 'height': 1080},
                 accept_downloads=True
             )
-            
             page = await context.new_page()
-            
-            # Enable console logging for debugging
             page.on("console", lambda msg: logger.debug(f"Browser console: {msg.text}"))
-            
-            # Login (automatic or manual)
-            if use_manual_login:
-                logger.info("🔐 Manual login mode")
-                login_url = f"{BAMBOOHR_DOMAIN}/login.php"
-                await page.goto(login_url, wait_until="domcontentloaded")
-                logger.info("→ Please complete login and 2FA in the browser...")
-                input("   👉 Press ENTER after login completion: ")
-                login_success = True
-            else:
-                # Automatic login
-                login_success = await auto_login(page, BAMBOOHR_DOMAIN)
-                
-            if not login_success:
-                logger.error("❌ Login failed")
-                # Offer manual login as fallback
-                retry = input("\n🔄 Would you like to try manual login? (y/n): ").lower()
-                if retry == 'y':
-                    logger.info("🔐 Switching to manual login...")
-                    login_url = f"{BAMBOOHR_DOMAIN}/login.php"
-                    await page.goto(login_url, wait_until="domcontentloaded")
-                    logger.info("→ Please complete login and 2FA in the browser...")
-                    input("   👉 Press ENTER after login completion: ")
-                    login_success = True
-                else:
-                    return
-            
-            # Handle trust device page if needed
-            current_url = page.url.lower()
-            if "trusted_browser" in current_url or "trust" in current_url:
-                await handle_trust_device(page)
-            
-            # IMPORTANT: Wait after login/trust handling before navigation
-            logger.info("→ Waiting for session to stabilize...")
-            await page.wait_for_timeout(3000)  # Give the session time to fully establish
-            
-            # Try to go to home page first (helps establish session)
-            logger.info("→ Navigating to home page first...")
-            if await safe_goto(page, f"{BAMBOOHR_DOMAIN}/home", "domcontentloaded"):
-                await page.wait_for_timeout(1000)
-            
-            # Now navigate to hiring section
-            logger.info("→ Navigating to hiring section...")
-            if not await safe_goto(page, f"{BAMBOOHR_DOMAIN}/hiring", "domcontentloaded"):
-                logger.error("Failed to navigate to hiring section")
-                # Try direct navigation to job page as fallback
-                logger.info("→ Trying direct navigation to job page...")
-            
-            # Get candidates
-            candidates = await get_candidates_for_job(page, job_id)
-            
-            if not candidates:
-                logger.warning("⚠️ No candidates found for this job ID")
-                logger.info(f"Final URL: {page.url}")
-                logger.info("Check the screenshot 'job_XX_no_candidates.png' to see what page was loaded")
-                
-                # Offer manual inspection
-                if not CONFIG['HEADLESS']:
-                    manual_check = input("\n🔍 Would you like to manually inspect the page? (y/n): ").lower()
-                    if manual_check == 'y':
-                        logger.info("→ Browser is open. Please check if you can see candidates on the page.")
-                        logger.info("   - Try clicking on any tabs or filters")
-                        logger.info("   - Look for 'Candidates', 'Applications', or 'Active' tabs")
-                        input("   👉 Press ENTER when ready to continue (or Ctrl+C to exit): ")
-                        
-                        # Try searching for candidates again
-                        logger.info("→ Retrying candidate search...")
-                        candidates = await get_candidates_for_job(page, job_id)
-                        
-                        if candidates:
-                            logger.info(f"✅ Found {len(candidates)} candidates after manual intervention!")
-                        else:
-                            logger.info("Still no candidates found. The job might have no applicants.")
-                
-                if not candidates:
-                    return
-            
-            # Save metadata
-            await save_candidate_metadata(candidates, job_id)
-            
-            # Download resumes
-            logger.info(f"📥 Starting download of {len(candidates)} resumes...")
-            successful_downloads = 0
-            failed_downloads = []
-            
-            for i, candidate in enumerate(candidates, 1):
-                logger.info(f"\n[{i}/{len(candidates)}] Processing {candidate['name']}")
-                
-                success = await download_resume(context, page, candidate, job_id, is_first=(i==1))
-                if success:
-                    successful_downloads += 1
-                else:
-                    failed_downloads.append(candidate)
-                
-                # Small delay between downloads
-                if i < len(candidates):
-                    await page.wait_for_timeout(int(CONFIG['RETRY_DELAY'] * 1000))
-            
-            # Summary
-            logger.info("\n" + "="*50)
-            logger.info("📊 SCRAPING SUMMARY")
-            logger.info("="*50)
-            logger.info(f"Job ID: {job_id}")
-            logger.info(f"Total candidates: {len(candidates)}")
-            logger.info(f"✅ Successful downloads: {successful_downloads}")
-            logger.info(f"❌ Failed downloads: {len(failed_downloads)}")
-            
-            if failed_downloads:
-                logger.warning("\nFailed downloads:")
-                for candidate in failed_downloads[:10]:  # Show first 10
-                    logger.warning(f"   - {candidate['name']} (ID: {candidate['id']})")
-                if len(failed_downloads) > 10:
-                    logger.warning(f"   ... and {len(failed_downloads) - 10} more")
-                
-                # If all downloads failed, offer manual inspection
-                if successful_downloads == 0 and not CONFIG['HEADLESS']:
-                    logger.info("\n⚠️  All downloads failed. This might be a selector issue.")
-                    inspect = input("\n🔍 Would you like to manually inspect a candidate page? (y/n): ").lower()
-                    if inspect == 'y':
-                        # Navigate to first candidate
-                        first_candidate = candidates[0]
-                        logger.info(f"→ Navigating to {first_candidate['name']}'s page...")
-                        await page.goto(first_candidate['url'])
-                        
-                        logger.info("\n📋 Please check the page for:")
-                        logger.info("   - Any 'Download', 'Resume', 'View', or 'PDF' links/buttons")
-                        logger.info("   - File attachments section")
-                        logger.info("   - Document tabs or sections")
-                        logger.info("   - Right-click on any resume link and check the URL")
-                        
-                        input("\n👉 Press ENTER when you've identified how to download resumes: ")
-                        
-                        # Ask for selector hint
-                        hint = input("\n💡 If you found a pattern, describe it (or press ENTER to skip): ").strip()
-                        if hint:
-                            logger.info(f"User hint: {hint}")
-                            logger.info("Please update the download_selectors in the script with this information.")
-            
-            logger.info(f"\n📁 Files saved to: {DOWNLOAD_DIR}")
-            
-            # If in debug mode and downloads failed, remind about HTML files
-            if DEBUG_MODE and failed_downloads:
-                logger.info("\n🐛 Debug files created:")
-                logger.info(f"   - candidate_{candidates[0]['id']}_page.html (first candidate's page)")
-                logger.info("   - job_XX_no_candidates.png (if no candidates found)")
-                logger.info("   - candidate_XX_no_resume.png (for failed downloads)")
-                logger.info("\nAnalyze these files to identify the correct selectors.")
-            
-        except Exception as e:
-            logger.error(f"Fatal error during scraping: {e}")
-            # Take a screenshot for debugging
-            try:
-                await page.screenshot(path=f"job_{job_id}_fatal_error.png", full_page=True)
-                logger.info(f"Screenshot saved: job_{job_id}_fatal_error.png")
-            except:
-                pass
-            raise
+
+            logger.info("🔐 Manual login mode")
+            await page.goto(f"{BAMBOOHR_DOMAIN}/login.php", wait_until="domcontentloaded")
+            logger.info("→ Please complete login and 2FA in the browser...")
+            input("   👉 Press ENTER after login completion: ")
+            await page.wait_for_timeout(3000)
+
+            await _scrape_with_page(page, job_id, full_sync)
         finally:
             try:
                 await browser.close()
@@ -1247,6 +1342,39 @@ async def scrape_job(job_id: str, use_manual_login: bool = False):
             except:
                 pass
 
+
+async def scrape_job(job_id: str, use_manual_login: bool = False, full_sync: bool = False):
+    """Main function to scrape resumes for a specific job.
+
+    Only applicants without a stored resume are downloaded unless full_sync is set.
+    """
+    if not validate_job_id(job_id):
+        logger.error("❌ Invalid job ID")
+        return
+    
+    Path(DOWNLOAD_DIR).mkdir(parents=True, exist_ok=True)
+    
+    logger.info(f"🚀 Starting scrape for job ID: {job_id}")
+    logger.info(f"📁 Download directory: {DOWNLOAD_DIR}")
+    logger.info(f"🐛 Debug mode: {'ON' if DEBUG_MODE else 'OFF'}")
+
+    if use_manual_login:
+        await _manual_login_scrape(job_id, full_sync)
+        return
+
+    # Pooled browser: launch + login happen once per process, not per scrape
+    try:
+        await async_browser_pool.arun("bamboohr", _scrape_with_page, job_id, full_sync)
+    except BrowserLoginError:
+        logger.error("❌ Login failed")
+        if CONFIG['HEADLESS']:
+            return
+        # Offer manual login as fallback
+        retry = input("\n🔄 Would you like to try manual login? (y/n): ").lower()
+        if retry == 'y':
+            logger.info("🔐 Switching to manual login...")
+            await _manual_login_scrape(job_id, full_sync)
+
 def main():
     """Entry point for the script."""
     print("\n🤖 BambooHR Resume Scraper - ADVANCED DOWNLOAD DEBUG VERSION")
@@ -1293,4 +1421,6 @@ def main():
         print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
+    from app.models.db import init_db
+    init_db()  # standalone run: create the sync state table if missing
     main()
\ No newline at end of file
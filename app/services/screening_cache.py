@@ -0,0 +1,90 @@
+# app/services/screening_cache.py
+"""
+Persistent memoization of LLM screening results for the recruitment pipeline.
+- Screening results (parsed contact fields, ATS score, decision, feedback) are
+  keyed by the SHA-256 of the resume bytes, a hash of the job requirements and
+  ATS threshold, and PROMPT_VERSION.
+- Skill extraction from a job description is memoized the same way, so a re-run
+  produces identical requirements (and therefore cache hits for every resume).
+- Bump PROMPT_VERSION whenever an agent prompt or the scoring model changes.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models.db import ScreeningResult, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+PROMPT_VERSION = "screening-v1"
+
+
+# ---- keys ----
+def text_sha256(value: str) -> str:
+    return hashlib.sha256((value or "").encode("utf-8")).hexdigest()
+
+
+def requirements_hash(requirements: Dict[str, Any], **extra) -> str:
+    """Stable hash of the job requirements that influence scoring (job_id excluded)."""
+    data = {k: v for k, v in requirements.items() if k != "job_id"}
+    data.update(extra)
+    return text_sha256(json.dumps(data, sort_keys=True, default=str))
+
+
+def cache_key(kind: str, *parts: str) -> str:
+    return text_sha256("|".join((kind, PROMPT_VERSION) + tuple(parts)))
+
+
+# ---- reads / writes ----
+def get_result(key: str) -> Optional[Dict[str, Any]]:
+    """Cached payload for `key`, or None. Never raises."""
+    try:
+        session = SessionLocal()
+        try:
+            # Read-only: no per-hit bookkeeping, so cache hits never take the write lock
+            row = session.get(ScreeningResult, key)
+            if row is None or not row.payload:
+                return None
+            return json.loads(row.payload)
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning(f"Screening cache read failed: {e}")
+        return None
+
+
+def store_result(key: str, kind: str, payload: Dict[str, Any], *, content_hash: Optional[str] = None,
+                 requirements: Optional[str] = None, model: Optional[str] = None) -> None:
+    """Insert or replace a cached payload. Never raises."""
+    try:
+        session = SessionLocal()
+        try:
+            row = session.get(ScreeningResult, key)
+            if row is None:
+                row = ScreeningResult(cache_key=key, kind=kind, hits=0)
+                session.add(row)
+            row.content_hash = content_hash
+            row.requirements_hash = requirements
+            row.prompt_version = PROMPT_VERSION
+            row.model = model
+            row.payload = json.dumps(payload, default=str)
+            row.created_at = datetime.now()
+            try:
+                session.commit()
+            except IntegrityError:
+                session.rollback()  # a concurrent run stored the same result first
+        finally:
+            session.close()
+    except Exception as e:
+        logger.warning(f"Screening cache write failed: {e}")
+
+
+__all__ = [
+    "PROMPT_VERSION", "text_sha256", "requirements_hash", "cache_key",
+    "get_result", "store_result",
+]
@@ -0,0 +1,422 @@
+# app/services/task_queue.py
+"""
+Durable, DB-backed task queue for background work.
+- Background functions are declared with @task(queue=...) and enqueued with
+  fn.delay(*args, **kwargs) or fn.enqueue(args, kwargs, countdown=seconds).
+  Tasks must be module-level functions taking JSON-serializable arguments.
+- Rows live in the `task_queue` table, so queued and delayed work survives a
+  restart and is shared by every process using the same database.
+- Named queues with per-queue concurrency, e.g.
+  TASK_QUEUES="default=4,scraping=1,scoring=2,pipeline=2".
+- A worker claims a row with a conditional UPDATE and holds it for the task's
+  visibility timeout, renewed by a heartbeat while the task runs; if the worker
+  dies, the claim expires and another worker runs the task again, unless it has
+  used up max_attempts, in which case a once-a-minute scheduler job marks it
+  failed. An idle poll only reads the table.
+- Delayed tasks are just rows with a future run_at; no timer is held in
+  memory. The dispatcher polls the table every TASK_QUEUE_POLL_SECONDS when
+  idle (an enqueue in the same process wakes it at once), so a delayed or
+  cross-process task starts at most one poll interval late.
+- Failed attempts are retried with exponential backoff until max_attempts.
+  Finished tasks are purged after a week by the scheduler; failed ones stay.
+
+Workers:
+- Each web process runs an in-process worker started by create_app
+  (TASK_QUEUE_INPROCESS=0 disables it when dedicated workers are deployed).
+- Dedicated worker process and queue counts (see app/services/task_worker.py):
+      python -m app.services.task_worker worker --queues default,scraping
+      python -m app.services.task_worker stats
+
+Configuration (environment):
+    TASK_QUEUES            queue=concurrency list (default "default=4,scraping=1,scoring=2,pipeline=2")
+    TASK_QUEUE_POLL_SECONDS  idle poll interval (default 2)
+    TASK_QUEUE_INPROCESS   1 (default) / 0
+"""
+
+import importlib
+import json
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+
+from app.models.db import QueuedTask, SessionLocal
+from app.services.scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUES = "default=4,scraping=1,scoring=2,pipeline=2"
+MAX_BACKOFF_SECONDS = 3600
+HEARTBEAT_SECONDS = 30           # claim renewal interval for running tasks
+
+
+def parse_queues(spec: str) -> Dict[str, int]:
+    """'default=4,scraping=1' -> {'default': 4, 'scraping': 1}"""
+    queues: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        name, _, concurrency = part.strip().partition("=")
+        if name:
+            queues[name] = max(1, int(concurrency or 1))
+    return queues
+
+
+class Task:
+    """A registered background function; call it directly or enqueue it."""
+
+    def __init__(self, fn: Callable, queue: str, max_attempts: int, visibility_timeout: int,
+                 retry_backoff: int, task_queue: "TaskQueue"):
+        self.fn = fn
+        self.name = f"{fn.__module__}:{fn.__qualname__}"
+        self.queue = queue
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout
+        self.retry_backoff = retry_backoff
+        self._task_queue = task_queue
+        self.__doc__ = fn.__doc__
+        self.__name__ = fn.__name__
+
+    def __call__(self, *args, **kwargs):
+        return self.fn(*args, **kwargs)
+
+    def delay(self, *args, **kwargs) -> int:
+        """Enqueue for immediate execution; returns the task id."""
+        return self.enqueue(args, kwargs)
+
+    def enqueue(self, args: Iterable = (), kwargs: Optional[Dict[str, Any]] = None, *,
+                countdown: Optional[float] = None, queue: Optional[str] = None) -> int:
+        """Enqueue, optionally not before `countdown` seconds from now."""
+        return self._task_queue.enqueue(
+            self.name, args, kwargs, queue=queue or self.queue, countdown=countdown,
+            max_attempts=self.max_attempts, visibility_timeout=self.visibility_timeout,
+        )
+
+
+class TaskQueue:
+    """Task registry, producer API and worker for the `task_queue` table."""
+
+    def __init__(self):
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_seconds = float(os.getenv("TASK_QUEUE_POLL_SECONDS", "2") or 2)
+        self.app = None
+        self._tasks: Dict[str, Task] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._running: Dict[int, int] = {}  # task id -> visibility timeout, claims held by this worker
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._concurrency: Dict[str, int] = {}
+        self._active: Dict[str, int] = {}
+        self._active_lock = threading.Lock()
+
+    # ---- registry ----
+    def task(self, queue: str = "default", max_attempts: int = 3, visibility_timeout: int = 600,
+             retry_backoff: int = 30):
+        """Decorator declaring a module-level function as a background task."""
+        def decorator(fn: Callable) -> Task:
+            registered = Task(fn, queue, max_attempts, visibility_timeout, retry_backoff, self)
+            self._tasks[registered.name] = registered
+            return registered
+        return decorator
+
+    def resolve(self, name: str) -> Optional[Task]:
+        registered = self._tasks.get(name)
+        if registered is None:
+            # Importing the module runs its @task decorators
+            module_name = name.partition(":")[0]
+            try:
+                importlib.import_module(module_name)
+            except ImportError as e:
+                logger.error(f"Task module {module_name} not importable: {e}")
+            registered = self._tasks.get(name)
+        return registered
+
+    def init_app(self, app) -> None:
+        """Run tasks inside this Flask app's context (cache, config)."""
+        self.app = app
+
+    # ---- producer ----
+    def enqueue(self, name: str, args: Iterable = (), kwargs: Optional[Dict[str, Any]] = None, *,
+                queue: str = "default", countdown: Optional[float] = None, max_attempts: int = 3,
+                visibility_timeout: int = 600) -> int:
+        payload = json.dumps({"args": list(args), "kwargs": kwargs or {}})
+        now = datetime.now()
+        run_at = now + timedelta(seconds=countdown or 0)
+        session = SessionLocal()
+        try:
+            row = QueuedTask(
+                queue=queue, name=name, payload=payload, status="queued", attempts=0,
+                max_attempts=max_attempts, visibility_timeout=visibility_timeout,
+                run_at=run_at, created_at=now,
+            )
+            session.add(row)
+            session.commit()
+            task_id = row.id
+        finally:
+            session.close()
+        if not countdown:
+            self._wake.set()
+        logger.debug(f"Enqueued task {task_id} {name} on {queue}")
+        return task_id
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """{queue: {status: count}}"""
+        session = SessionLocal()
+        try:
+            rows = session.execute(
+                select(QueuedTask.queue, QueuedTask.status, func.count())
+                .group_by(QueuedTask.queue, QueuedTask.status)
+            ).all()
+        finally:
+            session.close()
+        result: Dict[str, Dict[str, int]] = {}
+        for queue, status, count in rows:
+            result.setdefault(queue, {})[status] = count
+        return result
+
+    def list_tasks(self, queue: str, statuses: Iterable[str] = ("queued", "running"),
+                   limit: int = 50) -> List[Dict[str, Any]]:
+        """Recent tasks of one queue, for status endpoints."""
+        session = SessionLocal()
+        try:
+            rows = session.execute(
+                select(QueuedTask).where(QueuedTask.queue == queue)
+                .where(QueuedTask.status.in_(list(statuses)))
+                .order_by(QueuedTask.id.desc()).limit(limit)
+            ).scalars()
+            return [{
+                "id": row.id,
+                "name": row.name,
+                "status": row.status,
+                "attempts": row.attempts,
+                "locked_by": row.locked_by,
+                "run_at": row.run_at.isoformat() if row.run_at else None,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "last_error": row.last_error,
+            } for row in rows]
+        finally:
+            session.close()
+
+    def purge(self, older_than_days: int = 7) -> int:
+        """Delete finished tasks older than the given age; failed tasks are kept."""
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        session = SessionLocal()
+        try:
+            deleted = session.query(QueuedTask).filter(
+                QueuedTask.status == "done", QueuedTask.finished_at < cutoff
+            ).delete(synchronize_session=False)
+            session.commit()
+            return deleted
+        finally:
+            session.close()
+
+    def fail_expired(self) -> int:
+        """Mark expired claims that used their last attempt as failed; they are not run again."""
+        now = datetime.now()
+        table = QueuedTask.__table__
+        session = SessionLocal()
+        try:
+            exhausted = session.execute(
+                update(table).where(table.c.status == "running")
+                .where(table.c.locked_until < now).where(table.c.attempts >= table.c.max_attempts)
+                .values(status="failed", finished_at=now, locked_by=None, locked_until=None,
+                        last_error="Claim expired on the last attempt (worker died or hung)")
+            ).rowcount
+            session.commit()
+            if exhausted:
+                logger.warning(f"Marked {exhausted} expired task(s) as failed")
+            return exhausted
+        finally:
+            session.close()
+
+    # ---- worker ----
+    def start_worker(self, queues: Optional[Dict[str, int]] = None) -> None:
+        """Start the dispatcher thread for the given queues (default: TASK_QUEUES)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._concurrency = queues or parse_queues(os.getenv("TASK_QUEUES", DEFAULT_QUEUES))
+        for queue, concurrency in self._concurrency.items():
+            self._pools[queue] = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"task-{queue}")
+            self._active[queue] = 0
+        self._stop.clear()
+        self._heartbeat_stop.clear()
+        self._thread = threading.Thread(target=self._dispatch_loop, name="task-queue", daemon=True)
+        self._thread.start()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="task-queue-heartbeat",
+                                                  daemon=True)
+        self._heartbeat_thread.start()
+        logger.info(f"Task queue worker started for {self._concurrency} ({self.owner})")
+
+    def stop_worker(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
+        self._pools.clear()
+        # Keep renewing claims until the running tasks have drained
+        self._heartbeat_stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join(timeout=5)
+            self._heartbeat_thread = None
+
+    def _dispatch_loop(self) -> None:
+        while not self._stop.is_set():
+            claimed_any = False
+            for queue, concurrency in self._concurrency.items():
+                with self._active_lock:
+                    free = concurrency - self._active[queue]
+                if free <= 0:
+                    continue
+                try:
+                    rows = self._claim(queue, free)
+                except Exception as e:
+                    logger.warning(f"Task queue claim failed for {queue}: {e}")
+                    rows = []
+                for row in rows:
+                    claimed_any = True
+                    with self._active_lock:
+                        self._active[queue] += 1
+                    self._pools[queue].submit(self._execute, queue, row)
+            if not claimed_any:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._heartbeat_stop.wait(HEARTBEAT_SECONDS):
+            try:
+                self._renew_claims()
+            except Exception as e:
+                logger.warning(f"Task queue heartbeat failed: {e}")
+
+    def _renew_claims(self) -> None:
+        """Push locked_until out for every task this worker is running."""
+        with self._active_lock:
+            running = dict(self._running)
+        if not running:
+            return
+        now = datetime.now()
+        table = QueuedTask.__table__
+        session = SessionLocal()
+        try:
+            for task_id, visibility_timeout in running.items():
+                session.execute(
+                    update(table).where(table.c.id == task_id).where(table.c.status == "running")
+                    .where(table.c.locked_by == self.owner)
+                    .values(locked_until=now + timedelta(seconds=visibility_timeout))
+                )
+            session.commit()
+        finally:
+            session.close()
+
+    def _claim(self, queue: str, limit: int) -> List[Dict[str, Any]]:
+        now = datetime.now()
+        table = QueuedTask.__table__
+        claimable = and_(
+            table.c.queue == queue,
+            or_(
+                and_(table.c.status == "queued", table.c.run_at <= now),
+                # Expired claim with attempts left
+                and_(table.c.status == "running", table.c.locked_until < now,
+                     table.c.attempts < table.c.max_attempts),
+            ),
+        )
+        session = SessionLocal()
+        try:
+            # Read-only unless there is something to claim; exhausted expired claims
+            # are never claimable and are marked failed by fail_expired()
+            candidates = session.execute(
+                select(table.c.id, table.c.name, table.c.payload, table.c.attempts,
+                       table.c.max_attempts, table.c.visibility_timeout)
+                .where(claimable).order_by(table.c.run_at).limit(limit)
+            ).all()
+            claimed = []
+            for row in candidates:
+                # Conditional UPDATE: only one worker wins each row
+                won = session.execute(
+                    update(table).where(table.c.id == row.id).where(claimable).values(
+                        status="running", locked_by=self.owner, attempts=table.c.attempts + 1,
+                        locked_until=now + timedelta(seconds=row.visibility_timeout),
+                    )
+                ).rowcount
+                session.commit()
+                if won:
+                    with self._active_lock:
+                        self._running[row.id] = row.visibility_timeout
+                    claimed.append({
+                        "id": row.id, "name": row.name, "payload": row.payload,
+                        "attempt": row.attempts + 1, "max_attempts": row.max_attempts,
+                    })
+            return claimed
+        finally:
+            session.close()
+
+    def _execute(self, queue: str, row: Dict[str, Any]) -> None:
+        try:
+            registered = self.resolve(row["name"])
+            if registered is None:
+                self._finish(row, error=f"Unknown task {row['name']}", retry=False)
+                return
+            payload = json.loads(row["payload"] or "{}")
+            try:
+                if self.app is not None:
+                    with self.app.app_context():
+                        registered.fn(*payload.get("args", []), **payload.get("kwargs", {}))
+                else:
+                    registered.fn(*payload.get("args", []), **payload.get("kwargs", {}))
+            except Exception as e:
+                logger.error(f"Task {row['id']} {row['name']} failed (attempt {row['attempt']}): {e}",
+                             exc_info=True)
+                backoff = min(MAX_BACKOFF_SECONDS, registered.retry_backoff * 2 ** (row["attempt"] - 1))
+                self._finish(row, error=str(e), retry=row["attempt"] < row["max_attempts"], backoff=backoff)
+                return
+            self._finish(row)
+        except Exception as e:
+            logger.error(f"Task queue bookkeeping failed for task {row['id']}: {e}", exc_info=True)
+        finally:
+            with self._active_lock:
+                self._active[queue] -= 1
+                self._running.pop(row["id"], None)
+            self._wake.set()
+
+    def _finish(self, row: Dict[str, Any], error: Optional[str] = None, retry: bool = False,
+                backoff: float = 0) -> None:
+        now = datetime.now()
+        if error is None:
+            values = dict(status="done", finished_at=now, locked_by=None, locked_until=None, last_error=None)
+        elif retry:
+            values = dict(status="queued", run_at=now + timedelta(seconds=backoff),
+                          locked_by=None, locked_until=None, last_error=error)
+        else:
+            values = dict(status="failed", finished_at=now, locked_by=None, locked_until=None, last_error=error)
+        table = QueuedTask.__table__
+        session = SessionLocal()
+        try:
+            # A claim that expired and was taken over belongs to the other worker now
+            session.execute(
+                update(table).where(table.c.id == row["id"]).where(table.c.locked_by == self.owner)
+                .values(**values)
+            )
+            session.commit()
+        finally:
+            session.close()
+
+
+# Process-wide queue; tasks register on it with @task
+task_queue = TaskQueue()
+task = task_queue.task
+
+scheduler.register("task_queue_purge", task_queue.purge, 6 * 3600)
+# Leader-only sweep, so the idle dispatcher poll stays read-only
+scheduler.register("task_queue_fail_expired", task_queue.fail_expired, 60)
+
+__all__ = ["Task", "TaskQueue", "task_queue", "task", "parse_queues"]
+
@@ -0,0 +1,61 @@
+# app/services/task_worker.py
+"""
+Command line entry point for the durable task queue.
+- `worker` runs a dedicated worker in the foreground for the given queues. It
+  builds the Flask app first, so every @task module is imported and registered
+  on the shared app.services.task_queue.task_queue instance.
+- `stats` prints task counts per queue and status.
+
+    python -m app.services.task_worker worker --queues default=4,scraping=1
+    python -m app.services.task_worker stats
+
+Kept apart from task_queue.py: running that module as __main__ would create a
+second queue instance that none of the tasks register on.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import threading
+
+from app.services.task_queue import DEFAULT_QUEUES, parse_queues, task_queue
+
+
+def run_worker(queues: str) -> None:
+    os.environ["TASK_QUEUE_INPROCESS"] = "0"  # this process is the worker
+    from app import create_app  # registers every task module
+
+    task_queue.init_app(create_app())
+    task_queue.start_worker(parse_queues(queues))
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    try:
+        while not stopping.wait(1):
+            pass
+    except KeyboardInterrupt:
+        pass
+    task_queue.stop_worker()
+
+
+def print_stats() -> None:
+    for queue, counts in sorted(task_queue.stats().items()):
+        print(f"{queue:20} " + " ".join(f"{status}={count}" for status, count in sorted(counts.items())))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Durable background task queue")
+    sub = parser.add_subparsers(dest="command")
+    worker_parser = sub.add_parser("worker", help="run a dedicated worker")
+    worker_parser.add_argument("--queues", default=os.getenv("TASK_QUEUES", DEFAULT_QUEUES),
+                               help="queue=concurrency list, e.g. default=4,scraping=1")
+    sub.add_parser("stats", help="print task counts per queue and status")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        logging.basicConfig(level=logging.INFO)
+        run_worker(args.queues)
+    elif args.command == "stats":
+        print_stats()
+    else:
+        parser.print_help()
@@ -3,24 +3,91 @@
 import asyncio
 import json
 import logging
+import os
 from pathlib import Path
-from playwright.async_api import async_playwright
 import re
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from app.models.db import Candidate, SessionLocal 
+from app.services.browser_pool import BrowserLoginError, VendorProfile, async_browser_pool
 from app.utils.email_util import send_interview_link_email, send_rejection_email
 from sqlalchemy import and_
 
 # Same user data directory
 USER_DATA_DIR = r"D:\interview link\testlify_browser_profile"
 OUTPUT_DIR = "assessment_results"
+# Assessments scraped in parallel tabs of the shared Testlify context
+SCRAPE_CONCURRENCY = int(os.getenv("TESTLIFY_SCRAPE_CONCURRENCY", "3") or 3)
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Long-lived Testlify browser (persistent profile keeps the login)
+async_browser_pool.register(VendorProfile(
+    name="testlify",
+    user_data_dir=USER_DATA_DIR,
+    context_options={'viewport': {'width': 1400, 'height': 1000}},
+    max_pages=SCRAPE_CONCURRENCY,
+))
+
+ASSESSMENTS_URL = "https://app.testlify.com/assessments"
+# Assessment name -> detail URL, persisted between runs
+ASSESSMENT_URL_CACHE = Path(OUTPUT_DIR) / "testlify_assessment_urls.json"
+
+# Short visible texts on the assessments page with the link they sit in (if any)
+ASSESSMENT_INDEX_JS = """
+() => {
+    const seen = new Set();
+    const entries = [];
+    const add = (text, link) => {
+        const name = (text || '').replace(/\\s+/g, ' ').trim();
+        const href = link ? link.href : null;
+        if (!name || name.length >= 100 || seen.has(name + '|' + href)) return;
+        seen.add(name + '|' + href);
+        entries.push({name, href});
+    };
+    document.querySelectorAll('a[href]').forEach(a => add(a.innerText, a));
+    document.querySelectorAll('body *').forEach(el => {
+        if (el.children.length === 0) add(el.innerText, el.closest('a[href]'));
+    });
+    return entries;
+}
+"""
+
+
+def _load_assessment_urls() -> Dict[str, str]:
+    try:
+        with open(ASSESSMENT_URL_CACHE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+_assessment_urls: Dict[str, str] = _load_assessment_urls()
+
+
+def _save_assessment_urls():
+    try:
+        ASSESSMENT_URL_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with open(ASSESSMENT_URL_CACHE, 'w', encoding='utf-8') as f:
+            json.dump(_assessment_urls, f, indent=2, ensure_ascii=False)
+    except OSError as e:
+        logging.warning(f"Could not save assessment URL cache: {e}")
+
+
+def _remember_assessment_url(key: str, url: str):
+    if _assessment_urls.get(key) != url:
+        _assessment_urls[key] = url
+        _save_assessment_urls()
+
+
+def _forget_assessment_url(key: str):
+    if _assessment_urls.pop(key, None) is not None:
+        _save_assessment_urls()
+
+
 class FixedTestlifyScraper:
     """Fixed scraper that correctly extracts TOTAL assessment scores, not section scores"""
     
@@ -30,88 +97,126 @@ class FixedTestlifyScraper:
     
     async def scrape_assessment_scores(self, assessment_name: str) -> List[Dict]:
         """Main scraping method - focuses on TOTAL scores only"""
-        async with async_playwright() as playwright:
-            context = await playwright.chromium.launch_persistent_context(
-                user_data_dir=USER_DATA_DIR,
-                headless=False,
-                viewport={'width': 1400, 'height': 1000}
-            )
-            page = context.pages[0] if context.pages else await context.new_page()
-            
-            try:
-                # Navigate to assessment
-                success = await self._navigate_to_assessment(page, assessment_name)
-                if not success:
-                    return []
-                
-                # Extract TOTAL scores only (not section scores)
-                candidates_data = await self._extract_total_scores_only(page)
-                
-                # Validate and clean data
-                valid_candidates = self._validate_total_scores(candidates_data)
-                
-                # Save results
-                self._save_results(assessment_name, valid_candidates)
-                
-                # Process candidates (send emails, update database)
-                await self._process_candidates(valid_candidates)
-                
-                return valid_candidates
-                
-            except Exception as e:
-                logging.error(f"Scraping error: {e}")
-                await page.screenshot(path="scraping_error.png")
+        try:
+            # Only the browser work runs on the pooled page; DB/email processing stays here
+            candidates_data = await async_browser_pool.arun("testlify", self._scrape_page, assessment_name)
+            if candidates_data is None:
                 return []
-            finally:
-                await context.close()
+            
+            # Validate and clean data
+            valid_candidates = self._validate_total_scores(candidates_data)
+            
+            # Save results
+            self._save_results(assessment_name, valid_candidates)
+            
+            # Process candidates (send emails, update database)
+            await self._process_candidates(valid_candidates)
+            
+            return valid_candidates
+            
+        except BrowserLoginError:
+            raise  # an expired session is not "no results"; let the caller report it
+        except Exception as e:
+            logging.error(f"Scraping error: {e}")
+            return []
+    
+    async def scrape_many(self, assessment_names: List[str], concurrency: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """Scrape several assessments in parallel tabs, then process all candidates in one DB write"""
+        semaphore = asyncio.Semaphore(max(1, concurrency or SCRAPE_CONCURRENCY))
+        
+        async def scrape_one(assessment_name: str):
+            async with semaphore:
+                logging.info(f"🎯 Scraping TOTAL scores for: {assessment_name}")
+                try:
+                    candidates_data = await async_browser_pool.arun("testlify", self._scrape_page, assessment_name)
+                except BrowserLoginError:
+                    raise
+                except Exception as e:
+                    logging.error(f"Scraping error for {assessment_name}: {e}")
+                    return assessment_name, []
+            if candidates_data is None:
+                return assessment_name, []
+            valid_candidates = self._validate_total_scores(candidates_data)
+            self._save_results(assessment_name, valid_candidates)
+            return assessment_name, valid_candidates
+        
+        results = dict(await asyncio.gather(*(scrape_one(name) for name in assessment_names)))
+        await self._process_candidates([c for valid in results.values() for c in valid])
+        return results
+    
+    async def _scrape_page(self, page, assessment_name: str) -> Optional[List[Dict]]:
+        try:
+            # Navigate to assessment
+            if not await self._navigate_to_assessment(page, assessment_name):
+                return None
+            
+            # Extract TOTAL scores only (not section scores)
+            return await self._extract_total_scores_only(page)
+        except Exception:
+            await page.screenshot(path="scraping_error.png")
+            raise
     
     async def _navigate_to_assessment(self, page, assessment_name: str) -> bool:
-        """Navigate to the specific assessment"""
+        """Navigate to the specific assessment (directly by URL once it is known)"""
+        key = assessment_name.strip().lower()
+        cached_url = _assessment_urls.get(key)
+        if cached_url:
+            logging.info(f"Opening cached assessment URL: {cached_url}")
+            await page.goto(cached_url, wait_until="networkidle")
+            await self._ensure_logged_in(page)
+            if "login" not in page.url and page.url.rstrip("/") != ASSESSMENTS_URL:
+                await asyncio.sleep(3)
+                return True
+            logging.info("Cached assessment URL redirected elsewhere, re-indexing")
+            _forget_assessment_url(key)
+        
         logging.info("Navigating to Testlify assessments...")
-        await page.goto("https://app.testlify.com/assessments", wait_until="networkidle")
+        await page.goto(ASSESSMENTS_URL, wait_until="networkidle")
         await asyncio.sleep(3)
+        await self._ensure_logged_in(page)
         
-        # Check login
-        if await page.query_selector("input[type='email']"):
-            print("⚠️ Please log in manually...")
-            input("Press ENTER after logging in: ")
-            await page.wait_for_load_state("networkidle")
-        
-        # Find assessment
+        # Find assessment: index the whole list in one in-page evaluation
         logging.info(f"Looking for assessment: {assessment_name}")
-        
         try:
-            element = await page.wait_for_selector(f"text={assessment_name}", timeout=5000)
-            await element.click()
-            logging.info("✅ Found assessment via exact match")
-            await page.wait_for_load_state("networkidle")
+            entries = await page.evaluate(ASSESSMENT_INDEX_JS)
+        except Exception as e:
+            logging.error(f"Could not index assessments page: {e}")
+            entries = []
+        
+        exact = [e for e in entries if e["name"].lower() == key]
+        partial = [
+            e for e in entries
+            if key in e["name"].lower() and len(e["name"]) > len(assessment_name) - 5
+        ]
+        for match_type, matches in (("exact", exact), ("partial", partial)):
+            if not matches:
+                continue
+            # Prefer entries that carry a link: navigate by URL instead of clicking
+            entry = next((e for e in matches if e.get("href")), matches[0])
+            if entry.get("href"):
+                await page.goto(entry["href"], wait_until="networkidle")
+            else:
+                await page.get_by_text(entry["name"], exact=True).first.click()
+                await page.wait_for_load_state("networkidle")
+            logging.info(f"✅ Found assessment via {match_type} match")
+            # Only an exact name match may be cached under the requested name;
+            # a partial one could be a different assessment
+            if match_type == "exact" and page.url.rstrip("/") != ASSESSMENTS_URL:
+                _remember_assessment_url(key, page.url)
             await asyncio.sleep(3)
             return True
-        except:
-            pass
-        
-        # Try partial match
-        try:
-            elements = await page.query_selector_all("*")
-            for element in elements:
-                try:
-                    text = await element.inner_text()
-                    if (assessment_name.lower() in text.lower() and 
-                        len(text.strip()) < 100 and 
-                        len(text.strip()) > len(assessment_name) - 5):
-                        await element.click()
-                        logging.info("✅ Found assessment via partial match")
-                        await page.wait_for_load_state("networkidle")
-                        await asyncio.sleep(3)
-                        return True
-                except:
-                    continue
-        except:
-            pass
         
         logging.error(f"Could not find assessment: {assessment_name}")
         return False
     
+    async def _ensure_logged_in(self, page):
+        # The pool runs headless by default, so there is nobody to log in by hand;
+        # the persistent profile must already hold a Testlify session
+        if await page.query_selector("input[type='email']"):
+            raise BrowserLoginError(
+                f"Testlify session expired; log in once with BROWSER_HEADLESS=0 using profile {USER_DATA_DIR}"
+            )
+    
     async def _extract_total_scores_only(self, page) -> List[Dict]:
         """Extract ONLY total assessment scores, ignore section scores completely"""
         logging.info("🎯 Extracting TOTAL assessment scores only...")
@@ -383,6 +488,13 @@ class FixedTestlifyScraper:
             interview_count = 0
             rejection_count = 0
             
+            # Load every referenced candidate in one query
+            emails = {c.get('email') for c in candidates_data if c.get('email')}
+            candidates_by_email = {}
+            if emails:
+                for row in self.session.query(Candidate).filter(Candidate.email.in_(emails)).order_by(Candidate.id):
+                    candidates_by_email.setdefault(row.email, row)
+            
             for candidate_data in candidates_data:
                 email = candidate_data.get('email')
                 percentage = candidate_data.get('percentage')
@@ -391,7 +503,7 @@ class FixedTestlifyScraper:
                     continue
                 
                 # Find candidate in database
-                candidate = self.session.query(Candidate).filter_by(email=email).first()
+                candidate = candidates_by_email.get(email)
                 if not candidate:
                     logging.warning(f"⚠️ Candidate {email} not found in database")
                     continue
@@ -485,6 +597,15 @@ async def scrape_assessment_results_by_name(assessment_name: str) -> List[Dict]:
         scraper.session.close()
 
 
+async def scrape_assessments_by_name(assessment_names: List[str], concurrency: Optional[int] = None) -> Dict[str, List[Dict]]:
+    """Scrape several assessments concurrently - assessment name -> valid TOTAL score rows"""
+    scraper = FixedTestlifyScraper()
+    try:
+        return await scraper.scrape_many(assessment_names, concurrency)
+    finally:
+        scraper.session.close()
+
+
 async def scrape_all_pending_assessments():
     """Scrape all pending assessments - TOTAL scores only"""
     session = SessionLocal()
@@ -496,16 +617,13 @@ async def scrape_all_pending_assessments():
             )
         ).distinct().all()
         
-        results_summary = {}
-        
-        for (assessment_name,) in pending_assessments:
-            if assessment_name:
-                logging.info(f"🎯 Scraping TOTAL scores for: {assessment_name}")
-                results = await scrape_assessment_results_by_name(assessment_name)
-                scored_count = len([r for r in results if r.get('percentage') is not None])
-                results_summary[assessment_name] = scored_count
+        assessment_names = [name for (name,) in pending_assessments if name]
+        results = await scrape_assessments_by_name(assessment_names)
         
-        return results_summary
+        return {
+            name: len([r for r in rows if r.get('percentage') is not None])
+            for name, rows in results.items()
+        }
         
     finally:
         session.close()
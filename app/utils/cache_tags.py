@@ -0,0 +1,80 @@
+# app/utils/cache_tags.py
+"""
+Tag-based invalidation for memoized values in the shared Flask cache.
+- `@cached(timeout, tags=...)` stores a function's result under a key that
+  includes the current version of each of its tags (`job:<id>`, `job:*`,
+  `candidate:<id>`, `stats`, `jobs`); the global candidates tag is always added.
+- `invalidate(*tags)` bumps those versions. Entries under an old version are
+  never read again and age out with their timeout; everything else stays cached.
+- On a decorated view the key also includes `request.full_path`, so query
+  arguments (page, filters) get their own entries.
+- Tag versions are the response_versions counters, so cached data and ETags
+  move together. Candidate commits bump `job:<id>`, `job:*` and `candidate:<id>`
+  automatically; recruitment aggregate changes bump `stats`.
+"""
+
+import hashlib
+import logging
+from functools import wraps
+from typing import Callable, Iterable
+
+from flask import current_app, has_request_context, request
+
+from app.extensions import cache
+from app.utils.response_versions import (
+    ALL_JOBS_SCOPE, GLOBAL_SCOPE, STATS_SCOPE, bump_version, candidate_scope, get_version, job_scope,
+)
+
+logger = logging.getLogger(__name__)
+
+JOBS_TAG = "jobs"  # the BambooHR job catalog
+
+
+def invalidate(*tags: str) -> None:
+    """Invalidate every cached entry carrying one of the tags. Never raises."""
+    try:
+        bump_version(*sorted(set(tags)))
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cache tags {tags}: {e}")
+
+
+def _is_current_view(wrapper) -> bool:
+    """True when `wrapper` is the view handling the current request (it reads request.args)."""
+    return has_request_context() and current_app.view_functions.get(request.endpoint) is wrapper
+
+
+def cached(timeout: int, tags: Callable[..., Iterable[str]]):
+    """Memoize in the shared cache, keyed by arguments and tag versions.
+
+    `tags` receives the same arguments as the function and returns its tags.
+    """
+    def decorator(func):
+        prefix = f"tagged:{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                entry_tags = sorted({GLOBAL_SCOPE, *tags(*args, **kwargs)})
+                versions = [f"{tag}={get_version(tag)}" for tag in entry_tags]
+                path = request.full_path if _is_current_view(wrapper) else None
+                digest = hashlib.sha1(repr((args, sorted(kwargs.items()), versions, path)).encode()).hexdigest()
+                key = f"{prefix}:{digest}"
+                hit = cache.get(key)
+            except Exception as e:
+                logger.warning(f"Tagged cache lookup failed for {prefix}: {e}")
+                return func(*args, **kwargs)
+            if hit is not None:
+                return hit[0]
+            value = func(*args, **kwargs)
+            cache.set(key, (value,), timeout=timeout)  # 1-tuple so a cached None is a hit
+            return value
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+__all__ = [
+    "cached", "invalidate", "candidate_scope", "job_scope",
+    "GLOBAL_SCOPE", "ALL_JOBS_SCOPE", "STATS_SCOPE", "JOBS_TAG",
+]
@@ -0,0 +1,134 @@
+# app/utils/response_versions.py
+"""
+Response versioning for polled dashboard endpoints.
+- Keeps a version stamp per job, per candidate and for the recruitment stats
+  (plus an "all jobs" and a global counter) in the shared Flask cache. Job and
+  candidate counters are bumped automatically after any commit through
+  SessionLocal that wrote a Candidate row.
+- The same counters are the invalidation tags of app.utils.cache_tags.
+- `conditional_get` derives a strong ETag from the relevant counters and answers
+  `If-None-Match` with 304 before the view (and its DB queries / JSON encoding) runs.
+"""
+
+import hashlib
+import logging
+import time
+from functools import wraps
+from itertools import chain
+from typing import Callable, Iterable, Optional, Tuple
+
+from flask import Response, request
+from sqlalchemy import event
+
+from app.extensions import cache
+from app.models.db import Candidate, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "candidates"  # bumped when the written job is unknown
+ALL_JOBS_SCOPE = "job:*"     # bumped on every candidate write
+STATS_SCOPE = "stats"        # bumped when the monthly recruitment aggregates change
+
+# Counters expire with the data caches they describe, so a worker that missed a
+# bump made elsewhere never serves 304s for longer than its memoized data lives.
+VERSION_TIMEOUT = 300
+
+
+def _key(scope: str) -> str:
+    return f"resource_version:{scope}"
+
+
+def job_scope(job_id) -> str:
+    return f"job:{job_id}" if job_id else ALL_JOBS_SCOPE
+
+
+def candidate_scope(candidate_id) -> str:
+    return f"candidate:{candidate_id}"
+
+
+def get_version(scope: str) -> int:
+    value = cache.get(_key(scope))
+    if value is None:
+        # Time-based, so a fresh counter never reissues an old ETag
+        value = time.time_ns()
+        cache.set(_key(scope), value, timeout=VERSION_TIMEOUT)
+    return value
+
+
+def bump_version(*scopes: str) -> None:
+    # A fresh timestamp rather than get+1: two workers bumping concurrently
+    # can never write the same value back
+    value = time.time_ns()
+    for scope in scopes:
+        cache.set(_key(scope), value, timeout=VERSION_TIMEOUT)
+
+
+def bump_job_versions(job_ids: Iterable[Optional[str]], candidate_ids: Iterable[int] = ()) -> None:
+    """Record that candidates for these jobs changed (None = unknown job)."""
+    scopes = {ALL_JOBS_SCOPE}
+    for job_id in job_ids:
+        scopes.add(job_scope(job_id) if job_id else GLOBAL_SCOPE)
+    scopes.update(candidate_scope(candidate_id) for candidate_id in candidate_ids if candidate_id)
+    try:
+        bump_version(*sorted(scopes))
+    except Exception as e:
+        logger.warning(f"Failed to bump response versions: {e}")
+
+
+def make_etag(scopes: Tuple[str, ...]) -> str:
+    parts = [request.full_path] + [f"{scope}={get_version(scope)}" for scope in scopes]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+def conditional_get(scopes_for_request: Callable[[], Tuple[str, ...]]):
+    """Answer GETs with 304 when the client's ETag matches the current versions.
+
+    `scopes_for_request` is called inside the request and returns the counter
+    scopes the response depends on.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return func(*args, **kwargs)
+
+            etag = make_etag((GLOBAL_SCOPE,) + tuple(scopes_for_request()))
+            if request.if_none_match.contains(etag):
+                not_modified = Response(status=304)
+                not_modified.set_etag(etag)
+                return not_modified
+
+            rv = func(*args, **kwargs)
+            response, status = (rv[0], rv[1]) if isinstance(rv, tuple) else (rv, 200)
+            if status == 200 and isinstance(response, Response):
+                response.set_etag(etag)
+                response.headers.setdefault('Cache-Control', 'no-cache')
+            return rv
+        return wrapper
+    return decorator
+
+
+# ---- automatic bumps on candidate writes ----
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_candidate_jobs(session, flush_context):
+    touched = session.info.setdefault("touched_candidate_jobs", set())
+    touched_ids = session.info.setdefault("touched_candidate_ids", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Candidate):
+            # Read without triggering a lazy load inside the flush
+            touched.add(obj.__dict__.get("job_id"))
+            touched_ids.add(obj.__dict__.get("id"))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _bump_candidate_jobs(session):
+    touched = session.info.pop("touched_candidate_jobs", None)
+    touched_ids = session.info.pop("touched_candidate_ids", None)
+    if touched:
+        bump_job_versions(touched, touched_ids or ())
+
+
+__all__ = [
+    "conditional_get", "bump_version", "bump_job_versions", "get_version",
+    "job_scope", "candidate_scope", "GLOBAL_SCOPE", "ALL_JOBS_SCOPE", "STATS_SCOPE",
+]
@@ -0,0 +1,237 @@
+# app/utils/sqlite_cache.py
+"""
+SQLite-backed Flask-Caching backend shared by all worker processes on a host.
+- Every gunicorn worker opens the same database file (WAL mode), so memoized
+  values, realtime update keys and invalidations are seen by all workers.
+- Keys are namespaced with CACHE_KEY_PREFIX; clear() only drops the own namespace.
+- Size bound: triggers keep a running entry count and byte total in
+  `cache_totals`, so every set() checks the bound with a one-row read. Once
+  CACHE_THRESHOLD entries or CACHE_SQLITE_MAX_BYTES is exceeded, expired rows
+  are pruned first, then the entries closest to expiry until the table is back
+  under 90% of both limits.
+- Values are pickled, as with the in-memory SimpleCache this replaces.
+- Cache errors are logged and treated as misses; they never fail a request.
+
+Configuration (environment):
+    CACHE_TYPE              Flask-Caching backend (default this class; e.g.
+                            "SimpleCache" or "RedisCache" to swap it out)
+    CACHE_SQLITE_PATH       database file (default <project>/flask_cache.db)
+    CACHE_SQLITE_MAX_BYTES  bound on stored value bytes (default 64 MB)
+"""
+
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from flask_caching.backends.base import BaseCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).resolve().parents[2] / "flask_cache.db"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+PRUNE_TARGET = 0.9  # prune down to this share of the limits so a full cache does not prune on every set
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,   -- epoch seconds, 0 = never
+    size INTEGER NOT NULL
+)
+"""
+
+# Running totals maintained by triggers (REPLACE deletes fire them with recursive_triggers on)
+_TOTALS_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS cache_totals (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        entries INTEGER NOT NULL,
+        bytes INTEGER NOT NULL
+    )""",
+    """INSERT OR IGNORE INTO cache_totals (id, entries, bytes)
+        SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries""",
+    """CREATE TRIGGER IF NOT EXISTS cache_entries_ins AFTER INSERT ON cache_entries BEGIN
+        UPDATE cache_totals SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cache_entries_del AFTER DELETE ON cache_entries BEGIN
+        UPDATE cache_totals SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cache_entries_upd AFTER UPDATE OF size ON cache_entries BEGIN
+        UPDATE cache_totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+    END""",
+)
+
+
+class SQLiteCache(BaseCache):
+    """Flask-Caching backend storing entries in one SQLite file."""
+
+    def __init__(self, path=DEFAULT_PATH, default_timeout: int = 300, threshold: int = 5000,
+                 key_prefix: str = "", max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(default_timeout=default_timeout)
+        self.path = str(path)
+        self.threshold = threshold
+        self.key_prefix = key_prefix or ""
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        with conn:
+            # One transaction, so the totals row is seeded before any trigger-less write
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires_at)")
+            for statement in _TOTALS_SCHEMA:
+                conn.execute(statement)
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(dict(
+            path=config.get("CACHE_SQLITE_PATH") or DEFAULT_PATH,
+            threshold=config.get("CACHE_THRESHOLD", 5000),
+            key_prefix=config.get("CACHE_KEY_PREFIX", ""),
+            max_bytes=int(config.get("CACHE_SQLITE_MAX_BYTES") or DEFAULT_MAX_BYTES),
+        ))
+        return cls(*args, **kwargs)
+
+    # ---- connection ----
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; sqlite3 connections are not shareable."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)  # autocommit
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA recursive_triggers=ON")  # count rows replaced by INSERT OR REPLACE
+            self._local.conn = conn
+        return conn
+
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}{key}"
+
+    def _expires_at(self, timeout: Optional[int]) -> float:
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout > 0 else 0
+
+    # ---- BaseCache API ----
+    def get(self, key: str) -> Any:
+        try:
+            row = self._connect().execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND (expires_at = 0 OR expires_at > ?)",
+                (self._key(key), time.time()),
+            ).fetchone()
+            return pickle.loads(row[0]) if row else None
+        except Exception as e:
+            logger.warning(f"Cache get failed for {key}: {e}")
+            return None
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        try:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            self._connect().execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, size) VALUES (?, ?, ?, ?)",
+                (self._key(key), data, self._expires_at(timeout), len(data)),
+            )
+            count, total = self._totals()
+            if count > self.threshold or total > self.max_bytes:
+                self._prune()
+            return True
+        except Exception as e:
+            logger.warning(f"Cache set failed for {key}: {e}")
+            return False
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        try:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE key = ? AND expires_at != 0 AND expires_at <= ?",
+                    (self._key(key), time.time()),
+                )
+                added = conn.execute(
+                    "INSERT OR IGNORE INTO cache_entries (key, value, expires_at, size) VALUES (?, ?, ?, ?)",
+                    (self._key(key), data, self._expires_at(timeout), len(data)),
+                ).rowcount
+            return bool(added)
+        except Exception as e:
+            logger.warning(f"Cache add failed for {key}: {e}")
+            return False
+
+    def delete(self, key: str) -> bool:
+        try:
+            return bool(self._connect().execute(
+                "DELETE FROM cache_entries WHERE key = ?", (self._key(key),)
+            ).rowcount)
+        except Exception as e:
+            logger.warning(f"Cache delete failed for {key}: {e}")
+            return False
+
+    def delete_many(self, *keys: str) -> list:
+        try:
+            deleted = []
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for key in keys:
+                    if conn.execute("DELETE FROM cache_entries WHERE key = ?", (self._key(key),)).rowcount:
+                        deleted.append(key)
+            return deleted
+        except Exception as e:
+            logger.warning(f"Cache delete_many failed: {e}")
+            return []
+
+    def has(self, key: str) -> bool:
+        try:
+            return self._connect().execute(
+                "SELECT 1 FROM cache_entries WHERE key = ? AND (expires_at = 0 OR expires_at > ?)",
+                (self._key(key), time.time()),
+            ).fetchone() is not None
+        except Exception as e:
+            logger.warning(f"Cache has failed for {key}: {e}")
+            return False
+
+    def clear(self) -> bool:
+        """Drop this namespace's entries (all entries when there is no prefix)."""
+        try:
+            if self.key_prefix:
+                pattern = self.key_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                self._connect().execute(
+                    "DELETE FROM cache_entries WHERE key LIKE ? ESCAPE '\\'", (pattern + "%",)
+                )
+            else:
+                self._connect().execute("DELETE FROM cache_entries")
+            return True
+        except Exception as e:
+            logger.warning(f"Cache clear failed: {e}")
+            return False
+
+    # ---- size bound ----
+    def _totals(self):
+        return self._connect().execute("SELECT entries, bytes FROM cache_totals WHERE id = 0").fetchone()
+
+    def _prune(self) -> None:
+        conn = self._connect()
+        max_entries, max_bytes = self.threshold * PRUNE_TARGET, self.max_bytes * PRUNE_TARGET
+        conn.execute("DELETE FROM cache_entries WHERE expires_at != 0 AND expires_at <= ?", (time.time(),))
+        count, total = self._totals()
+        if count <= max_entries and total <= max_bytes:
+            return
+        # Evict entries closest to expiry first (entries without expiry last)
+        evict, excess_count, excess_bytes = [], count - max_entries, total - max_bytes
+        for key, size in conn.execute(
+            "SELECT key, size FROM cache_entries ORDER BY expires_at = 0, expires_at"
+        ).fetchall():
+            if excess_count <= 0 and excess_bytes <= 0:
+                break
+            evict.append((key,))
+            excess_count -= 1
+            excess_bytes -= size
+        conn.executemany("DELETE FROM cache_entries WHERE key = ?", evict)
+        logger.info(f"Cache pruned {len(evict)} entries ({count} entries, {total} bytes before)")
+
+
+__all__ = ["SQLiteCache"]